@@ -13,10 +13,39 @@ class Settings(BaseSettings):
     # Phase 1 — Soul & Memory
     soul_file: str = "soul.md"
     embedding_model: str = "all-MiniLM-L6-v2"
+    embedding_backend: str = "torch"         # torch (sentence-transformers) | onnx
+    embedding_onnx_quantized: bool = False    # onnx backend: use the int8-quantized export
     memory_search_top_k: int = 5
+    memory_search_mode: str = "vector"       # vector | hybrid (BM25 + vector, fused with RRF)
+    memory_hybrid_candidates: int = 4        # hybrid / recency re-rank: fetch top_k * N candidates
+    memory_recency_half_life_days: float = 30.0  # recency blend: a memory's recency halves every N days
+    memory_merge_distance: float = 0.12      # lifecycle: merge same-category memories closer than this
+    memory_archive_after_days: int = 180     # lifecycle: archive cold memories older than this
+    memory_archive_max_access: int = 0       # lifecycle: ...recalled at most this many times
+    memory_search_nprobes: int = 20          # IVF partitions probed per ANN query
+    memory_search_refine_factor: int = 10    # re-rank top_k * N candidates with exact distances
+    memory_index_min_rows: int = 5000        # build the ANN index once the table is this large
+    memory_query_cache_size: int = 256       # cached recall results (0 disables)
+    memory_query_cache_ttl_s: float = 300.0  # max age of a cached recall result
+    embedding_batch_max_size: int = 32       # max texts per coalesced encode
+    embedding_batch_max_wait_ms: float = 5.0  # how long to gather concurrent requests
+    embedding_cache_enabled: bool = True
+    embedding_cache_memory_items: int = 4096         # in-memory LRU tier
+    embedding_cache_max_bytes: int = 67_108_864      # 64 MB on-disk tier
     context_window_token_budget: int = 12000  # max tokens for conversation history
     context_window_keep_first: int = 2        # always keep first N messages
     context_window_keep_recent: int = 20      # always keep last N messages
+    prompt_token_budget: int = 24000          # agent system prompt total across all sections
+    prompt_cache_enabled: bool = True         # mark cache breakpoints after the stable prompt prefix
+
+    # Storage — SQLite connection profile
+    sqlite_busy_timeout_ms: int = 5000       # wait this long on a locked database before erroring
+    sqlite_mmap_size: int = 268_435_456      # 256 MB memory-mapped reads
+    sqlite_cache_size_kb: int = 16_384       # page cache per connection
+    sqlite_reader_pool_size: int = 4         # pooled read-only connections alongside the single writer
+
+    # Startup
+    startup_warmup_enabled: bool = True  # warm embedder, LanceDB and tiktoken in the background
 
     # Phase 2 — Capable Executor
     sandbox_url: str = "http://sandbox:8060"
@@ -41,6 +70,12 @@ class Settings(BaseSettings):
     morning_briefing_hour: int = 8
     evening_review_hour: int = 21
     memory_consolidation_interval_min: int = 30
+    consolidation_batch_token_budget: int = 8000  # scheduled consolidation: max prompt tokens per batched call
+    consolidation_batch_max_sessions: int = 5     # ...and max sessions sharing one call
+    memory_index_interval_min: int = 60
+    memory_compaction_interval_min: int = 360
+    memory_lifecycle_hour: int = 4
+    memory_version_retention_hours: float = 24.0  # old LanceDB versions kept for in-flight readers
     goal_check_interval_hours: int = 4
     calendar_scan_interval_min: int = 15
     strategist_interval_min: int = 15
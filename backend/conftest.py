@@ -3,3 +3,4 @@ import os
 os.environ.setdefault("OPENROUTER_API_KEY", "test-key")
 os.environ.setdefault("WORKSPACE_DIR", "/tmp/seraph-test")
 os.environ.setdefault("SCHEDULER_ENABLED", "false")
+os.environ.setdefault("STARTUP_WARMUP_ENABLED", "false")
@@ -1,7 +1,11 @@
 """Token-aware context window for conversation history."""
 
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
 from functools import lru_cache
+from itertools import accumulate
 
 import tiktoken
 
@@ -11,23 +15,63 @@ logger = logging.getLogger(__name__)
 
 _summary_cache: dict[str, str] = {}
 
+# Token count per formatted message line, keyed by message id (or a content
+# digest for messages without one). Messages are immutable once stored, so
+# an entry never goes stale; the LRU bound only caps memory.
+_TOKEN_CACHE_SIZE = 16384
+_token_counts: OrderedDict[str, int] = OrderedDict()
+_token_lock = threading.Lock()
+
 
 @lru_cache(maxsize=1)
 def _get_encoding():
     return tiktoken.get_encoding("cl100k_base")
 
 
+def warmup() -> None:
+    """Load the tiktoken encoding ahead of the first request."""
+    _get_encoding().encode("warmup")
+
+
 def _count_tokens(text: str) -> int:
     return len(_get_encoding().encode(text))
 
 
+def _format_message(msg: dict) -> str:
+    role = msg.get("role", "unknown").capitalize()
+    content = msg.get("content", "")
+    return f"{role}: {content}"
+
+
 def _format_messages(messages: list[dict]) -> str:
-    lines = []
+    return "\n".join(_format_message(msg) for msg in messages)
+
+
+def _message_token_counts(messages: list[dict]) -> list[int]:
+    """Token count of each message's formatted line, tokenizing only cache misses."""
+    counts = []
     for msg in messages:
-        role = msg.get("role", "unknown").capitalize()
-        content = msg.get("content", "")
-        lines.append(f"{role}: {content}")
-    return "\n".join(lines)
+        line = _format_message(msg)
+        key = msg.get("id") or hashlib.blake2b(line.encode(), digest_size=16).hexdigest()
+        with _token_lock:
+            count = _token_counts.get(key)
+            if count is not None:
+                _token_counts.move_to_end(key)
+        if count is None:
+            count = _count_tokens(line)
+            with _token_lock:
+                _token_counts[key] = count
+                if len(_token_counts) > _TOKEN_CACHE_SIZE:
+                    _token_counts.popitem(last=False)
+        counts.append(count)
+    return counts
+
+
+def _span_tokens(prefix: list[int], start: int, end: int) -> int:
+    """Tokens in messages[start:end] joined by newlines (one token each)."""
+    if end <= start:
+        return 0
+    return prefix[end] - prefix[start] + (end - start - 1)
 
 
 def _summarize_middle(messages: list[dict], session_id: str, range_key: str) -> str:
@@ -69,12 +113,99 @@ def _summarize_middle(messages: list[dict], session_id: str, range_key: str) ->
     return summary
 
 
+def pending_fold(
+    messages: list[dict],
+    summary_through: str | None = None,
+    token_budget: int | None = None,
+    keep_recent: int | None = None,
+    keep_first: int | None = None,
+) -> list[dict]:
+    """Middle messages the summary tree has not absorbed yet.
+
+    Empty when the whole history fits the budget — there is nothing to
+    summarize until messages actually fall out of the window.
+    """
+    token_budget = token_budget if token_budget is not None else settings.context_window_token_budget
+    keep_recent = keep_recent if keep_recent is not None else settings.context_window_keep_recent
+    keep_first = keep_first if keep_first is not None else settings.context_window_keep_first
+
+    n = len(messages)
+    if n <= keep_first + keep_recent:
+        return []
+    prefix = [0, *accumulate(_message_token_counts(messages))]
+    if _span_tokens(prefix, 0, n) <= token_budget:
+        return []
+    middle = messages[keep_first:max(keep_first, n - keep_recent)]
+    return [m for m in middle if not summary_through or m.get("created_at", "") > summary_through]
+
+
+def summary_budget(
+    messages: list[dict],
+    token_budget: int | None = None,
+    keep_recent: int | None = None,
+    keep_first: int | None = None,
+) -> int:
+    """Tokens left for the middle once the first and recent messages are placed."""
+    token_budget = token_budget if token_budget is not None else settings.context_window_token_budget
+    keep_recent = keep_recent if keep_recent is not None else settings.context_window_keep_recent
+    keep_first = keep_first if keep_first is not None else settings.context_window_keep_first
+
+    n = len(messages)
+    prefix = [0, *accumulate(_message_token_counts(messages))]
+    recent_start = max(keep_first, n - keep_recent)
+    return token_budget - _span_tokens(prefix, 0, min(keep_first, n)) - _span_tokens(prefix, recent_start, n)
+
+
+def _summarized_middle(
+    middle: list[dict],
+    prefix: list[int],
+    start: int,
+    summary: str,
+    summary_through: str | None,
+    available: int,
+) -> tuple[list[str], int]:
+    """Render the middle from the stored summary — no LLM calls.
+
+    Messages the summary already covers are replaced by it; newer ones the
+    background summarizer has not reached yet are kept verbatim, newest first,
+    while they fit in ``available`` tokens. Returns the parts and their
+    token count.
+    """
+    covered = 0
+    if summary_through:
+        while covered < len(middle) and middle[covered].get("created_at", "") <= summary_through:
+            covered += 1
+
+    parts = []
+    tokens = 0
+    if summary:
+        parts.append(f"[Summary of earlier conversation: {summary}]")
+        tokens = _count_tokens(parts[0])
+        available -= tokens + 1
+
+    end = start + len(middle)
+    keep_from = end
+    while keep_from > start + covered and _span_tokens(prefix, keep_from - 1, end) + 1 <= available:
+        keep_from -= 1
+
+    omitted = keep_from - (start + covered)
+    if omitted:
+        parts.append(f"[{omitted} earlier messages not yet summarized]")
+        tokens += _count_tokens(parts[-1])
+    if keep_from < end:
+        parts.append(_format_messages(middle[keep_from - start:]))
+        tokens += _span_tokens(prefix, keep_from, end)
+    return parts, tokens
+
+
 def build_context_window(
     messages: list[dict],
     token_budget: int | None = None,
     keep_recent: int | None = None,
     keep_first: int | None = None,
     session_id: str = "",
+    summary: str | None = None,
+    summary_through: str | None = None,
 ) -> str:
     """Build a token-aware context window from message history.
 
@@ -84,6 +215,11 @@ def build_context_window(
     3. If total fits in budget, return all
     4. Otherwise, summarize the middle section
 
+    When `summary` is given (rendered from the session's persisted summary
+    tree, covering messages up to `summary_through`), step 4 reuses it
+    instead of calling the LLM; see `pending_fold` for what still needs
+    summarizing.
+
     When arguments are None, values are read from settings.
     """
     token_budget = token_budget if token_budget is not None else settings.context_window_token_budget
@@ -93,36 +229,48 @@ def build_context_window(
     if not messages:
         return ""
 
-    full_text = _format_messages(messages)
-    if _count_tokens(full_text) <= token_budget:
+    # Budget checks are prefix sums over cached per-message counts, so
+    # only messages not seen before are run through the tokenizer.
+    n = len(messages)
+    prefix = [0, *accumulate(_message_token_counts(messages))]
+    if _span_tokens(prefix, 0, n) <= token_budget:
         logger.info(
             "Context window: %d messages, all kept (within %d token budget)",
             len(messages), token_budget,
         )
-        return full_text
+        return _format_messages(messages)
 
-    n = len(messages)
     first = messages[:keep_first]
     recent = messages[max(keep_first, n - keep_recent):]
     middle = messages[keep_first:max(keep_first, n - keep_recent)]
 
     parts = []
+    result_tokens = _span_tokens(prefix, 0, len(first)) + _span_tokens(prefix, n - len(recent), n)
 
     if first:
         parts.append(_format_messages(first))
 
-    if middle:
+    if middle and summary is not None:
+        middle_parts, middle_tokens = _summarized_middle(
+            middle, prefix, keep_first, summary, summary_through,
+            token_budget - result_tokens,
+        )
+        parts.extend(middle_parts)
+        result_tokens += middle_tokens
+    elif middle:
         range_key = f"{keep_first}-{n - keep_recent}"
         summary = _summarize_middle(middle, session_id, range_key)
-        parts.append(f"[Summary of {len(middle)} earlier messages: {summary}]")
+        summary_line = f"[Summary of {len(middle)} earlier messages: {summary}]"
+        parts.append(summary_line)
+        result_tokens += _count_tokens(summary_line)
 
     if recent:
         parts.append(_format_messages(recent))
 
     result = "\n".join(parts)
     logger.info(
-        "Context window: %d messages in, %d kept (%d first + %d recent), %d summarized, %d result tokens",
+        "Context window: %d messages in, %d kept (%d first + %d recent), %d summarized, ~%d result tokens",
         n, len(first) + len(recent), len(first), len(recent), len(middle),
-        _count_tokens(result),
+        result_tokens + len(parts) - 1,
     )
     return result
@@ -1,6 +1,8 @@
 from smolagents import LiteLLMModel, ToolCallingAgent
 
 from config.settings import settings
+from src.agent.prompt_budget import KEEP_ALL, PromptSection, plan_prompt, render
+from src.agent.prompt_cache import CachingLiteLLMModel
 from src.plugins.loader import discover_tools
 from src.skills.manager import skill_manager
 from src.tools.mcp_manager import mcp_manager
@@ -8,7 +10,7 @@ from src.tools.mcp_manager import mcp_manager
 
 def get_model() -> LiteLLMModel:
     """Create a LiteLLMModel configured for OpenRouter."""
-    return LiteLLMModel(
+    return CachingLiteLLMModel(
         model_id=settings.default_model,
         api_key=settings.openrouter_api_key,
         api_base="https://openrouter.ai/api/v1",
@@ -22,6 +24,61 @@ def get_tools() -> list:
     return discover_tools() + mcp_manager.get_tools()
 
 
+_STABLE_SECTIONS = {"persona", "skills", "soul"}
+
+
+def _skills_text(active_skills) -> str:
+    skill_lines = []
+    for s in active_skills:
+        invocable = " [user-invocable]" if s.user_invocable else ""
+        skill_lines.append(f"### Skill: {s.name}{invocable}\n{s.instructions}")
+    return "\n\n".join(skill_lines)
+
+
+def _build_instructions(
+    persona: str,
+    soul_context: str,
+    memory_context: str,
+    observer_context: str,
+    active_skills,
+    additional_context: str,
+) -> tuple[str, str]:
+    """Assemble the system prompt within ``settings.prompt_token_budget``.
+
+    Returns ``(stable, volatile)``: persona, skills and soul change rarely
+    and lead the prompt so providers can cache them across turns; memories,
+    observer context and history follow. Priorities (highest survives
+    longest): persona, soul, skills, history, observer context, memories —
+    the volatile sections absorb overflow first so the stable prefix stays
+    byte-identical. History is trimmed from the oldest end.
+    """
+    sections = [
+        PromptSection("persona", persona, priority=100, min_tokens=KEEP_ALL),
+        PromptSection("skills", _skills_text(active_skills), priority=85, max_tokens=4000,
+                      header="## Available Skills\n"),
+        PromptSection("soul", soul_context, priority=90, min_tokens=300, max_tokens=2000,
+                      header="--- USER IDENTITY ---"),
+        PromptSection("memories", memory_context, priority=50, min_tokens=200, max_tokens=2000,
+                      header="--- RELEVANT MEMORIES ---"),
+        PromptSection("observer", observer_context, priority=60, min_tokens=100, max_tokens=1000,
+                      header="--- CURRENT CONTEXT ---"),
+        PromptSection("history", additional_context, priority=80, min_tokens=1000,
+                      max_tokens=settings.context_window_token_budget,
+                      header="--- CONVERSATION HISTORY ---", keep="tail"),
+    ]
+    planned = plan_prompt(sections)
+    stable = [p for p in planned if p.section.name in _STABLE_SECTIONS]
+    volatile = [p for p in planned if p.section.name not in _STABLE_SECTIONS]
+    return render(stable), render(volatile)
+
+
+def _instructions_for(model, stable: str, volatile: str) -> str:
+    """Join the prompt halves and point the model's cache breakpoint at the seam."""
+    if settings.prompt_cache_enabled and isinstance(model, CachingLiteLLMModel):
+        model.cache_prefix = stable
+    return f"{stable}\n\n{volatile}" if volatile else stable
+
+
 def create_agent(
     additional_context: str = "",
     soul_context: str = "",
@@ -40,30 +97,18 @@ def create_agent(
     tools = get_tools()
     tool_names = [t.name for t in tools]
 
-    instructions = (
+    persona = (
         "You are Seraph, a proactive guardian intelligence dedicated to elevating "
         "your human counterpart. You observe, think, and act to help them achieve "
         "their highest potential across productivity, performance, health, influence, "
         "and growth. Be concise, strategic, and helpful."
     )
-    if soul_context:
-        instructions += f"\n\n--- USER IDENTITY ---\n{soul_context}"
-    if memory_context:
-        instructions += f"\n\n--- RELEVANT MEMORIES ---\n{memory_context}"
-    if observer_context:
-        instructions += f"\n\n--- CURRENT CONTEXT ---\n{observer_context}"
-
-    # Inject active skills into instructions
     active_skills = skill_manager.get_active_skills(tool_names)
-    if active_skills:
-        skill_lines = []
-        for s in active_skills:
-            invocable = " [user-invocable]" if s.user_invocable else ""
-            skill_lines.append(f"### Skill: {s.name}{invocable}\n{s.instructions}")
-        instructions += "\n\n## Available Skills\n\n" + "\n\n".join(skill_lines)
-
-    if additional_context:
-        instructions += f"\n\n--- CONVERSATION HISTORY ---\n{additional_context}"
+    stable, volatile = _build_instructions(
+        persona, soul_context, memory_context, observer_context,
+        active_skills, additional_context,
+    )
+    instructions = _instructions_for(model, stable, volatile)
 
     agent = ToolCallingAgent(
         tools=tools,
@@ -96,7 +141,7 @@ def create_orchestrator(
     for specialist in specialists:
         all_tool_names.extend(t.name for t in specialist.tools)
 
-    instructions = (
+    persona = (
         "You are Seraph, a proactive guardian intelligence dedicated to elevating "
         "your human counterpart. You observe, think, and act to help them achieve "
         "their highest potential across productivity, performance, health, influence, "
@@ -110,24 +155,12 @@ def create_orchestrator(
         "- Give clear, specific task descriptions when delegating.\n"
         "- Synthesize specialist results into a natural response."
     )
-    if soul_context:
-        instructions += f"\n\n--- USER IDENTITY ---\n{soul_context}"
-    if memory_context:
-        instructions += f"\n\n--- RELEVANT MEMORIES ---\n{memory_context}"
-    if observer_context:
-        instructions += f"\n\n--- CURRENT CONTEXT ---\n{observer_context}"
-
-    # Inject active skills into instructions
     active_skills = skill_manager.get_active_skills(all_tool_names)
-    if active_skills:
-        skill_lines = []
-        for s in active_skills:
-            invocable = " [user-invocable]" if s.user_invocable else ""
-            skill_lines.append(f"### Skill: {s.name}{invocable}\n{s.instructions}")
-        instructions += "\n\n## Available Skills\n\n" + "\n\n".join(skill_lines)
-
-    if additional_context:
-        instructions += f"\n\n--- CONVERSATION HISTORY ---\n{additional_context}"
+    stable, volatile = _build_instructions(
+        persona, soul_context, memory_context, observer_context,
+        active_skills, additional_context,
+    )
+    instructions = _instructions_for(model, stable, volatile)
 
     agent = ToolCallingAgent(
         tools=[],
@@ -0,0 +1,157 @@
+"""Token-budget planner for agent prompt assembly.
+
+Every block that goes into an agent's system prompt (persona, soul,
+memories, observer context, skills, history) is a ``PromptSection`` with a
+priority and a min/max token allocation. ``plan_prompt`` measures each one
+with a cached tokenizer, clamps it to its max, and — when the total is still
+over ``settings.prompt_token_budget`` — trims the lowest-priority sections
+first, never below their min. Trimming drops whole lines (from the end, or
+from the start for ``keep="tail"`` sections like history) so no LLM call is
+needed to make the prompt fit.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+KEEP_ALL = 1 << 30  # min_tokens for sections that must never be trimmed
+
+
+# Token count per text, keyed by a content digest so the cache holds 16-byte
+# keys rather than copies of every prompt section it has seen.
+_TOKEN_CACHE_SIZE = 4096
+_token_counts: OrderedDict[bytes, int] = OrderedDict()
+_token_lock = threading.Lock()
+
+
+def _tokenize(text: str) -> int:
+    try:
+        from src.agent.context_window import _count_tokens
+        return _count_tokens(text)
+    except Exception:
+        # tiktoken unavailable (e.g. encoding not downloadable) — ~4 chars/token
+        return len(text) // 4 + 1 if text else 0
+
+
+def count_tokens(text: str) -> int:
+    """Token count of ``text``, memoized — prompt sections repeat across turns."""
+    key = hashlib.blake2b(text.encode(), digest_size=16).digest()
+    with _token_lock:
+        count = _token_counts.get(key)
+        if count is not None:
+            _token_counts.move_to_end(key)
+            return count
+    count = _tokenize(text)
+    with _token_lock:
+        _token_counts[key] = count
+        if len(_token_counts) > _TOKEN_CACHE_SIZE:
+            _token_counts.popitem(last=False)
+    return count
+
+
+@dataclass
+class PromptSection:
+    name: str
+    text: str
+    priority: int                  # higher survives longer when trimming
+    min_tokens: int = 0            # never trimmed below this
+    max_tokens: int | None = None  # clamped to this even when the total fits
+    header: str = ""               # e.g. "--- RELEVANT MEMORIES ---"
+    keep: str = "head"             # head | tail — which end survives trimming
+
+
+@dataclass
+class PlannedSection:
+    section: PromptSection
+    text: str
+    tokens: int
+    original_tokens: int
+
+    @property
+    def trimmed(self) -> bool:
+        return self.tokens < self.original_tokens
+
+
+def _trim(text: str, limit: int, keep: str, floor: int = 0) -> str:
+    """Longest run of whole lines from the kept end that fits ``limit`` tokens.
+
+    Takes one more line than fits if that is what it takes to reach ``floor``.
+    """
+    if limit <= 0:
+        return ""
+    lines = text.split("\n")
+    if keep == "tail":
+        lines.reverse()
+    kept, used = [], 0
+    for line in lines:
+        cost = count_tokens(line) + (1 if kept else 0)
+        if used + cost > limit and used >= floor:
+            if not kept:
+                # A single line larger than the whole allocation — cut it
+                ratio = limit / max(count_tokens(line), 1)
+                cut = int(len(line) * ratio)
+                kept.append(line[len(line) - cut:] if keep == "tail" else line[:cut])
+            break
+        kept.append(line)
+        used += cost
+    if keep == "tail":
+        kept.reverse()
+    return "\n".join(kept)
+
+
+def plan_prompt(sections: list[PromptSection], total: int | None = None) -> list[PlannedSection]:
+    """Allocate ``total`` tokens across ``sections`` and trim to fit.
+
+    Returns the planned sections in their original order (empty ones
+    dropped) and logs the per-section breakdown.
+    """
+    total = total if total is not None else settings.prompt_token_budget
+    planned = []
+    for section in sections:
+        if not section.text:
+            continue
+        tokens = count_tokens(section.text)
+        text, size = section.text, tokens
+        if section.max_tokens is not None and tokens > section.max_tokens:
+            text = _trim(section.text, section.max_tokens, section.keep)
+            size = count_tokens(text)
+        planned.append(PlannedSection(section, text, size, tokens))
+
+    overflow = sum(p.tokens for p in planned) - total
+    for p in sorted(planned, key=lambda p: p.section.priority):
+        if overflow <= 0:
+            break
+        floor = min(p.section.min_tokens, p.tokens)
+        target = max(floor, p.tokens - overflow)
+        if target < p.tokens:
+            p.text = _trim(p.text, target, p.section.keep, floor)
+            new_size = count_tokens(p.text) if p.text else 0
+            overflow -= p.tokens - new_size
+            p.tokens = new_size
+
+    used = sum(p.tokens for p in planned)
+    breakdown = ", ".join(
+        f"{p.section.name}={p.tokens}" + (f"/{p.original_tokens}" if p.trimmed else "")
+        for p in planned
+    )
+    if used > total:
+        logger.warning("Prompt budget: %d/%d tokens even at section minimums (%s)", used, total, breakdown)
+    else:
+        logger.info("Prompt budget: %d/%d tokens (%s)", used, total, breakdown)
+    return planned
+
+
+def render(planned: list[PlannedSection]) -> str:
+    """Join planned sections, each under its header, with blank lines between."""
+    blocks = []
+    for p in planned:
+        if not p.text:
+            continue
+        blocks.append(f"{p.section.header}\n{p.text}" if p.section.header else p.text)
+    return "\n\n".join(blocks)
@@ -0,0 +1,93 @@
+"""Prompt-cache breakpoints for agent LLM calls.
+
+Agent system prompts are assembled as a stable prefix (persona, skills,
+soul) followed by a volatile suffix (memories, observer context, history),
+so consecutive turns share a long identical prefix. Providers with
+automatic prefix caching (OpenAI, DeepSeek) reuse it as-is; Anthropic
+models only cache up to explicit ``cache_control`` breakpoints, which
+``CachingLiteLLMModel`` adds to the request right after the stable prefix
+and on the newest message of a multi-step agent run.
+"""
+
+import logging
+
+from smolagents import LiteLLMModel
+
+logger = logging.getLogger(__name__)
+
+_EPHEMERAL = {"type": "ephemeral"}
+
+
+def supports_cache_control(model_id: str) -> bool:
+    """Whether ``model_id`` takes explicit ``cache_control`` breakpoints.
+
+    True for Anthropic models, called directly or through OpenRouter.
+    """
+    name = (model_id or "").lower()
+    return "anthropic" in name or "claude" in name
+
+
+def _text_blocks(content) -> list[dict] | None:
+    if isinstance(content, str):
+        return [{"type": "text", "text": content}]
+    if isinstance(content, list):
+        return [dict(block) if isinstance(block, dict) else block for block in content]
+    return None
+
+
+def add_cache_breakpoints(messages: list[dict], stable_prefix: str) -> list[dict]:
+    """Copy of ``messages`` with ``cache_control`` breakpoints added.
+
+    The system message's text block holding ``stable_prefix`` is split right
+    after it, and the first half is marked; the last message is marked too
+    so each step of an agent run reuses the one before. Messages are not
+    modified in place.
+    """
+    result = list(messages)
+    if stable_prefix:
+        for i, message in enumerate(result):
+            if message.get("role") != "system":
+                continue
+            blocks = _text_blocks(message.get("content"))
+            if blocks is None:
+                break
+            for j, block in enumerate(blocks):
+                text = block.get("text") if isinstance(block, dict) else None
+                pos = text.find(stable_prefix) if text else -1
+                if pos < 0:
+                    continue
+                cut = pos + len(stable_prefix)
+                split = [{**block, "text": text[:cut], "cache_control": _EPHEMERAL}]
+                if text[cut:]:
+                    split.append({**block, "text": text[cut:]})
+                result[i] = {**message, "content": blocks[:j] + split + blocks[j + 1:]}
+                break
+            break
+
+    if len(result) > 1:
+        last = result[-1]
+        blocks = _text_blocks(last.get("content"))
+        if blocks and isinstance(blocks[-1], dict) and blocks[-1].get("type") == "text":
+            blocks[-1] = {**blocks[-1], "cache_control": _EPHEMERAL}
+            result[-1] = {**last, "content": blocks}
+    return result
+
+
+class CachingLiteLLMModel(LiteLLMModel):
+    """``LiteLLMModel`` that marks prompt-cache breakpoints where supported.
+
+    Set ``cache_prefix`` to the stable leading part of the agent
+    instructions; requests to other providers are left untouched.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_prefix = ""
+
+    def _prepare_completion_kwargs(self, *args, **kwargs) -> dict:
+        completion_kwargs = super()._prepare_completion_kwargs(*args, **kwargs)
+        if self.cache_prefix and supports_cache_control(self.model_id):
+            messages = completion_kwargs.get("messages")
+            if messages:
+                completion_kwargs["messages"] = add_cache_breakpoints(messages, self.cache_prefix)
+        return completion_kwargs
@@ -3,18 +3,77 @@ import logging
 import uuid
 from datetime import datetime, timezone
 
-from sqlmodel import select, col
+from sqlalchemy import tuple_
+from sqlmodel import col, delete, func, select, update
 
 from config.settings import settings
-from src.db.engine import get_session
-from src.db.models import Session, Message
+from src.db.engine import get_read_session, get_session
+from src.db.models import PREVIEW_CHARS, Session, Message, SummaryNode
 
 logger = logging.getLogger(__name__)
 
+_WINDOW_TURNS = 200   # latest user/assistant turns loaded for the history window
+_SUMMARIZE_MAX_MESSAGES = 200  # aged-out turns one summarize_history run reads
+
+
+def _naive(value: datetime) -> datetime:
+    # SQLite hands datetimes back without tzinfo; compare everything as naive UTC
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _utc(value: datetime) -> datetime:
+    # ...and bind them back as aware UTC
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def _message_dicts(messages: list[Message]) -> list[dict]:
+    return [
+        {"id": m.id, "role": m.role, "content": m.content, "created_at": m.created_at.isoformat()}
+        for m in messages
+    ]
+
+
+def _dialogue(session_id: str):
+    return (
+        select(Message)
+        .where(Message.session_id == session_id)
+        .where(Message.role.in_(["user", "assistant"]))  # type: ignore[attr-defined]
+    )
+
+
+def _summary_through(nodes: list[SummaryNode]) -> str | None:
+    """ISO created_at of the newest message covered by the summary tree."""
+    leaves = [n.last_at for n in nodes if n.level == 1]
+    return max(leaves).isoformat() if leaves else None
+
+
+def _assemble_context(
+    session_id: str, msg_dicts: list[dict], summary_nodes: list[SummaryNode] | None
+) -> str:
+    from src.agent.context_window import build_context_window, summary_budget
+
+    if summary_nodes is None:
+        return build_context_window(msg_dicts, session_id=session_id)
+
+    from src.agent.summary_tree import select_summary
+
+    summary, _ = select_summary(summary_nodes, summary_budget(msg_dicts))
+    return build_context_window(
+        msg_dicts,
+        session_id=session_id,
+        summary=summary,
+        summary_through=_summary_through(summary_nodes),
+    )
+
 
 class SessionManager:
     """DB-backed session manager replacing the old in-memory dict."""
 
+    def __init__(self) -> None:
+        self._summarizing: set[str] = set()  # sessions with a summarization run in flight
+
     async def get_or_create(self, session_id: str | None = None) -> Session:
         async with get_session() as db:
             if session_id:
@@ -32,7 +91,7 @@ class SessionManager:
             return session
 
     async def get(self, session_id: str) -> Session | None:
-        async with get_session() as db:
+        async with get_read_session() as db:
             result = await db.execute(select(Session).where(Session.id == session_id))
             session = result.scalars().first()
             if session:
@@ -40,50 +99,61 @@ class SessionManager:
             return session
 
     async def delete(self, session_id: str) -> bool:
+        """Delete a session with its messages and summary nodes."""
         async with get_session() as db:
-            result = await db.execute(select(Session).where(Session.id == session_id))
-            session = result.scalars().first()
-            if not session:
+            result = await db.execute(
+                delete(Session).where(Session.id == session_id)
+                .execution_options(synchronize_session=False)
+            )
+            if not result.rowcount:
                 return False
-            # Delete associated messages first
-            msgs = await db.execute(
-                select(Message).where(Message.session_id == session_id)
+            messages = await db.execute(
+                delete(Message).where(Message.session_id == session_id)
+                .execution_options(synchronize_session=False)
             )
-            for msg in msgs.scalars().all():
-                await db.delete(msg)
-            await db.delete(session)
-            return True
+            await db.execute(
+                delete(SummaryNode).where(SummaryNode.session_id == session_id)
+                .execution_options(synchronize_session=False)
+            )
+        logger.info("Deleted session %s with %d messages", session_id[:8], messages.rowcount)
+        return True
 
-    async def list_sessions(self) -> list[dict]:
-        async with get_session() as db:
-            # Single query: fetch sessions with their latest message using window function
-            from sqlalchemy import text
-            rows = (await db.execute(text(
-                """
-                SELECT
-                    s.id, s.title, s.created_at, s.updated_at,
-                    lm.content AS last_content, lm.role AS last_role
-                FROM sessions s
-                LEFT JOIN (
-                    SELECT session_id, content, role,
-                           ROW_NUMBER() OVER (PARTITION BY session_id ORDER BY created_at DESC) AS rn
-                    FROM messages
-                ) lm ON lm.session_id = s.id AND lm.rn = 1
-                ORDER BY s.updated_at DESC
-                """
-            ))).all()
+    async def list_sessions(
+        self,
+        limit: int | None = None,
+        before: tuple[datetime, str] | None = None,
+    ) -> list[dict]:
+        """Sessions, most recently updated first.
 
-            return [
-                {
-                    "id": r.id,
-                    "title": r.title,
-                    "created_at": r.created_at if isinstance(r.created_at, str) else r.created_at.isoformat(),
-                    "updated_at": r.updated_at if isinstance(r.updated_at, str) else r.updated_at.isoformat(),
-                    "last_message": r.last_content[:100] if r.last_content else None,
-                    "last_message_role": r.last_role,
-                }
-                for r in rows
-            ]
+        Reads only the ``sessions`` table — the last-message preview and
+        message count are kept up to date by ``add_message``. Pages are
+        keyset-paginated: pass the last row's ``(updated_at, id)`` as
+        ``before`` to get the next ``limit`` sessions.
+        """
+        query = select(
+            Session.id, Session.title, Session.created_at, Session.updated_at,
+            Session.last_message_preview, Session.last_message_role, Session.message_count,
+        ).order_by(col(Session.updated_at).desc(), col(Session.id).desc())
+        if before is not None:
+            query = query.where(tuple_(Session.updated_at, Session.id) < tuple_(*before))
+        if limit is not None:
+            query = query.limit(limit)
+
+        async with get_read_session() as db:
+            rows = (await db.execute(query)).all()
+
+        return [
+            {
+                "id": r.id,
+                "title": r.title,
+                "created_at": r.created_at.isoformat(),
+                "updated_at": r.updated_at.isoformat(),
+                "last_message": r.last_message_preview,
+                "last_message_role": r.last_message_role,
+                "message_count": r.message_count,
+            }
+            for r in rows
+        ]
 
     async def update_title(self, session_id: str, title: str) -> bool:
         async with get_session() as db:
@@ -118,56 +188,288 @@ class SessionManager:
                 metadata_json=metadata_json,
             )
             db.add(msg)
-            # Update session timestamp
-            result = await db.execute(select(Session).where(Session.id == session_id))
-            session = result.scalars().first()
-            if session:
-                session.updated_at = datetime.now(timezone.utc)
-                db.add(session)
             await db.flush()
+            # Keep the session row's list summary in step with its messages
+            await db.execute(
+                update(Session)
+                .where(Session.id == session_id)
+                .values(
+                    updated_at=datetime.now(timezone.utc),
+                    last_message_preview=content[:PREVIEW_CHARS],
+                    last_message_role=role,
+                    message_count=Session.message_count + 1,
+                )
+                .execution_options(synchronize_session=False)
+            )
             db.expunge(msg)
             return msg
 
     async def get_history_text(
         self, session_id: str, limit: int = 50
     ) -> str:
-        async with get_session() as db:
+        """Token-aware conversation history for the agent prompt.
+
+        History that no longer fits is rendered from the session's summary
+        tree; messages that have aged out since the last summarization are
+        summarized by a background task, never on this path.
+        """
+        from src.agent.summary_tree import CHUNK_MESSAGES
+
+        async with get_read_session() as db:
+            result = await db.execute(
+                select(SummaryNode)
+                .where(SummaryNode.session_id == session_id)
+                .order_by(col(SummaryNode.level), col(SummaryNode.seq))
+            )
+            nodes = list(result.scalars().all())
+            messages = await self._dialogue_window(db, session_id)
+            backlog = await self._aged_out(db, session_id, messages, nodes, CHUNK_MESSAGES)
+
+        through = _summary_through(nodes)
+        text = await self._render_history(session_id, messages, limit, summary_nodes=nodes)
+        if messages:
+            self._maybe_schedule_summarize(session_id, messages, through, len(backlog))
+        return text
+
+    async def _dialogue_window(self, db, session_id: str) -> list[Message]:
+        """The session's first messages plus its latest ``_WINDOW_TURNS`` user/assistant turns."""
+        dialogue = _dialogue(session_id)
+        result = await db.execute(
+            dialogue.order_by(col(Message.created_at).desc()).limit(_WINDOW_TURNS)
+        )
+        latest = list(reversed(result.scalars().all()))
+
+        keep_first = settings.context_window_keep_first
+        if len(latest) < _WINDOW_TURNS or keep_first <= 0:
+            return latest
+        # Long session: the opening turns fell outside the latest window
+        result = await db.execute(dialogue.order_by(col(Message.created_at).asc()).limit(keep_first))
+        seen = {m.id for m in latest}
+        first = [m for m in result.scalars().all() if m.id not in seen]
+        return first + latest
+
+    async def _aged_out(
+        self, db, session_id: str, window: list[Message], nodes: list[SummaryNode], limit: int
+    ) -> list[Message]:
+        """Turns older than the history window that the summary tree hasn't covered.
+
+        Only long sessions have any: they sit between the opening turns and
+        the latest ``_WINDOW_TURNS``, so they are never shown verbatim.
+        Oldest first, starting after the tree's last covered message.
+        """
+        if len(window) < _WINDOW_TURNS:
+            return []
+        opening = window[:len(window) - _WINDOW_TURNS]
+        query = _dialogue(session_id).where(
+            col(Message.created_at) < _utc(window[-_WINDOW_TURNS].created_at)
+        )
+        bounds = [n.last_at for n in nodes if n.level == 1]
+        if opening:
+            bounds.append(opening[-1].created_at)
+        if bounds:
+            query = query.where(col(Message.created_at) > _utc(max(_naive(b) for b in bounds)))
+        result = await db.execute(query.order_by(col(Message.created_at).asc()).limit(limit))
+        return list(result.scalars().all())
+
+    def _maybe_schedule_summarize(
+        self, session_id: str, messages: list[Message], summary_through: str | None, backlog: int = 0
+    ) -> None:
+        if session_id in self._summarizing:
+            return
+        try:
+            from src.agent.context_window import pending_fold
+            from src.agent.summary_tree import CHUNK_MESSAGES
+            pending = backlog + len(pending_fold(_message_dicts(messages), summary_through))
+            if pending < CHUNK_MESSAGES:
+                return
+        except Exception:
+            logger.debug("Could not check summary backlog for %s", session_id[:8], exc_info=True)
+            return
+
+        from src.utils.background import track_task
+
+        self._summarizing.add(session_id)
+        track_task(self._summarize_then_release(session_id), name=f"summarize-{session_id[:8]}")
+
+    async def _summarize_then_release(self, session_id: str) -> None:
+        try:
+            await self.summarize_history(session_id)
+        finally:
+            self._summarizing.discard(session_id)
+
+    async def summarize_history(self, session_id: str) -> int:
+        """Extend the session's summary tree with aged-out messages.
+
+        Picks up after the last message the tree covers: first any turns
+        older than the history window, then the window's own overflow. Each
+        complete chunk of aged-out messages becomes a level-1 node, and
+        every ``FAN_IN`` nodes of a level are combined into the next level up.
+        Nodes are persisted as they are produced, so an interrupted run
+        keeps its progress. Returns the number of messages summarized.
+        """
+        from src.agent.context_window import _count_tokens, pending_fold
+        from src.agent.summary_tree import CHUNK_MESSAGES, FAN_IN, combine_summaries, summarize_chunk
+
+        # Read-only: stay off the single writer connection chat turns need
+        async with get_read_session() as db:
+            result = await db.execute(
+                select(SummaryNode)
+                .where(SummaryNode.session_id == session_id)
+                .order_by(col(SummaryNode.level), col(SummaryNode.seq))
+            )
+            nodes = list(result.scalars().all())
+            messages = await self._dialogue_window(db, session_id)
+            aged_out = await self._aged_out(db, session_id, messages, nodes, _SUMMARIZE_MAX_MESSAGES)
+        if not messages:
+            return 0
+
+        # Turns that fell out of the window first, then the window's own
+        # overflow — unless the run is already full, which would leave a gap
+        pending = _message_dicts(aged_out)
+        if len(aged_out) < _SUMMARIZE_MAX_MESSAGES:
+            pending += await asyncio.to_thread(
+                pending_fold, _message_dicts(messages), _summary_through(nodes),
+            )
+        levels: dict[int, list[SummaryNode]] = {}
+        for node in nodes:
+            levels.setdefault(node.level, []).append(node)
+
+        async def _produce(fn, arg) -> tuple[str, int]:
+            def _run():
+                text = fn(arg)
+                return text, _count_tokens(text)
+            return await asyncio.wait_for(
+                asyncio.to_thread(_run), timeout=settings.consolidation_llm_timeout,
+            )
+
+        async def _store(node: SummaryNode) -> None:
+            async with get_session() as db:
+                db.add(node)
+                await db.flush()
+                db.expunge(node)
+            levels.setdefault(node.level, []).append(node)
+
+        summarized = 0
+        try:
+            for start in range(0, len(pending) - CHUNK_MESSAGES + 1, CHUNK_MESSAGES):
+                chunk = pending[start:start + CHUNK_MESSAGES]
+                text, tokens = await _produce(summarize_chunk, chunk)
+                await _store(SummaryNode(
+                    session_id=session_id, level=1, seq=len(levels.get(1, [])),
+                    content=text, token_count=tokens,
+                    first_at=datetime.fromisoformat(chunk[0]["created_at"]),
+                    last_at=datetime.fromisoformat(chunk[-1]["created_at"]),
+                ))
+                summarized += len(chunk)
+
+                # Combine upward while a level has a full group not yet rolled up
+                level = 1
+                while len(levels.get(level, [])) >= (len(levels.get(level + 1, [])) + 1) * FAN_IN:
+                    lo = len(levels.get(level + 1, [])) * FAN_IN
+                    group = levels[level][lo:lo + FAN_IN]
+                    text, tokens = await _produce(combine_summaries, [n.content for n in group])
+                    await _store(SummaryNode(
+                        session_id=session_id, level=level + 1, seq=len(levels.get(level + 1, [])),
+                        content=text, token_count=tokens,
+                        first_at=group[0].first_at, last_at=group[-1].last_at,
+                    ))
+                    level += 1
+        except Exception:
+            logger.warning("History summarization failed for session %s", session_id[:8], exc_info=True)
+
+        if summarized:
+            logger.info(
+                "Summarized %d messages for session %s (%d levels)",
+                summarized, session_id[:8], max(levels),
+            )
+        return summarized
+
+    async def get_unconsolidated(
+        self, session_id: str, limit: int = 50, token_budget: int | None = None
+    ) -> tuple[str, datetime | None]:
+        """Return the oldest history newer than the session's consolidation watermark.
+
+        Up to ``limit`` user/assistant messages are taken in chronological
+        order and rendered verbatim until ``token_budget`` (default
+        ``context_window_token_budget``) is spent; the rest are left for the
+        next call. The second element is the ``created_at`` of the last
+        message rendered — pass it to ``mark_consolidated`` once it has been
+        processed. Returns ``("", None)`` when there is nothing new.
+        """
+        from src.agent.prompt_budget import count_tokens
+
+        budget = token_budget if token_budget is not None else settings.context_window_token_budget
+        async with get_read_session() as db:
             result = await db.execute(
+                select(Session.consolidated_through).where(Session.id == session_id)
+            )
+            watermark = result.scalar_one_or_none()
+
+            query = (
                 select(Message)
                 .where(Message.session_id == session_id)
                 .where(Message.role.in_(["user", "assistant"]))  # type: ignore[attr-defined]
-                .order_by(col(Message.created_at).desc())
-                .limit(200)
             )
-            messages = list(reversed(result.scalars().all()))
-            if not messages:
-                return ""
+            if watermark is not None:
+                query = query.where(col(Message.created_at) > watermark)
+            result = await db.execute(
+                query.order_by(col(Message.created_at).asc()).limit(limit)
+            )
+            messages = result.scalars().all()
 
-            msg_dicts = [
-                {"role": m.role, "content": m.content, "created_at": m.created_at.isoformat()}
-                for m in messages
-            ]
+        lines: list[str] = []
+        through = None
+        used = 0
+        for msg in messages:
+            line = f"{msg.role.capitalize()}: {msg.content}"
+            tokens = count_tokens(line) + 1  # joining newline
+            if lines and used + tokens > budget:
+                break
+            lines.append(line)
+            used += tokens
+            through = msg.created_at
+        return "\n".join(lines), through
 
-            try:
-                from src.agent.context_window import build_context_window
-                return await asyncio.to_thread(
-                    build_context_window,
-                    msg_dicts,
-                    session_id=session_id,
-                )
-            except Exception:
-                logger.warning("Token-aware context failed, falling back to simple truncation")
-                lines = []
-                for msg in messages[-limit:]:
-                    role = msg.role.capitalize()
-                    lines.append(f"{role}: {msg.content}")
-                return "\n".join(lines)
+    async def mark_consolidated(self, session_id: str, through: datetime) -> bool:
+        """Advance the consolidation watermark; never moves it backwards."""
+        async with get_session() as db:
+            result = await db.execute(select(Session).where(Session.id == session_id))
+            session = result.scalars().first()
+            if not session:
+                return False
+            current = session.consolidated_through
+            if current is None or _naive(current) < _naive(through):
+                session.consolidated_through = through
+                db.add(session)
+            return True
+
+    async def _render_history(
+        self,
+        session_id: str,
+        messages: list[Message],
+        limit: int,
+        summary_nodes: list[SummaryNode] | None = None,
+    ) -> str:
+        if not messages:
+            return ""
+
+        try:
+            return await asyncio.to_thread(
+                _assemble_context, session_id, _message_dicts(messages), summary_nodes,
+            )
+        except Exception:
+            logger.warning("Token-aware context failed, falling back to simple truncation")
+            lines = []
+            for msg in messages[-limit:]:
+                role = msg.role.capitalize()
+                lines.append(f"{role}: {msg.content}")
+            return "\n".join(lines)
 
     async def get_messages(
         self, session_id: str, limit: int = 100, offset: int = 0
     ) -> list[dict]:
         limit = min(max(limit, 1), 1000)
-        async with get_session() as db:
+        async with get_read_session() as db:
             result = await db.execute(
                 select(Message)
                 .where(Message.session_id == session_id)
@@ -193,7 +495,7 @@ class SessionManager:
         if not session or session.title != "New Conversation":
             return session.title if session else None
 
-        async with get_session() as db:
+        async with get_read_session() as db:
             result = await db.execute(
                 select(Message)
                 .where(Message.session_id == session_id)
@@ -234,13 +536,14 @@ class SessionManager:
 
     async def count_messages(self, session_id: str) -> int:
         """Count user+assistant messages in a session."""
-        async with get_session() as db:
+        async with get_read_session() as db:
             result = await db.execute(
-                select(Message)
+                select(func.count())
+                .select_from(Message)
                 .where(Message.session_id == session_id)
                 .where(Message.role.in_(["user", "assistant"]))  # type: ignore[attr-defined]
             )
-            return len(result.scalars().all())
+            return result.scalar_one()
 
 
 session_manager = SessionManager()
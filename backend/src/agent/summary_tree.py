@@ -0,0 +1,110 @@
+"""Hierarchical summaries of long conversations.
+
+History that ages out of the context window is summarized in fixed-size
+chunks of ``CHUNK_MESSAGES`` messages (level 1). Every ``FAN_IN``
+consecutive nodes of one level are combined into a single node of the next
+level up. Chunk boundaries never move and nodes are never rewritten, so
+each summary is produced exactly once.
+
+At prompt time the tree is read, not regenerated: ``select_summary`` picks
+the most detailed level whose rendering fits the available budget, using
+the token counts stored on each node.
+"""
+
+import logging
+from collections import defaultdict
+from typing import Protocol, Sequence
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+CHUNK_MESSAGES = 20  # messages per level-1 node
+FAN_IN = 4           # nodes of level N combined into one level N+1 node
+_MESSAGE_CHARS = 2000  # per-message cap inside a chunk prompt
+
+
+class _Node(Protocol):
+    level: int
+    seq: int
+    content: str
+    token_count: int
+
+
+def _complete(prompt: str, max_tokens: int) -> str:
+    import litellm
+
+    response = litellm.completion(
+        model=settings.default_model,
+        messages=[{"role": "user", "content": prompt}],
+        api_key=settings.openrouter_api_key,
+        api_base="https://openrouter.ai/api/v1",
+        temperature=0.3,
+        max_tokens=max_tokens,
+    )
+    return response.choices[0].message.content.strip()
+
+
+def summarize_chunk(messages: list[dict]) -> str:
+    """Level-1 summary of one chunk of messages. Raises on LLM failure."""
+    from src.agent.context_window import _format_messages
+
+    clipped = [{**m, "content": m.get("content", "")[:_MESSAGE_CHARS]} for m in messages]
+    return _complete(
+        "Summarize this conversation excerpt in one concise paragraph. "
+        "Focus on key topics, decisions, facts about the user and any "
+        f"commitments made.\n\n{_format_messages(clipped)}",
+        max_tokens=200,
+    )
+
+
+def combine_summaries(texts: list[str]) -> str:
+    """Merge consecutive summaries into one higher-level summary."""
+    joined = "\n\n".join(f"Part {i + 1}: {t}" for i, t in enumerate(texts))
+    return _complete(
+        "These are summaries of consecutive parts of one conversation, in order. "
+        "Combine them into a single concise paragraph that keeps the most "
+        f"important topics, decisions and commitments.\n\n{joined}",
+        max_tokens=250,
+    )
+
+
+def frontier(nodes: Sequence[_Node], level: int) -> list[_Node]:
+    """Nodes that together cover every summarized chunk exactly once.
+
+    Uses all nodes of ``level`` plus, below it, whichever nodes have not yet
+    been combined into the level above — ordered oldest first.
+    """
+    by_level: dict[int, list[_Node]] = defaultdict(list)
+    for node in nodes:
+        by_level[node.level].append(node)
+    for group in by_level.values():
+        group.sort(key=lambda n: n.seq)
+
+    covered_seq = 0  # nodes of the current level already covered from above
+    parts: list[list[_Node]] = []
+    for lvl in range(level, 0, -1):
+        group = by_level.get(lvl, [])
+        parts.append(group[covered_seq:])
+        covered_seq = max(covered_seq, len(group)) * FAN_IN
+    return [node for part in parts for node in part]
+
+
+def select_summary(nodes: Sequence[_Node], available: int) -> tuple[str, int]:
+    """Render the most detailed level of the tree that fits ``available`` tokens.
+
+    Returns ``(text, level)``; falls back to the coarsest level when none
+    fits, and ``("", 0)`` when there are no nodes.
+    """
+    if not nodes:
+        return "", 0
+    top = max(node.level for node in nodes)
+    chosen: list[_Node] = []
+    for level in range(1, top + 1):
+        chosen = frontier(nodes, level)
+        tokens = sum(node.token_count for node in chosen) + len(chosen) - 1
+        if tokens <= available:
+            break
+    else:
+        logger.debug("No summary level fits %d tokens; using level %d", available, top)
+    return "\n".join(node.content for node in chosen), level
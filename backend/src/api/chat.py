@@ -8,9 +8,10 @@ from src.agent.factory import build_agent
 from src.agent.onboarding import create_onboarding_agent
 from src.agent.session import session_manager
 from src.api.profile import get_or_create_profile, mark_onboarding_complete
-from src.memory.soul import read_soul
-from src.memory.vector_store import search_formatted
+from src.memory.soul import aread_soul
+from src.memory.vector_store import memory_store
 from src.models.schemas import ChatRequest, ChatResponse
+from src.warmup import recall_available
 
 logger = logging.getLogger(__name__)
 
@@ -29,8 +30,12 @@ async def chat(request: ChatRequest):
         agent = create_onboarding_agent()
     else:
         history = await session_manager.get_history_text(session.id)
-        soul = read_soul()
-        memories = await asyncio.to_thread(search_formatted, request.message)
+        soul = await aread_soul()
+        if recall_available():
+            memories = await memory_store.search_formatted(request.message)
+        else:
+            logger.info("Embedder still warming up — skipping memory recall")
+            memories = ""
 
         from src.observer.manager import context_manager as obs_manager
         observer_context = obs_manager.get_context().to_prompt_block()
@@ -1,6 +1,7 @@
 import logging
+from datetime import datetime
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from pydantic import BaseModel, Field
 
 from src.agent.session import session_manager
@@ -14,10 +15,31 @@ class SessionUpdate(BaseModel):
     title: str = Field(..., min_length=1)
 
 
+def _parse_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        updated_at, session_id = cursor.rsplit("|", 1)
+        return datetime.fromisoformat(updated_at), session_id
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.get("/sessions")
-async def list_sessions():
-    """List all sessions with titles and last message preview."""
-    return await session_manager.list_sessions()
+async def list_sessions(
+    response: Response,
+    limit: int | None = Query(default=None, ge=1, le=500),
+    cursor: str | None = Query(default=None),
+):
+    """List sessions with titles and last message preview, newest first.
+
+    Without ``limit`` every session is returned. With it, a full page sets
+    the ``X-Next-Cursor`` header; pass it back as ``cursor`` for the next page.
+    """
+    before = _parse_cursor(cursor) if cursor else None
+    sessions = await session_manager.list_sessions(limit=limit, before=before)
+    if limit is not None and len(sessions) == limit:
+        last = sessions[-1]
+        response.headers["X-Next-Cursor"] = f"{last['updated_at']}|{last['id']}"
+    return sessions
 
 
 @router.get("/sessions/{session_id}/messages")
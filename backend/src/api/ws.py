@@ -10,10 +10,11 @@ from src.agent.factory import build_agent
 from src.agent.onboarding import create_onboarding_agent
 from src.agent.session import session_manager
 from src.api.profile import get_or_create_profile, mark_onboarding_complete, reset_onboarding
-from src.memory.soul import read_soul
-from src.memory.vector_store import search_formatted
+from src.memory.soul import aread_soul
+from src.memory.vector_store import memory_store
 from src.models.schemas import WSMessage, WSResponse
 from src.scheduler.connection_manager import ws_manager
+from src.warmup import recall_available
 
 logger = logging.getLogger(__name__)
 
@@ -53,8 +54,12 @@ async def _build_agent(session_id: str, message: str):
         return create_onboarding_agent(), True, set()
 
     history = await session_manager.get_history_text(session_id)
-    soul = read_soul()
-    memories = await asyncio.to_thread(search_formatted, message)
+    soul = await aread_soul()
+    if recall_available():
+        memories = await memory_store.search_formatted(message)
+    else:
+        logger.info("Embedder still warming up — skipping memory recall")
+        memories = ""
 
     from src.observer.manager import context_manager as obs_manager
     observer_context = obs_manager.get_context().to_prompt_block()
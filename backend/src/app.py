@@ -14,6 +14,7 @@ from src.memory.soul import ensure_soul_exists
 from src.scheduler.engine import init_scheduler, shutdown_scheduler
 from src.skills.manager import skill_manager
 from src.tools.mcp_manager import mcp_manager
+from src.warmup import start_warmup, status as warmup_status
 
 limiter = Limiter(key_func=get_remote_address, default_limits=["60/minute"])
 
@@ -37,6 +38,7 @@ async def lifespan(app: FastAPI):
     await init_db()
     ensure_soul_exists()
     init_llm_logging()
+    start_warmup()
     # Load persisted settings before scheduler starts
     try:
         from src.api.profile import get_or_create_profile
@@ -103,7 +105,7 @@ def create_app() -> FastAPI:
 
     @app.get("/health")
     async def health():
-        return {"status": "ok"}
+        return {"status": "ok", **warmup_status()}
 
     from src.api.router import api_router
 
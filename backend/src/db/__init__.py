@@ -1,3 +1,3 @@
-from src.db.engine import init_db, close_db, get_session
+from src.db.engine import init_db, close_db, get_read_session, get_session
 
-__all__ = ["init_db", "close_db", "get_session"]
+__all__ = ["init_db", "close_db", "get_read_session", "get_session"]
@@ -2,24 +2,134 @@ import os
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlmodel import SQLModel
 
 from config.settings import settings
+from src.db.models import PREVIEW_CHARS
 
 _db_path = os.path.join(settings.workspace_dir, "seraph.db")
 _db_url = f"sqlite+aiosqlite:///{_db_path}"
 
-engine = create_async_engine(
-    _db_url,
-    echo=settings.debug,
-    connect_args={"check_same_thread": False},
-)
+
+def _pragmas(read_only: bool) -> list[tuple[str, str]]:
+    """Per-connection SQLite settings.
+
+    WAL lets readers proceed while a write is in progress, and with
+    ``synchronous=NORMAL`` a commit no longer fsyncs the database file —
+    only the WAL at checkpoints. ``busy_timeout`` makes a locked database
+    wait instead of failing immediately.
+    """
+    pragmas = [
+        ("journal_mode", "WAL"),
+        ("synchronous", "NORMAL"),
+        ("busy_timeout", str(settings.sqlite_busy_timeout_ms)),
+        ("mmap_size", str(settings.sqlite_mmap_size)),
+        ("cache_size", str(-settings.sqlite_cache_size_kb)),  # negative = KiB
+        ("temp_store", "MEMORY"),
+    ]
+    if read_only:
+        pragmas.append(("query_only", "ON"))
+    return pragmas
+
+
+def create_sqlite_engine(url: str, *, read_only: bool = False) -> AsyncEngine:
+    """Create an engine whose connections use the tuned pragma profile.
+
+    The writer engine holds exactly one connection, so in-process writes
+    queue on the pool instead of contending for SQLite's write lock; the
+    read-only engine keeps a pool of ``sqlite_reader_pool_size``
+    connections that never block on it under WAL.
+    """
+    pool_size = max(1, settings.sqlite_reader_pool_size) if read_only else 1
+    new_engine = create_async_engine(
+        url,
+        echo=settings.debug,
+        connect_args={"check_same_thread": False},
+        pool_size=pool_size,
+        max_overflow=0,
+    )
+    pragmas = _pragmas(read_only)
+
+    @event.listens_for(new_engine.sync_engine, "connect")
+    def _apply_pragmas(dbapi_connection, _connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    return new_engine
+
+
+engine = create_sqlite_engine(_db_url)
+read_engine = create_sqlite_engine(_db_url, read_only=True)
 
 async_session_factory = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
+async_read_session_factory = sessionmaker(
+    read_engine, class_=AsyncSession, expire_on_commit=False
+)
+
+
+# Columns added to existing tables after their first release. create_all only
+# creates missing tables, so older databases pick these up via ALTER TABLE.
+_ADDED_COLUMNS: dict[str, dict[str, str]] = {
+    "sessions": {
+        "consolidated_through": "DATETIME",
+        "last_message_preview": "VARCHAR",
+        "last_message_role": "VARCHAR",
+        "message_count": "INTEGER NOT NULL DEFAULT 0",
+    },
+}
+
+# One-off statements that fill a column in when it is first added.
+_BACKFILLS: dict[str, list[str]] = {
+    "sessions.message_count": [
+        f"""
+        UPDATE sessions SET
+            message_count = (SELECT COUNT(*) FROM messages WHERE session_id = sessions.id),
+            last_message_preview = (
+                SELECT substr(content, 1, {PREVIEW_CHARS}) FROM messages
+                WHERE session_id = sessions.id ORDER BY created_at DESC LIMIT 1
+            ),
+            last_message_role = (
+                SELECT role FROM messages
+                WHERE session_id = sessions.id ORDER BY created_at DESC LIMIT 1
+            )
+        """,
+    ],
+}
+
+
+def _add_missing_columns(conn) -> list[str]:
+    """Add any ``_ADDED_COLUMNS`` a table lacks; returns them as ``table.column``."""
+    added = []
+    for table, columns in _ADDED_COLUMNS.items():
+        existing = {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})")}
+        for name, ddl in columns.items():
+            if name not in existing:
+                conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}")
+                added.append(f"{table}.{name}")
+    return added
+
+
+def _run_backfills(conn, added: list[str]) -> None:
+    for column in added:
+        for statement in _BACKFILLS.get(column, []):
+            conn.exec_driver_sql(statement)
+
+
+def _add_missing_indexes(conn) -> None:
+    # create_all skips tables that already exist, and with them any index
+    # declared on the model after the table was first created.
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
 
 
 async def init_db() -> None:
@@ -27,10 +137,14 @@ async def init_db() -> None:
     os.makedirs(os.path.dirname(_db_path), exist_ok=True)
     async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
+        added = await conn.run_sync(_add_missing_columns)
+        await conn.run_sync(_add_missing_indexes)
+        await conn.run_sync(_run_backfills, added)
 
 
 async def close_db() -> None:
-    """Dispose of the engine on shutdown."""
+    """Dispose of the engines on shutdown."""
+    await read_engine.dispose()
     await engine.dispose()
 
 
@@ -44,3 +158,15 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         except Exception:
             await session.rollback()
             raise
+
+
+@asynccontextmanager
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """Yield a session on the read-only pool.
+
+    For queries that write nothing; they run alongside the writer instead
+    of waiting for it. Writes through this session fail with
+    "attempt to write a readonly database".
+    """
+    async with async_read_session_factory() as session:
+        yield session
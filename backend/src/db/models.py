@@ -3,6 +3,7 @@ import uuid
 from datetime import datetime, timezone
 from typing import Optional
 
+from sqlalchemy import Index, text
 from sqlmodel import Field, SQLModel, Relationship
 
 
@@ -52,13 +53,26 @@ def _now() -> datetime:
 
 # ─── Session ─────────────────────────────────────────────
 
+PREVIEW_CHARS = 100  # sessions.last_message_preview length
+
+
 class Session(SQLModel, table=True):
     __tablename__ = "sessions"
+    __table_args__ = (
+        # Session list: newest first, keyset-paginated on (updated_at, id)
+        Index("ix_sessions_updated_id", "updated_at", "id"),
+    )
 
     id: str = Field(default_factory=_uuid, primary_key=True)
     title: str = Field(default="New Conversation")
     created_at: datetime = Field(default_factory=_now)
     updated_at: datetime = Field(default_factory=_now)
+    # created_at of the newest message already folded into long-term memory
+    consolidated_through: Optional[datetime] = Field(default=None)
+    # Denormalized from messages by SessionManager.add_message
+    last_message_preview: Optional[str] = Field(default=None)
+    last_message_role: Optional[str] = Field(default=None)
+    message_count: int = Field(default=0)
 
     messages: list["Message"] = Relationship(back_populates="session")
 
@@ -67,6 +81,12 @@ class Session(SQLModel, table=True):
 
 class Message(SQLModel, table=True):
     __tablename__ = "messages"
+    __table_args__ = (
+        # Dialogue reads: one session, user/assistant roles, newest first
+        Index("ix_messages_session_role_created", "session_id", "role", "created_at"),
+        # Latest message per session (session list)
+        Index("ix_messages_session_created", "session_id", "created_at"),
+    )
 
     id: str = Field(default_factory=_uuid, primary_key=True)
     session_id: str = Field(foreign_key="sessions.id", index=True)
@@ -80,6 +100,27 @@ class Message(SQLModel, table=True):
     session: Optional[Session] = Relationship(back_populates="messages")
 
 
+# ─── SummaryNode ─────────────────────────────────────────
+
+class SummaryNode(SQLModel, table=True):
+    """One node of a session's summary tree (see src/agent/summary_tree.py).
+
+    Level 1 nodes summarize fixed-size chunks of aged-out messages; level
+    N+1 nodes combine consecutive level N nodes. Nodes are never rewritten.
+    """
+    __tablename__ = "summary_nodes"
+
+    id: str = Field(default_factory=_uuid, primary_key=True)
+    session_id: str = Field(foreign_key="sessions.id", index=True)
+    level: int
+    seq: int  # position within its level
+    content: str
+    token_count: int = Field(default=0)
+    first_at: datetime  # created_at of the first message covered
+    last_at: datetime   # created_at of the last message covered
+    created_at: datetime = Field(default_factory=_now)
+
+
 # ─── Memory ──────────────────────────────────────────────
 
 class Memory(SQLModel, table=True):
@@ -146,6 +187,15 @@ class QueuedInsight(SQLModel, table=True):
 
 class ScreenObservation(SQLModel, table=True):
     __tablename__ = "screen_observations"
+    __table_args__ = (
+        # Daily summaries: unblocked observations in a time range, in order
+        Index("ix_screen_observations_blocked_timestamp", "blocked", "timestamp"),
+        # Duration backfill: the latest observation still missing a duration
+        Index(
+            "ix_screen_observations_open_timestamp", "timestamp",
+            sqlite_where=text("duration_s IS NULL"),
+        ),
+    )
 
     id: str = Field(default_factory=_uuid, primary_key=True)
     timestamp: datetime = Field(default_factory=_now, index=True)
@@ -3,9 +3,9 @@ import uuid
 from datetime import datetime, timezone
 from typing import Optional
 
-from sqlmodel import select, col
+from sqlmodel import col, delete, func, or_, select
 
-from src.db.engine import get_session
+from src.db.engine import get_read_session, get_session
 from src.db.models import Goal, GoalLevel, GoalDomain, GoalStatus
 
 logger = logging.getLogger(__name__)
@@ -38,17 +38,18 @@ class GoalRepository:
             path = "/"
             if parent_id:
                 result = await db.execute(
-                    select(Goal).where(Goal.id == parent_id)
+                    select(Goal.path).where(Goal.id == parent_id)
                 )
-                parent = result.scalars().first()
-                if parent:
-                    path = f"{parent.path}{parent.id}/"
+                parent_path = result.scalar_one_or_none()
+                if parent_path is not None:
+                    path = f"{parent_path}{parent_id}/"
 
-            # Get next sort_order for siblings
-            siblings = await db.execute(
-                select(Goal).where(Goal.parent_id == parent_id)
+            # Next sort_order goes after the last sibling
+            result = await db.execute(
+                select(func.max(Goal.sort_order)).where(Goal.parent_id == parent_id)
             )
-            sort_order = len(siblings.scalars().all())
+            last = result.scalar_one()
+            sort_order = last + 1 if last is not None else 0
 
             goal = Goal(
                 id=goal_id,
@@ -66,7 +67,7 @@ class GoalRepository:
             return goal
 
     async def get(self, goal_id: str) -> Optional[Goal]:
-        async with get_session() as db:
+        async with get_read_session() as db:
             result = await db.execute(select(Goal).where(Goal.id == goal_id))
             return result.scalars().first()
 
@@ -100,21 +101,20 @@ class GoalRepository:
     async def delete(self, goal_id: str) -> bool:
         """Delete a goal and all its descendants."""
         async with get_session() as db:
-            result = await db.execute(select(Goal).where(Goal.id == goal_id))
-            goal = result.scalars().first()
-            if not goal:
+            result = await db.execute(select(Goal.path).where(Goal.id == goal_id))
+            path = result.scalar_one_or_none()
+            if path is None:
                 return False
 
-            # Delete descendants (path starts with this goal's full path)
-            descendant_path = f"{goal.path}{goal.id}/"
-            descendants = await db.execute(
-                select(Goal).where(col(Goal.path).startswith(descendant_path))
+            # Descendants are the goals whose path starts with this goal's full path
+            descendant_path = f"{path}{goal_id}/"
+            result = await db.execute(
+                delete(Goal)
+                .where(or_(Goal.id == goal_id, col(Goal.path).startswith(descendant_path)))
+                .execution_options(synchronize_session=False)
             )
-            for d in descendants.scalars().all():
-                await db.delete(d)
-
-            await db.delete(goal)
-            return True
+        logger.info("Deleted goal %s and %d descendant(s)", goal_id[:8], result.rowcount - 1)
+        return True
 
     async def list_goals(
         self,
@@ -123,7 +123,7 @@ class GoalRepository:
         status: Optional[str] = None,
         parent_id: Optional[str] = None,
     ) -> list[Goal]:
-        async with get_session() as db:
+        async with get_read_session() as db:
             query = select(Goal)
             if level:
                 query = query.where(Goal.level == level)
@@ -142,7 +142,7 @@ class GoalRepository:
 
     async def get_tree(self) -> list[dict]:
         """Return the full goal tree as nested dicts."""
-        async with get_session() as db:
+        async with get_read_session() as db:
             result = await db.execute(
                 select(Goal).order_by(Goal.sort_order, col(Goal.created_at).asc())
             )
@@ -181,28 +181,32 @@ class GoalRepository:
 
     async def get_dashboard(self) -> dict:
         """Return summary stats for the quest log UI."""
-        async with get_session() as db:
-            result = await db.execute(select(Goal))
-            all_goals = result.scalars().all()
+        async with get_read_session() as db:
+            result = await db.execute(
+                select(Goal.domain, Goal.status, func.count())
+                .group_by(Goal.domain, Goal.status)
+            )
+            counts = result.all()
 
-        if not all_goals:
+        if not counts:
             return {"domains": {}, "active_count": 0, "completed_count": 0, "total_count": 0}
 
         domains = {}
         active_count = 0
         completed_count = 0
+        total_count = 0
 
-        for g in all_goals:
-            d = g.domain
+        for d, status, n in counts:
             if d not in domains:
                 domains[d] = {"active": 0, "completed": 0, "total": 0}
-            domains[d]["total"] += 1
-            if g.status == GoalStatus.completed:
-                domains[d]["completed"] += 1
-                completed_count += 1
-            elif g.status == GoalStatus.active:
-                domains[d]["active"] += 1
-                active_count += 1
+            domains[d]["total"] += n
+            total_count += n
+            if status == GoalStatus.completed:
+                domains[d]["completed"] += n
+                completed_count += n
+            elif status == GoalStatus.active:
+                domains[d]["active"] += n
+                active_count += n
 
         # Calculate progress percentages
         for d in domains:
@@ -214,7 +218,7 @@ class GoalRepository:
             "domains": domains,
             "active_count": active_count,
             "completed_count": completed_count,
-            "total_count": len(all_goals),
+            "total_count": total_count,
         }
 
 
@@ -8,6 +8,7 @@ without touching any call site.
 import json
 import logging
 import os
+import threading
 from datetime import datetime, timezone
 from logging.handlers import RotatingFileHandler
 
@@ -36,6 +37,9 @@ class SeraphLLMLogger(CustomLogger):
         handler.setFormatter(logging.Formatter("%(message)s"))
         self._log.addHandler(handler)
 
+        self._stats_lock = threading.Lock()
+        self._cache_stats = {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0, "cache_write_tokens": 0}
+
     # ------------------------------------------------------------------
     # Sync callbacks (called by LiteLLM for non-async completions)
     # ------------------------------------------------------------------
@@ -43,6 +47,7 @@ class SeraphLLMLogger(CustomLogger):
     def log_success_event(self, kwargs, response_obj, start_time, end_time):
         try:
             entry = self._build_entry(kwargs, response_obj, start_time, end_time, success=True)
+            self._record_cache_usage(entry["tokens"])
             self._log.info(json.dumps(entry, default=str))
         except Exception:
             logger.debug("llm_logger: failed to log success event", exc_info=True)
@@ -64,6 +69,25 @@ class SeraphLLMLogger(CustomLogger):
     async def async_log_failure_event(self, kwargs, response_obj, start_time, end_time):
         self.log_failure_event(kwargs, response_obj, start_time, end_time)
 
+    # ------------------------------------------------------------------
+    # Prompt-cache accounting
+    # ------------------------------------------------------------------
+
+    def _record_cache_usage(self, tokens: dict) -> None:
+        with self._stats_lock:
+            self._cache_stats["calls"] += 1
+            self._cache_stats["prompt_tokens"] += tokens.get("input") or 0
+            self._cache_stats["cached_tokens"] += tokens.get("cached", 0)
+            self._cache_stats["cache_write_tokens"] += tokens.get("cache_write", 0)
+
+    def cache_stats(self) -> dict:
+        """Running prompt-cache totals for successful calls since startup."""
+        with self._stats_lock:
+            stats = dict(self._cache_stats)
+        prompt = stats["prompt_tokens"]
+        stats["hit_rate"] = round(stats["cached_tokens"] / prompt, 4) if prompt else 0.0
+        return stats
+
     # ------------------------------------------------------------------
     # Entry builder
     # ------------------------------------------------------------------
@@ -86,6 +110,7 @@ class SeraphLLMLogger(CustomLogger):
                 "input": slo.get("prompt_tokens", 0),
                 "output": slo.get("completion_tokens", 0),
                 "total": slo.get("total_tokens", 0),
+                **_cache_tokens(response_obj),
             },
             "cost_usd": slo.get("response_cost", 0),
             "latency_ms": latency_ms,
@@ -113,6 +138,28 @@ class SeraphLLMLogger(CustomLogger):
         return entry
 
 
+def _int_attr(obj, name: str) -> int:
+    value = obj.get(name) if isinstance(obj, dict) else getattr(obj, name, None)
+    return value if isinstance(value, int) and not isinstance(value, bool) else 0
+
+
+def _cache_tokens(response_obj) -> dict:
+    """Prompt-cache read/write token counts from a response's usage block.
+
+    LiteLLM reports cache hits as ``prompt_tokens_details.cached_tokens``
+    (OpenAI style) and, for Anthropic, also ``cache_read_input_tokens``;
+    cache writes only as ``cache_creation_input_tokens``.
+    """
+    usage = getattr(response_obj, "usage", None) if response_obj is not None else None
+    if usage is None:
+        return {"cached": 0, "cache_write": 0}
+    details = usage.get("prompt_tokens_details") if isinstance(usage, dict) \
+        else getattr(usage, "prompt_tokens_details", None)
+    cached = _int_attr(details, "cached_tokens") if details is not None else 0
+    cached = cached or _int_attr(usage, "cache_read_input_tokens")
+    return {"cached": cached, "cache_write": _int_attr(usage, "cache_creation_input_tokens")}
+
+
 def init_llm_logging() -> None:
     """Register the LLM logger callback if enabled in settings."""
     if not settings.llm_log_enabled:
@@ -0,0 +1,50 @@
+"""Recall access tracking — counts how often each memory is surfaced.
+
+Searches call ``record()`` with the IDs they return; that only touches an
+in-process dict, so recall never writes to LanceDB. The lifecycle job drains
+the pending counts with ``drain()`` and folds them into the table's
+``access_count`` / ``last_recalled_at`` columns in one batched update.
+Counts recorded since the last drain are lost on restart, which only makes
+a memory look slightly colder than it is.
+"""
+
+import threading
+from datetime import datetime, timezone
+from typing import Iterable
+
+
+class AccessTracker:
+    """Thread-safe accumulator of per-memory recall counts and timestamps."""
+
+    def __init__(self) -> None:
+        self._pending: dict[str, tuple[int, str]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, memory_ids: Iterable[str]) -> None:
+        now = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            for memory_id in memory_ids:
+                if not memory_id:
+                    continue
+                count, _ = self._pending.get(memory_id, (0, now))
+                self._pending[memory_id] = (count + 1, now)
+
+    def drain(self) -> dict[str, tuple[int, str]]:
+        """Return and clear pending ``{id: (count, last_recalled_at)}``."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
+
+    def restore(self, pending: dict[str, tuple[int, str]]) -> None:
+        """Put drained counts back (e.g. after a failed flush)."""
+        with self._lock:
+            for memory_id, (count, last) in pending.items():
+                current_count, current_last = self._pending.get(memory_id, (0, last))
+                self._pending[memory_id] = (current_count + count, max(current_last, last))
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+
+access_tracker = AccessTracker()
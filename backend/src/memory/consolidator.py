@@ -1,10 +1,13 @@
 import asyncio
+import json
 import logging
+from datetime import datetime
 
 from config.settings import settings
+from src.agent.prompt_budget import count_tokens
 from src.agent.session import session_manager
-from src.memory.soul import read_soul, update_soul_section
-from src.memory.vector_store import add_memory
+from src.memory.soul import aread_soul, update_soul_section
+from src.memory.vector_store import memory_store
 
 logger = logging.getLogger(__name__)
 
@@ -28,91 +31,261 @@ Current soul file:
 
 Return ONLY valid JSON, no markdown fences."""
 
+_BATCH_CONSOLIDATION_PROMPT = """Analyze these separate conversations and extract key information to remember long-term.
+
+Return a JSON object keyed by the session id shown in each "### Session" header. Each value is an object with these fields:
+- "facts": list of factual statements learned about the user (name, role, preferences, etc.)
+- "patterns": list of behavioral patterns observed
+- "goals": list of goals or intentions the user mentioned
+- "reflections": list of insights or decisions made
+- "soul_updates": dict of soul sections to update (only if significant new identity/goal info). Keys are section names like "Identity", "Values", "Goals". Values are the new content. Return empty dict if no updates needed.
+
+Be selective — only extract things worth remembering across future conversations.
+Treat each conversation on its own; if one is trivial small talk, return empty lists and an empty dict for it.
+
+{conversations}
+
+Current soul file:
+{soul}
+
+Return ONLY valid JSON, no markdown fences."""
+
+_RESULT_MAX_TOKENS = 1024  # completion budget per session
+_MIN_HISTORY_CHARS = 50    # shorter new history is skipped as small talk
+
+
+async def _complete(prompt: str, max_tokens: int, label: str) -> str | None:
+    """Run one consolidation LLM call; returns None on timeout."""
+    # Use LiteLLM directly for the consolidation call (lighter than full agent)
+    import litellm
+
+    try:
+        response = await asyncio.wait_for(
+            asyncio.to_thread(
+                litellm.completion,
+                model=settings.default_model,
+                messages=[{"role": "user", "content": prompt}],
+                api_key=settings.openrouter_api_key,
+                api_base="https://openrouter.ai/api/v1",
+                temperature=0.3,
+                max_tokens=max_tokens,
+            ),
+            timeout=settings.consolidation_llm_timeout,
+        )
+    except asyncio.TimeoutError:
+        logger.warning(
+            "Consolidation LLM timed out after %ds for %s",
+            settings.consolidation_llm_timeout,
+            label,
+        )
+        return None
+    return response.choices[0].message.content.strip()
+
+
+def _parse_json(text: str):
+    # Strip markdown fences if present
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1]
+        if text.endswith("```"):
+            text = text[:-3]
+    return json.loads(text)
+
+
+async def _store_result(session_id: str, data: dict, through: datetime | None) -> None:
+    """Fan one session's extraction out to the memory store and soul file."""
+    # Store memories by category in one batched write
+    items = []
+    for category in ["facts", "patterns", "goals", "reflections"]:
+        singular = category.rstrip("s") if category != "reflections" else "reflection"
+        for item in data.get(category, []):
+            if isinstance(item, str) and len(item) > 10:
+                items.append({
+                    "text": item,
+                    "category": singular,
+                    "source_session_id": session_id,
+                })
+
+    stored = 0
+    if items:
+        try:
+            ids = await asyncio.wait_for(memory_store.add_many(items), timeout=10)
+            stored = sum(1 for memory_id in ids if memory_id)
+            if not stored:
+                # add_many reports a failed write as all "" ids
+                logger.warning("add_many stored nothing for session %s", session_id[:8])
+                through = None
+        except asyncio.TimeoutError:
+            logger.warning("add_many timed out for session %s", session_id[:8])
+            through = None
+        # With through cleared the watermark stays put and the next run
+        # retries these messages; add_many's dedup drops anything that landed.
+
+    # Apply soul updates if any
+    soul_updates = data.get("soul_updates", {})
+    for section, content in soul_updates.items():
+        if isinstance(content, str) and content.strip():
+            await asyncio.to_thread(update_soul_section, section, content)
+            logger.info("Soul updated: section '%s'", section)
+
+    if through is not None:
+        await session_manager.mark_consolidated(session_id, through)
+
+    logger.info(
+        "Consolidated session %s: %d memories stored, %d soul updates",
+        session_id[:8],
+        stored,
+        len(soul_updates),
+    )
+
 
 async def consolidate_session(session_id: str) -> None:
     """Extract long-term memories from a conversation session.
 
-    Runs as a background task after each conversation.
+    Runs as a background task after each conversation. Only messages newer
+    than the session's consolidation watermark are sent, oldest first; the
+    watermark advances to the last message sent once its memories are
+    stored, so a long backlog drains over several runs.
     """
     try:
-        history = await session_manager.get_history_text(session_id, limit=30)
-        if not history or len(history) < 50:
+        history, through = await session_manager.get_unconsolidated(session_id, limit=30)
+        if not history:
+            return
+        if len(history) < _MIN_HISTORY_CHARS:
+            # Too little to extract anything from — mark it seen so the
+            # scheduled job doesn't re-select the session every run
+            await session_manager.mark_consolidated(session_id, through)
             return
 
-        soul = read_soul()
+        soul = await aread_soul()
         prompt = _CONSOLIDATION_PROMPT.format(conversation=history, soul=soul)
-
-        # Use LiteLLM directly for the consolidation call (lighter than full agent)
-        import litellm
-
-        try:
-            response = await asyncio.wait_for(
-                asyncio.to_thread(
-                    litellm.completion,
-                    model=settings.default_model,
-                    messages=[{"role": "user", "content": prompt}],
-                    api_key=settings.openrouter_api_key,
-                    api_base="https://openrouter.ai/api/v1",
-                    temperature=0.3,
-                    max_tokens=1024,
-                ),
-                timeout=settings.consolidation_llm_timeout,
-            )
-        except asyncio.TimeoutError:
-            logger.warning(
-                "Consolidation LLM timed out after %ds for session %s",
-                settings.consolidation_llm_timeout,
-                session_id[:8],
-            )
+        text = await _complete(prompt, _RESULT_MAX_TOKENS, f"session {session_id[:8]}")
+        if text is None:
             return
 
-        text = response.choices[0].message.content.strip()
-
-        # Parse JSON response
-        import json
-
-        # Strip markdown fences if present
-        if text.startswith("```"):
-            text = text.split("\n", 1)[1]
-            if text.endswith("```"):
-                text = text[:-3]
-
-        data = json.loads(text)
-
-        # Store memories by category
-        stored = 0
-        for category in ["facts", "patterns", "goals", "reflections"]:
-            items = data.get(category, [])
-            singular = category.rstrip("s") if category != "reflections" else "reflection"
-            for item in items:
-                if isinstance(item, str) and len(item) > 10:
-                    try:
-                        await asyncio.wait_for(
-                            asyncio.to_thread(
-                                add_memory,
-                                text=item,
-                                category=singular,
-                                source_session_id=session_id,
-                            ),
-                            timeout=10,
-                        )
-                        stored += 1
-                    except asyncio.TimeoutError:
-                        logger.warning("add_memory timed out for session %s", session_id[:8])
-
-        # Apply soul updates if any
-        soul_updates = data.get("soul_updates", {})
-        for section, content in soul_updates.items():
-            if isinstance(content, str) and content.strip():
-                update_soul_section(section, content)
-                logger.info("Soul updated: section '%s'", section)
-
-        logger.info(
-            "Consolidated session %s: %d memories stored, %d soul updates",
-            session_id[:8],
-            stored,
-            len(soul_updates),
-        )
+        await _store_result(session_id, _parse_json(text), through)
 
     except Exception:
         logger.exception("Memory consolidation failed for session %s", session_id[:8])
+
+
+def _session_block(session_id: str, history: str) -> str:
+    return f"### Session {session_id}\n{history}"
+
+
+def _batch_prompt(batch: list[tuple[str, str, datetime]], soul: str) -> str:
+    conversations = "\n\n".join(_session_block(session_id, history) for session_id, history, _ in batch)
+    return _BATCH_CONSOLIDATION_PROMPT.format(conversations=conversations, soul=soul)
+
+
+def _plan_batches(
+    pending: list[tuple[str, str, datetime]], soul_tokens: int
+) -> tuple[list[list[tuple[str, str, datetime]]], list[str]]:
+    """Greedily pack sessions into prompts that fit the batch token budget.
+
+    Returns ``(batches, singles)`` — sessions too large to share a prompt
+    are left for a per-session call.
+    """
+    # The instructions, soul and per-session headers share the budget too
+    template_tokens = count_tokens(_BATCH_CONSOLIDATION_PROMPT.format(conversations="", soul=""))
+    budget = settings.consolidation_batch_token_budget - soul_tokens - template_tokens
+    max_sessions = max(1, settings.consolidation_batch_max_sessions)
+    batches: list[list[tuple[str, str, datetime]]] = []
+    singles: list[str] = []
+    current: list[tuple[str, str, datetime]] = []
+    used = 0
+
+    for entry in pending:
+        tokens = count_tokens(_session_block(entry[0], entry[1])) + 1  # joining blank line
+        if tokens > budget // 2:
+            singles.append(entry[0])
+            continue
+        if current and (used + tokens > budget or len(current) >= max_sessions):
+            batches.append(current)
+            current, used = [], 0
+        current.append(entry)
+        used += tokens
+    if current:
+        batches.append(current)
+
+    # A batch of one gains nothing over the regular prompt
+    for batch in [b for b in batches if len(b) == 1]:
+        batches.remove(batch)
+        singles.append(batch[0][0])
+    return batches, singles
+
+
+async def _consolidate_batch(batch: list[tuple[str, str, datetime]], soul: str) -> list[str]:
+    """Consolidate several sessions with one LLM call.
+
+    Returns the ids of sessions the batch could not handle (timeout,
+    unparseable output, or a missing per-session entry).
+    """
+    ids = [session_id for session_id, _, _ in batch]
+    prompt = _batch_prompt(batch, soul)
+    text = await _complete(prompt, _RESULT_MAX_TOKENS * len(batch), f"batch of {len(batch)}")
+    if text is None:
+        return ids
+
+    try:
+        data = _parse_json(text)
+    except ValueError:
+        logger.warning("Batch consolidation returned invalid JSON, falling back per session")
+        return ids
+    if not isinstance(data, dict):
+        return ids
+
+    leftover = []
+    for session_id, _, through in batch:
+        result = data.get(session_id)
+        if not isinstance(result, dict):
+            leftover.append(session_id)
+            continue
+        try:
+            await _store_result(session_id, result, through)
+        except Exception:
+            logger.exception("Memory consolidation failed for session %s", session_id[:8])
+    return leftover
+
+
+async def consolidate_sessions(session_ids: list[str]) -> int:
+    """Consolidate several sessions, sharing LLM calls where they fit.
+
+    New messages from each session are packed into batch prompts under
+    ``consolidation_batch_token_budget`` with the soul file included once.
+    Sessions that are too large for a batch, or whose batch times out or
+    comes back malformed, fall back to ``consolidate_session``.
+
+    Returns the number of sessions that had new messages to process.
+    """
+    pending = []
+    for session_id in session_ids:
+        try:
+            history, through = await session_manager.get_unconsolidated(session_id, limit=30)
+            if history and len(history) < _MIN_HISTORY_CHARS:
+                await session_manager.mark_consolidated(session_id, through)
+                continue
+        except Exception:
+            logger.exception("Failed to load history for session %s", session_id[:8])
+            continue
+        if history:
+            pending.append((session_id, history, through))
+    if not pending:
+        return 0
+
+    soul = await aread_soul()
+    batches, fallback = _plan_batches(pending, count_tokens(soul))
+    for batch in batches:
+        try:
+            fallback.extend(await _consolidate_batch(batch, soul))
+        except Exception:
+            logger.exception("Batch consolidation failed, falling back per session")
+            fallback.extend(session_id for session_id, _, _ in batch)
+
+    for session_id in fallback:
+        await consolidate_session(session_id)
+
+    logger.info(
+        "Consolidated %d sessions: %d batched calls, %d per-session calls",
+        len(pending), len(batches), len(fallback),
+    )
+    return len(pending)
@@ -3,6 +3,7 @@ import threading
 from typing import Optional
 
 from config.settings import settings
+from src.memory.embedding_cache import embedding_cache
 
 logger = logging.getLogger(__name__)
 
@@ -10,27 +11,86 @@ _model: Optional[object] = None
 _model_lock = threading.Lock()
 
 
+_BACKENDS = {"torch", "onnx"}
+
+
+def _backend() -> str:
+    backend = settings.embedding_backend.lower()
+    if backend not in _BACKENDS:
+        logger.warning("Unknown EMBEDDING_BACKEND %r — falling back to torch", backend)
+        return "torch"
+    return backend
+
+
+def model_key() -> str:
+    """Identify the vectors the active backend produces (used as the cache key).
+
+    The torch backend keeps the bare model name; ONNX variants get a suffix so
+    quantized vectors never mix with full-precision ones in the cache.
+    """
+    backend = _backend()
+    if backend == "onnx":
+        variant = "onnx-int8" if settings.embedding_onnx_quantized else "onnx"
+        return f"{settings.embedding_model}@{variant}"
+    return settings.embedding_model
+
+
+def _load_model():
+    if _backend() == "onnx":
+        from src.memory.onnx_encoder import OnnxSentenceEncoder
+
+        return OnnxSentenceEncoder(
+            settings.embedding_model, quantized=settings.embedding_onnx_quantized,
+        )
+
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(settings.embedding_model)
+
+
 def _get_model():
-    """Lazy-load the sentence-transformers model (singleton, thread-safe)."""
+    """Lazy-load the embedding model for the configured backend (singleton, thread-safe)."""
     global _model
     if _model is None:
         with _model_lock:
             if _model is None:
-                logger.info("Loading embedding model: %s", settings.embedding_model)
-                from sentence_transformers import SentenceTransformer
-
-                _model = SentenceTransformer(settings.embedding_model)
+                logger.info(
+                    "Loading embedding model: %s (backend=%s)",
+                    settings.embedding_model, _backend(),
+                )
+                _model = _load_model()
                 logger.info("Embedding model loaded")
     return _model
 
 
+def _encode(texts: list[str]) -> list[list[float]]:
+    model = _get_model()
+    return model.encode(texts, normalize_embeddings=True).tolist()
+
+
+def warmup() -> None:
+    """Load the model and run one forward pass so the first real request is fast."""
+    _encode(["warmup"])
+
+
 def embed(text: str) -> list[float]:
     """Embed a single text string into a vector."""
-    model = _get_model()
-    return model.encode(text, normalize_embeddings=True).tolist()
+    return embed_batch([text])[0]
 
 
 def embed_batch(texts: list[str]) -> list[list[float]]:
-    """Embed multiple texts into vectors."""
-    model = _get_model()
-    return model.encode(texts, normalize_embeddings=True).tolist()
+    """Embed multiple texts into vectors, encoding only cache misses."""
+    if not texts:
+        return []
+
+    model_name = model_key()
+    vectors = embedding_cache.get_many(model_name, texts)
+    missing = [i for i, v in enumerate(vectors) if v is None]
+    if missing:
+        # Encode each distinct missing text once
+        unique = list(dict.fromkeys(texts[i] for i in missing))
+        encoded = dict(zip(unique, _encode(unique)))
+        embedding_cache.put_many(model_name, unique, [encoded[t] for t in unique])
+        for i in missing:
+            vectors[i] = encoded[texts[i]]
+    return vectors
@@ -0,0 +1,269 @@
+"""Content-addressed embedding cache — in-memory LRU in front of a SQLite file.
+
+Vectors are keyed by (embedding model name, SHA-256 of the normalized text),
+so switching ``settings.embedding_model`` can never serve stale vectors. The
+disk tier lives next to the LanceDB directory and is trimmed by least-recent
+use once it grows past ``embedding_cache_max_bytes``.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Evict down to this fraction of the byte budget so we don't trim on every put
+_EVICT_TARGET = 0.9
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so trivially different strings share a cache entry."""
+    return " ".join(text.split())
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Two-tier (memory LRU + SQLite) cache of embedding vectors."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_memory_items: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> None:
+        self._path = path
+        self._max_memory_items = max_memory_items
+        self._max_bytes = max_bytes
+        # Vectors are stored as tuples and handed out as fresh lists, so a
+        # caller mutating its result can't corrupt the cache
+        self._memory: OrderedDict[tuple[str, str], tuple[float, ...]] = OrderedDict()
+        self._conn: sqlite3.Connection | None = None
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+    @property
+    def path(self) -> str:
+        return self._path or os.path.join(settings.workspace_dir, "embedding_cache.sqlite")
+
+    @property
+    def enabled(self) -> bool:
+        return settings.embedding_cache_enabled
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get_many(self, model: str, texts: list[str]) -> list[Optional[list[float]]]:
+        """Return cached vectors aligned with ``texts`` (None for misses)."""
+        if not self.enabled or not texts:
+            return [None] * len(texts)
+
+        keys = [(model, text_hash(t)) for t in texts]
+        results: list[Optional[list[float]]] = [None] * len(texts)
+        with self._lock:
+            disk_lookup: dict[str, list[int]] = {}
+            for i, key in enumerate(keys):
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    results[i] = list(vector)
+                    self._hits += 1
+                else:
+                    disk_lookup.setdefault(key[1], []).append(i)
+
+            if disk_lookup:
+                found = self._disk_get(model, list(disk_lookup))
+                for digest, positions in disk_lookup.items():
+                    vector = found.get(digest)
+                    if vector is None:
+                        self._misses += len(positions)
+                        continue
+                    self._remember((model, digest), vector)
+                    self._disk_hits += len(positions)
+                    self._hits += len(positions)
+                    for i in positions:
+                        results[i] = list(vector)
+        return results
+
+    def put_many(self, model: str, texts: list[str], vectors: list[list[float]]) -> None:
+        """Store vectors for ``texts`` in both tiers."""
+        if not self.enabled or not texts:
+            return
+        rows = {}
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                digest = text_hash(text)
+                self._remember((model, digest), vector)
+                rows[digest] = vector
+            self._disk_put(model, rows)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+                "memory_items": len(self._memory),
+                "disk_bytes": self._disk_bytes,
+            }
+
+    def clear(self) -> None:
+        """Drop every cached vector from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            conn = self._connect()
+            if conn is not None:
+                conn.execute("DELETE FROM embeddings")
+                conn.commit()
+            self._disk_bytes = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ------------------------------------------------------------------
+    # Memory tier
+    # ------------------------------------------------------------------
+
+    def _remember(self, key: tuple[str, str], vector: list[float]) -> None:
+        self._memory[key] = tuple(vector)
+        self._memory.move_to_end(key)
+        limit = self._max_memory_items or settings.embedding_cache_memory_items
+        while len(self._memory) > limit:
+            self._memory.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Disk tier (callers hold self._lock)
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection | None:
+        if self._conn is not None:
+            return self._conn
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    model TEXT NOT NULL,
+                    text_hash TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (model, text_hash)
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_embeddings_last_used ON embeddings (last_used)"
+            )
+            conn.commit()
+            row = conn.execute("SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings").fetchone()
+            self._disk_bytes = int(row[0])
+            self._conn = conn
+            logger.info("Embedding cache opened at %s (%d bytes)", self.path, self._disk_bytes)
+        except sqlite3.Error:
+            logger.warning("Embedding cache unavailable at %s", self.path, exc_info=True)
+            self._conn = None
+        return self._conn
+
+    def _disk_get(self, model: str, digests: list[str]) -> dict[str, list[float]]:
+        conn = self._connect()
+        if conn is None:
+            return {}
+        found: dict[str, list[float]] = {}
+        try:
+            # Stay well under SQLite's bound-parameter limit
+            for start in range(0, len(digests), 500):
+                chunk = digests[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings "
+                    f"WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model, *chunk],
+                ).fetchall()
+                for digest, blob in rows:
+                    found[digest] = np.frombuffer(blob, dtype=np.float32).tolist()
+            if found:
+                conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE model = ? AND text_hash = ?",
+                    [(time.time(), model, d) for d in found],
+                )
+                conn.commit()
+        except sqlite3.Error:
+            logger.warning("Embedding cache read failed", exc_info=True)
+        return found
+
+    def _disk_put(self, model: str, rows: dict[str, list[float]]) -> None:
+        conn = self._connect()
+        if conn is None or not rows:
+            return
+        now = time.time()
+        try:
+            payload = [
+                (model, digest, np.asarray(vector, dtype=np.float32).tobytes(), now)
+                for digest, vector in rows.items()
+            ]
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                payload,
+            )
+            conn.commit()
+            self._disk_bytes += sum(len(p[2]) for p in payload)
+            self._maybe_evict(conn)
+        except sqlite3.Error:
+            logger.warning("Embedding cache write failed", exc_info=True)
+
+    def _maybe_evict(self, conn: sqlite3.Connection) -> None:
+        max_bytes = self._max_bytes or settings.embedding_cache_max_bytes
+        if self._disk_bytes <= max_bytes:
+            return
+        # Recount — INSERT OR REPLACE may have overwritten existing rows
+        total = int(conn.execute(
+            "SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings"
+        ).fetchone()[0])
+        target = int(max_bytes * _EVICT_TARGET)
+        if total <= max_bytes:
+            self._disk_bytes = total
+            return
+
+        evicted = 0
+        rows = conn.execute(
+            "SELECT model, text_hash, LENGTH(vector) FROM embeddings ORDER BY last_used ASC"
+        )
+        doomed = []
+        for model, digest, size in rows:
+            if total <= target:
+                break
+            doomed.append((model, digest))
+            total -= size
+            evicted += 1
+        conn.executemany(
+            "DELETE FROM embeddings WHERE model = ? AND text_hash = ?", doomed,
+        )
+        conn.commit()
+        self._disk_bytes = total
+        logger.info("Embedding cache evicted %d entries (%d bytes remain)", evicted, total)
+
+
+embedding_cache = EmbeddingCache()
@@ -0,0 +1,180 @@
+"""Coalescing embedding service — batches concurrent embed requests into one encode."""
+
+import asyncio
+import concurrent.futures
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Optional
+
+from config.settings import settings
+from src.memory.embedder import embed_batch
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingService:
+    """Gathers concurrent embed requests for a short window and encodes them together.
+
+    Sync callers block on ``embed()`` from any thread; async callers await
+    ``aembed()`` on the event loop. A single daemon worker drains the request queue,
+    waiting up to ``max_wait_ms`` for more requests once the first arrives,
+    then runs one batched encode and hands each caller its own vector.
+    """
+
+    def __init__(
+        self,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None,
+        encode_fn: Optional[Callable[[list[str]], list[list[float]]]] = None,
+    ) -> None:
+        self._max_batch_size = max_batch_size
+        self._max_wait_ms = max_wait_ms
+        self._encode_fn = encode_fn
+        self._queue: queue.Queue = queue.Queue()
+        self._worker: threading.Thread | None = None
+        self._worker_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._reset_counters()
+
+    @property
+    def max_batch_size(self) -> int:
+        return max(1, self._max_batch_size or settings.embedding_batch_max_size)
+
+    @property
+    def max_wait_ms(self) -> float:
+        if self._max_wait_ms is not None:
+            return max(0.0, self._max_wait_ms)
+        return max(0.0, settings.embedding_batch_max_wait_ms)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def embed(self, text: str) -> list[float]:
+        """Embed a single text, sharing the forward pass with concurrent callers."""
+        return self._submit(text).result()
+
+    def embed_many(self, texts: list[str]) -> list[list[float]]:
+        """Embed several texts; they join the same batching window as single calls."""
+        futures = [self._submit(t) for t in texts]
+        return [f.result() for f in futures]
+
+    async def aembed(self, text: str) -> list[float]:
+        """Async ``embed`` — awaits the batch result without tying up a thread."""
+        return await asyncio.wrap_future(self._submit(text))
+
+    async def aembed_many(self, texts: list[str]) -> list[list[float]]:
+        """Async ``embed_many``."""
+        futures = [asyncio.wrap_future(self._submit(t)) for t in texts]
+        return list(await asyncio.gather(*futures))
+
+    def stats(self) -> dict:
+        """Return batch size and latency counters since the last reset."""
+        with self._stats_lock:
+            batches = self._batches
+            items = self._items
+            return {
+                "batches": batches,
+                "items": items,
+                "failed_batches": self._failed_batches,
+                "max_batch_size": self._largest_batch,
+                "avg_batch_size": round(items / batches, 2) if batches else 0.0,
+                "avg_encode_ms": round(self._encode_ms / batches, 2) if batches else 0.0,
+                "max_encode_ms": round(self._max_encode_ms, 2),
+                "avg_latency_ms": round(self._latency_ms / items, 2) if items else 0.0,
+                "max_latency_ms": round(self._max_latency_ms, 2),
+            }
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self._reset_counters()
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+
+    def _reset_counters(self) -> None:
+        self._batches = 0
+        self._items = 0
+        self._failed_batches = 0
+        self._largest_batch = 0
+        self._encode_ms = 0.0
+        self._max_encode_ms = 0.0
+        self._latency_ms = 0.0
+        self._max_latency_ms = 0.0
+
+    def _submit(self, text: str) -> concurrent.futures.Future:
+        self._ensure_worker()
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        self._queue.put((text, future, time.monotonic()))
+        return future
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name="embedding-service", daemon=True,
+                )
+                self._worker.start()
+
+    def _collect_batch(self) -> list[tuple]:
+        """Block for the first request, then gather more until full or the window closes."""
+        batch = [self._queue.get()]
+        limit = self.max_batch_size
+        deadline = time.monotonic() + self.max_wait_ms / 1000
+        while len(batch) < limit:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect_batch()
+            texts = [text for text, _, _ in batch]
+            encode = self._encode_fn or embed_batch
+            started = time.monotonic()
+            try:
+                vectors = encode(texts)
+                if len(vectors) != len(texts):
+                    raise RuntimeError(
+                        f"Encoder returned {len(vectors)} vectors for {len(texts)} texts"
+                    )
+            except Exception as exc:
+                logger.exception("Batched embedding failed (%d texts)", len(texts))
+                with self._stats_lock:
+                    self._failed_batches += 1
+                for _, future, _ in batch:
+                    future.set_exception(exc)
+                continue
+
+            self._record(batch, started, time.monotonic())
+            for (_, future, _), vector in zip(batch, vectors):
+                future.set_result(vector)
+
+    def _record(self, batch: list[tuple], started: float, finished: float) -> None:
+        encode_ms = (finished - started) * 1000
+        with self._stats_lock:
+            self._batches += 1
+            self._items += len(batch)
+            self._largest_batch = max(self._largest_batch, len(batch))
+            self._encode_ms += encode_ms
+            self._max_encode_ms = max(self._max_encode_ms, encode_ms)
+            for _, _, enqueued in batch:
+                latency_ms = (finished - enqueued) * 1000
+                self._latency_ms += latency_ms
+                self._max_latency_ms = max(self._max_latency_ms, latency_ms)
+        if len(batch) > 1:
+            logger.debug("Embedded batch of %d texts in %.1fms", len(batch), encode_ms)
+
+
+embedding_service = EmbeddingService()
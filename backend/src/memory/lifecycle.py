@@ -0,0 +1,224 @@
+"""Memory lifecycle — access tracking, near-duplicate merging and cold archival.
+
+Consolidation runs after every conversation, so the hot ``memories`` table
+only grows. ``run_lifecycle()`` (driven by the nightly scheduler job) keeps
+it small, working through ``memory_store.maintenance()``'s table handle so
+searches see each change as soon as it commits:
+
+1. Flush recall counts gathered by ``access_tracker`` into the table's
+   ``access_count`` / ``last_recalled_at`` columns.
+2. Merge clusters of near-duplicate memories (same category, within
+   ``memory_merge_distance``) into one canonical row — the most recalled,
+   then the oldest — which inherits the cluster's access history.
+3. Move memories older than ``memory_archive_after_days`` that were recalled
+   at most ``memory_archive_max_access`` times and not recently, into the
+   ``memories_archive`` table.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+
+import pyarrow as pa
+
+from config.settings import settings
+from src.memory.access_tracker import access_tracker
+from src.memory.query_cache import query_cache
+from src.memory.vector_store import _SCHEMA, _vector_search, memory_store
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_TABLE_NAME = "memories_archive"
+_ARCHIVE_SCHEMA = _SCHEMA.append(pa.field("archived_at", pa.string()))
+
+_ID_CHUNK = 500          # ids per IN (...) filter
+_NEIGHBOR_CHUNK = 256    # query vectors per multi-vector neighbour search
+_ARCHIVE_CHUNK = 256     # rows per archive page
+_NEIGHBORS = 8           # neighbours considered per memory when clustering
+_MERGE_COLUMNS = ["category", "created_at", "access_count", "last_recalled_at"]
+
+
+def _id_filter(ids: list[str]) -> str:
+    quoted = ", ".join("'" + i.replace("'", "''") + "'" for i in ids)
+    return f"id IN ({quoted})"
+
+
+def _chunks(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+async def _update_access(table, values: dict[str, tuple[int, str]]) -> None:
+    """Write absolute ``(access_count, last_recalled_at)`` for existing rows."""
+    if not values:
+        return
+    ids = list(values)
+    source = pa.table({
+        "id": pa.array(ids, pa.string()),
+        "access_count": pa.array([values[i][0] for i in ids], pa.int32()),
+        "last_recalled_at": pa.array([values[i][1] for i in ids], pa.string()),
+    })
+    await table.merge_insert("id").when_matched_update_all().execute(source)
+
+
+async def flush_access_counts(table) -> int:
+    """Fold pending recall counts into the table. Returns memories updated."""
+    pending = access_tracker.drain()
+    if not pending:
+        return 0
+    try:
+        values: dict[str, tuple[int, str]] = {}
+        for ids in _chunks(list(pending), _ID_CHUNK):
+            rows = await (
+                table.query()
+                .where(_id_filter(ids))
+                .select(["id", "access_count", "last_recalled_at"])
+                .limit(len(ids))
+                .to_list()
+            )
+            for row in rows:
+                added, last = pending[row["id"]]
+                values[row["id"]] = (
+                    (row.get("access_count") or 0) + added,
+                    max(row.get("last_recalled_at") or "", last),
+                )
+        await _update_access(table, values)
+        return len(values)
+    except Exception:
+        access_tracker.restore(pending)
+        raise
+
+
+async def _near_duplicates(table) -> tuple[dict[str, dict], dict[str, list[str]]]:
+    """Find near-duplicate neighbours (same category, within the merge distance).
+
+    Streams the table ``_NEIGHBOR_CHUNK`` rows at a time and runs one
+    multi-vector ANN search per chunk, so only one chunk of vectors is in
+    memory. Returns metadata (no vectors) for rows with at least one
+    neighbour, and each such row's neighbour ids.
+    """
+    threshold = settings.memory_merge_distance
+    rows: dict[str, dict] = {}
+    neighbors: dict[str, list[str]] = {}
+    batches = await (
+        table.query()
+        .select(["id", "vector", *_MERGE_COLUMNS])
+        .to_batches(max_batch_length=_NEIGHBOR_CHUNK)
+    )
+    async for batch in batches:
+        chunk = batch.to_pylist()
+        hits = await (
+            _vector_search(table, [row["vector"] for row in chunk])
+            .limit(_NEIGHBORS + 1)
+            .select(["id", "_distance", *_MERGE_COLUMNS])
+            .to_list()
+        )
+        for hit in hits:
+            source = chunk[hit.get("query_index", 0)]
+            if (
+                hit["id"] != source["id"]
+                and hit["category"] == source["category"]
+                and hit["_distance"] < threshold
+            ):
+                neighbors.setdefault(source["id"], []).append(hit["id"])
+                rows.setdefault(source["id"], {k: source[k] for k in ("id", *_MERGE_COLUMNS)})
+                rows.setdefault(hit["id"], {k: hit[k] for k in ("id", *_MERGE_COLUMNS)})
+    return rows, neighbors
+
+
+async def merge_near_duplicates(table) -> tuple[int, int]:
+    """Collapse near-duplicate clusters into canonical rows.
+
+    Rows are visited most-recalled first (ties: oldest first); each unclaimed
+    row becomes canonical and absorbs its unclaimed direct neighbours, so a
+    chain of pairwise-similar memories can't drift into one cluster.
+
+    Returns ``(clusters, rows_removed)``.
+    """
+    by_id, neighbors = await _near_duplicates(table)
+    if not neighbors:
+        return 0, 0
+
+    order = sorted(by_id.values(), key=lambda r: (-(r.get("access_count") or 0), r["created_at"]))
+    claimed: set[str] = set()
+    canonical_updates: dict[str, tuple[int, str]] = {}
+    removed: list[str] = []
+
+    for row in order:
+        if row["id"] in claimed:
+            continue
+        claimed.add(row["id"])
+        members = [n for n in neighbors.get(row["id"], []) if n not in claimed]
+        if not members:
+            continue
+        claimed.update(members)
+        group = [row] + [by_id[m] for m in members]
+        canonical_updates[row["id"]] = (
+            sum(r.get("access_count") or 0 for r in group),
+            max(r.get("last_recalled_at") or "" for r in group),
+        )
+        removed.extend(members)
+
+    if not removed:
+        return 0, 0
+    # Canonical rows first, so a failure part-way never drops history
+    await _update_access(table, canonical_updates)
+    for ids in _chunks(removed, _ID_CHUNK):
+        await table.delete(_id_filter(ids))
+    return len(canonical_updates), len(removed)
+
+
+async def archive_cold(table) -> int:
+    """Move old, rarely recalled memories to the archive table. Returns rows moved."""
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=settings.memory_archive_after_days)).isoformat()
+    # Never-recalled rows have last_recalled_at = '', which sorts before any cutoff
+    where = (
+        f"created_at < '{cutoff}' "
+        f"AND COALESCE(access_count, 0) <= {int(settings.memory_archive_max_access)} "
+        f"AND COALESCE(last_recalled_at, '') < '{cutoff}'"
+    )
+    batches = await (
+        table.query().where(where).select(_SCHEMA.names).to_batches(max_batch_length=_ARCHIVE_CHUNK)
+    )
+    archived_at = datetime.now(timezone.utc).isoformat()
+    archive = None
+    moved: list[str] = []
+    # Copy every page before deleting any: a crash in between leaves
+    # duplicates, never a loss, and the scan never reads a table it changed
+    async for batch in batches:
+        if batch.num_rows == 0:
+            continue
+        page = pa.Table.from_batches([batch]).cast(_SCHEMA).append_column(
+            _ARCHIVE_SCHEMA.field("archived_at"), pa.array([archived_at] * batch.num_rows, pa.string()),
+        )
+        if archive is None:
+            archive = await memory_store.get_or_create_table(ARCHIVE_TABLE_NAME, _ARCHIVE_SCHEMA)
+        await archive.add(page)
+        moved.extend(page.column("id").to_pylist())
+
+    for ids in _chunks(moved, _ID_CHUNK):
+        await table.delete(_id_filter(ids))
+    return len(moved)
+
+
+async def run_lifecycle() -> dict:
+    """Flush access counts, merge near-duplicates and archive cold memories.
+
+    Returns a report with ``accesses_flushed``, ``clusters_merged``,
+    ``rows_merged``, ``rows_archived`` and the hot table's row count before
+    and after.
+    """
+    async with memory_store.maintenance() as table:
+        report = {"rows_before": await table.count_rows()}
+        report["accesses_flushed"] = await flush_access_counts(table)
+        report["clusters_merged"], report["rows_merged"] = await merge_near_duplicates(table)
+        report["rows_archived"] = await archive_cold(table)
+        report["rows_after"] = await table.count_rows()
+
+    if report["rows_merged"] or report["rows_archived"]:
+        query_cache.invalidate()
+    logger.info(
+        "Memory lifecycle: %d → %d rows (%d merged in %d clusters, %d archived, %d access counts flushed)",
+        report["rows_before"], report["rows_after"], report["rows_merged"],
+        report["clusters_merged"], report["rows_archived"], report["accesses_flushed"],
+    )
+    return report
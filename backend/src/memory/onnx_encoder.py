@@ -0,0 +1,127 @@
+"""ONNX Runtime sentence encoder — a torch-free drop-in for SentenceTransformer.encode.
+
+Loads the ONNX export (optionally int8-quantized) and tokenizer that the
+sentence-transformers Hub repos ship, then applies the same mean pooling and
+L2 normalization as the PyTorch pipeline so vectors stay interchangeable.
+"""
+
+import json
+import logging
+import os
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ONNX_FILE = "onnx/model.onnx"
+ONNX_QUANTIZED_FILE = "onnx/model_quint8_avx2.onnx"
+
+# Used only when the model repo doesn't declare its input length
+_DEFAULT_MAX_SEQ_LENGTH = 256
+_ENCODE_BATCH = 32
+
+
+def resolve_repo_id(model_name: str) -> str:
+    """Map short sentence-transformers names to their Hub repo id."""
+    if "/" in model_name or os.path.isdir(model_name):
+        return model_name
+    return f"sentence-transformers/{model_name}"
+
+
+class OnnxSentenceEncoder:
+    """Mean-pooled sentence embeddings computed with ONNX Runtime on CPU."""
+
+    def __init__(self, model_name: str, quantized: bool = False, onnx_file: str = "") -> None:
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        onnx_file = onnx_file or (ONNX_QUANTIZED_FILE if quantized else ONNX_FILE)
+        model_path = self._fetch(model_name, onnx_file)
+        tokenizer_path = self._fetch(model_name, "tokenizer.json")
+
+        self.max_seq_length = self._max_seq_length(model_name)
+        self._tokenizer = Tokenizer.from_file(tokenizer_path)
+        self._tokenizer.enable_truncation(max_length=self.max_seq_length)
+        self._tokenizer.enable_padding()
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self._session = ort.InferenceSession(
+            model_path, sess_options=options, providers=["CPUExecutionProvider"],
+        )
+        self._input_names = {i.name for i in self._session.get_inputs()}
+        logger.info(
+            "ONNX embedding model loaded: %s (%s, max %d tokens)",
+            model_name, onnx_file, self.max_seq_length,
+        )
+
+    @staticmethod
+    def _fetch(model_name: str, filename: str) -> str:
+        if os.path.isdir(model_name):
+            return os.path.join(model_name, filename)
+        from huggingface_hub import hf_hub_download
+
+        return hf_hub_download(resolve_repo_id(model_name), filename)
+
+    @classmethod
+    def _read_json(cls, model_name: str, filename: str) -> dict:
+        """Load an optional JSON file from the model repo ({} if absent)."""
+        try:
+            with open(cls._fetch(model_name, filename), encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    @classmethod
+    def _max_seq_length(cls, model_name: str) -> int:
+        """Input length the model was trained with, resolved like SentenceTransformer.
+
+        ``sentence_bert_config.json``'s ``max_seq_length`` wins, then the
+        tokenizer's ``model_max_length``; either is capped by the model's
+        ``max_position_embeddings``.
+        """
+        limits = [
+            cls._read_json(model_name, "sentence_bert_config.json").get("max_seq_length"),
+            cls._read_json(model_name, "tokenizer_config.json").get("model_max_length"),
+        ]
+        # Tokenizers without a limit report a huge sentinel model_max_length
+        declared = next((n for n in limits if isinstance(n, int) and 0 < n < 1_000_000), None)
+        positions = cls._read_json(model_name, "config.json").get("max_position_embeddings")
+        if isinstance(positions, int) and positions > 0:
+            declared = min(declared or positions, positions)
+        return declared or _DEFAULT_MAX_SEQ_LENGTH
+
+    def encode(self, texts, normalize_embeddings: bool = True) -> np.ndarray:
+        """Encode a string or list of strings, mirroring SentenceTransformer.encode."""
+        single = isinstance(texts, str)
+        batch = [texts] if single else list(texts)
+        chunks = [
+            self._encode_chunk(batch[i:i + _ENCODE_BATCH], normalize_embeddings)
+            for i in range(0, len(batch), _ENCODE_BATCH)
+        ]
+        out = np.concatenate(chunks) if chunks else np.zeros((0, 0), dtype=np.float32)
+        return out[0] if single else out
+
+    def _encode_chunk(self, texts: list[str], normalize: bool) -> np.ndarray:
+        encodings = self._tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+
+        token_embeddings = self._session.run(None, feeds)[0]
+        return mean_pool(token_embeddings, attention_mask, normalize)
+
+
+def mean_pool(token_embeddings: np.ndarray, attention_mask: np.ndarray, normalize: bool) -> np.ndarray:
+    """Average token vectors over the attention mask, optionally L2-normalizing."""
+    mask = attention_mask[..., None].astype(np.float32)
+    summed = (token_embeddings * mask).sum(axis=1)
+    counts = np.clip(mask.sum(axis=1), 1e-9, None)
+    pooled = summed / counts
+    if normalize:
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        pooled = pooled / np.clip(norms, 1e-12, None)
+    return pooled.astype(np.float32)
@@ -0,0 +1,117 @@
+"""Recall result cache — TTL + LRU over memory searches, invalidated by writes.
+
+Chat turns, briefings and reviews repeat the same recall queries; a hit skips
+both the embedding and the table scan. Entries are keyed by the normalized
+query and search parameters and tagged with the store's write generation.
+Any add or delete bumps the generation, so an entry written before a change
+is never served after it. The TTL bounds staleness from writes the counter
+can't see (e.g. another process touching the table).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+from config.settings import settings
+from src.memory.embedding_cache import normalize_text
+
+
+def cache_key(
+    query: str,
+    top_k: int,
+    category_filter: Optional[str],
+    mode: str,
+    max_age_days: Optional[float] = None,
+    recency_weight: float = 0.0,
+) -> tuple:
+    return (normalize_text(query), top_k, category_filter or "", mode, max_age_days, recency_weight)
+
+
+class QueryCache:
+    """Thread-safe LRU of search results with per-entry TTL and write generations."""
+
+    def __init__(self, max_items: Optional[int] = None, ttl_s: Optional[float] = None) -> None:
+        self._max_items = max_items
+        self._ttl_s = ttl_s
+        self._entries: OrderedDict[Hashable, tuple[float, int, list[dict]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._expired = 0
+        self._evictions = 0
+
+    @property
+    def max_items(self) -> int:
+        return max(0, self._max_items if self._max_items is not None else settings.memory_query_cache_size)
+
+    @property
+    def ttl_s(self) -> float:
+        return max(0.0, self._ttl_s if self._ttl_s is not None else settings.memory_query_cache_ttl_s)
+
+    @property
+    def generation(self) -> int:
+        """Current write generation — capture it *before* running a search."""
+        return self._generation
+
+    def get(self, key: Hashable) -> Optional[list[dict]]:
+        """Return a copy of the cached results, or None on a miss."""
+        if self.max_items == 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            stored_at, generation, results = entry
+            if generation != self._generation or time.monotonic() - stored_at > self.ttl_s:
+                del self._entries[key]
+                self._expired += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return [dict(r) for r in results]
+
+    def put(self, key: Hashable, results: list[dict], generation: int) -> None:
+        """Store results computed at ``generation``; dropped if a write happened since."""
+        limit = self.max_items
+        if limit == 0:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic(), generation, [dict(r) for r in results])
+            self._entries.move_to_end(key)
+            while len(self._entries) > limit:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self) -> None:
+        """Bump the write generation; every existing entry becomes stale."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "generation": self._generation,
+                "hits": self._hits,
+                "misses": self._misses,
+                "expired": self._expired,
+                "evictions": self._evictions,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters (the generation keeps counting)."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._expired = self._evictions = 0
+
+
+query_cache = QueryCache()
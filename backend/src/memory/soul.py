@@ -1,5 +1,9 @@
+import asyncio
 import os
 import logging
+import stat
+import tempfile
+import threading
 
 from config.settings import settings
 
@@ -25,64 +29,238 @@ _DEFAULT_SOUL = """# Soul of the Traveler
 """
 
 
+class Soul:
+    """The soul file, parsed once into an ordered ``## Section`` map.
+
+    The parsed document is cached keyed by the file's path, mtime and size,
+    so repeated reads cost a ``stat`` and edits made outside the process
+    are still picked up. Section updates are a dict lookup plus a list slot
+    replacement; writes go to a temp file that is renamed over the original,
+    and concurrent updates queued while a write is in flight are folded
+    into the next one.
+    """
+
+    def __init__(self, path: str | None = None):
+        self._path = path
+        self._key: tuple | None = None
+        self._text = ""
+        self._preamble = ""
+        self._sections: list[list[str]] = []  # [name, header line, body]
+        self._index: dict[str, int] = {}
+        self._pending: dict[str, str] = {}
+        self._pending_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+
+    @property
+    def path(self) -> str:
+        return self._path or _soul_path
+
+    # ── Reads ────────────────────────────────────────────
+
+    def text(self) -> str:
+        """Full soul text, or the default template if the file is missing."""
+        self._refresh()
+        return self._text
+
+    def section(self, name: str) -> str | None:
+        """Body of ``## name`` (without the header), or None if absent."""
+        with self._cache_lock:
+            self._refresh_locked()
+            idx = self._index.get(name)
+            return self._sections[idx][2] if idx is not None else None
+
+    def sections(self) -> list[str]:
+        with self._cache_lock:
+            self._refresh_locked()
+            return [name for name, _, _ in self._sections]
+
+    def _stat_key(self) -> tuple:
+        path = self.path
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return (path, None, None)
+        return (path, st.st_mtime_ns, st.st_size)
+
+    def _refresh(self) -> None:
+        with self._cache_lock:
+            self._refresh_locked()
+
+    def _refresh_locked(self) -> None:
+        key = self._stat_key()
+        if key == self._key:
+            return
+        if key[1] is None:
+            text = _DEFAULT_SOUL
+        else:
+            try:
+                with open(key[0], "r", encoding="utf-8") as f:
+                    text = f.read()
+            except FileNotFoundError:
+                key, text = (key[0], None, None), _DEFAULT_SOUL
+        self._parse(text)
+        self._key = key
+
+    def _parse(self, text: str) -> None:
+        preamble: list[str] = []
+        sections: list[list] = []
+        current = preamble
+        for line in text.splitlines(keepends=True):
+            stripped = line.strip()
+            if stripped.startswith("## "):
+                body: list[str] = []
+                sections.append([stripped[3:], line, body])
+                current = body
+            else:
+                current.append(line)
+
+        self._text = text
+        self._preamble = "".join(preamble)
+        self._sections = [[name, header, "".join(body)] for name, header, body in sections]
+        self._index = {}
+        for i, (name, _, _) in enumerate(self._sections):
+            self._index.setdefault(name, i)
+
+    def _render(self) -> str:
+        return self._preamble + "".join(header + body for _, header, body in self._sections)
+
+    # ── Writes ───────────────────────────────────────────
+
+    def write(self, content: str) -> None:
+        """Replace the whole soul file."""
+        with self._write_lock:
+            self._write_atomic(content)
+            with self._cache_lock:
+                self._parse(content)
+                self._key = self._stat_key()
+        logger.info("Soul file updated")
+
+    def update_section(self, section: str, content: str) -> str:
+        """Replace the body of ``## section``, appending it if missing.
+
+        Returns the updated soul text.
+        """
+        return self.update_sections({section: content})
+
+    def update_sections(self, updates: dict[str, str]) -> str:
+        """Apply several section updates with a single write."""
+        with self._pending_lock:
+            self._pending.update(updates)
+
+        with self._write_lock:
+            with self._pending_lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                # Another writer already flushed our updates
+                return self.text()
+
+            with self._cache_lock:
+                self._refresh_locked()
+                for name, body in pending.items():
+                    self._set_section(name, body)
+                updated = self._render()
+
+            try:
+                self._write_atomic(updated)
+            except BaseException:
+                with self._cache_lock:
+                    self._key = None  # drop the unsaved edits; re-read from disk
+                raise
+            with self._cache_lock:
+                self._text = updated
+                self._key = self._stat_key()
+        logger.info("Soul file updated")
+        return updated
+
+    def _set_section(self, name: str, content: str) -> None:
+        body = content if content.endswith("\n") else content + "\n"
+        idx = self._index.get(name)
+        if idx is not None:
+            header = self._sections[idx][1]
+            if not header.endswith("\n"):
+                header += "\n"
+            if idx < len(self._sections) - 1:
+                body += "\n"  # keep the blank line before the next header
+            self._sections[idx] = [name, header, body]
+            return
+
+        # Append, separated from whatever came before by a blank line
+        if self._sections:
+            last = self._sections[-1]
+            if last[2]:
+                last[2] = _with_blank_line(last[2])
+            else:
+                last[1] = _with_blank_line(last[1])
+        elif self._preamble:
+            self._preamble = _with_blank_line(self._preamble)
+        self._sections.append([name, f"## {name}\n", body])
+        self._index[name] = len(self._sections) - 1
+
+    def _write_atomic(self, content: str) -> None:
+        path = self.path
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".soul-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            try:
+                # mkstemp creates 0600 and os.replace keeps it — carry the
+                # existing file's permissions over
+                os.chmod(tmp, stat.S_IMODE(os.stat(path).st_mode))
+            except FileNotFoundError:
+                pass
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except FileNotFoundError:
+                pass
+            raise
+
+
+def _with_blank_line(text: str) -> str:
+    if not text.endswith("\n"):
+        text += "\n"
+    if not text.endswith("\n\n"):
+        text += "\n"
+    return text
+
+
+soul = Soul()
+
+
 def read_soul() -> str:
     """Read the soul file. Returns default template if not found."""
-    try:
-        with open(_soul_path, "r", encoding="utf-8") as f:
-            return f.read()
-    except FileNotFoundError:
-        return _DEFAULT_SOUL
+    return soul.text()
+
+
+async def aread_soul() -> str:
+    """``read_soul`` for async callers — the stat/read runs off the event loop."""
+    return await asyncio.to_thread(read_soul)
 
 
 def write_soul(content: str) -> None:
     """Write the full soul file."""
-    os.makedirs(os.path.dirname(_soul_path), exist_ok=True)
-    with open(_soul_path, "w", encoding="utf-8") as f:
-        f.write(content)
-    logger.info("Soul file updated")
+    soul.write(content)
 
 
 def update_soul_section(section: str, content: str) -> str:
     """Update a specific section in the soul file.
 
-    Finds the ## Section header and replaces everything until the next ## header.
+    Replaces everything between the ## Section header and the next ## header.
     If the section doesn't exist, appends it.
 
     Returns the updated soul text.
     """
-    soul = read_soul()
-    header = f"## {section}"
-    lines = soul.split("\n")
-    new_lines = []
-    in_section = False
-    section_found = False
-
-    for line in lines:
-        if line.strip().startswith("## "):
-            if line.strip() == header:
-                in_section = True
-                section_found = True
-                new_lines.append(line)
-                new_lines.append(content)
-                continue
-            else:
-                in_section = False
-
-        if not in_section:
-            new_lines.append(line)
-
-    if not section_found:
-        new_lines.append("")
-        new_lines.append(header)
-        new_lines.append(content)
-
-    updated = "\n".join(new_lines)
-    write_soul(updated)
-    return updated
+    return soul.update_section(section, content)
 
 
 def ensure_soul_exists() -> None:
     """Create the soul file with defaults if it doesn't exist."""
-    if not os.path.exists(_soul_path):
+    if not os.path.exists(soul.path):
         write_soul(_DEFAULT_SOUL)
-        logger.info("Created default soul file at %s", _soul_path)
+        logger.info("Created default soul file at %s", soul.path)
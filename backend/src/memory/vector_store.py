@@ -1,20 +1,35 @@
+import asyncio
+import math
 import os
 import logging
-import threading
+import time
 import uuid
-from datetime import datetime, timezone
-from typing import Optional
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import AsyncGenerator, Optional
 
 import lancedb
+import numpy as np
 import pyarrow as pa
+from lancedb.index import FTS, BTree, Bitmap, IvfPq
 
 from config.settings import settings
-from src.memory.embedder import embed
+from src.memory.access_tracker import access_tracker
+from src.memory.embedding_service import embedding_service
+from src.memory.query_cache import cache_key, query_cache
 
 logger = logging.getLogger(__name__)
 
 _LANCE_DIR = os.path.join(settings.workspace_dir, "lance")
 _TABLE_NAME = "memories"
+_VECTOR_INDEX_SUB_VECTORS = 48  # 384 dims / 48 = 8 dims per PQ code
+
+_ALLOWED_CATEGORIES = {"fact", "preference", "pattern", "goal", "reflection"}
+_SEARCH_MODES = {"vector", "hybrid"}
+_RRF_K = 60  # standard reciprocal-rank-fusion damping constant
+# Bitmap for low-cardinality ``category``, B-tree for range scans on ``created_at``
+_SCALAR_INDEXES = {"category": Bitmap, "created_at": BTree}
+_DEDUP_DISTANCE = 0.05  # squared L2; ≈ cosine similarity 0.975 for unit vectors
 
 # Schema: 384 dimensions for all-MiniLM-L6-v2
 _SCHEMA = pa.schema([
@@ -24,138 +39,740 @@ _SCHEMA = pa.schema([
     pa.field("source_session_id", pa.string()),
     pa.field("vector", pa.list_(pa.float32(), 384)),
     pa.field("created_at", pa.string()),
+    pa.field("access_count", pa.int32()),
+    pa.field("last_recalled_at", pa.string()),
 ])
 
-_db: Optional[lancedb.DBConnection] = None
-_db_lock = threading.Lock()
+# Columns added after the first release, with SQL defaults for existing rows
+_ADDED_COLUMNS = {
+    "access_count": "CAST(0 AS INT)",
+    "last_recalled_at": "CAST('' AS STRING)",
+}
+
+# Floor for version retention — a search opened just before cleanup must
+# still find the files of the version it is reading.
+_MIN_VERSION_RETENTION = timedelta(minutes=10)
+
+
+def _missing_columns(schema: pa.Schema) -> dict[str, str]:
+    return {name: expr for name, expr in _ADDED_COLUMNS.items() if name not in schema.names}
+
+
+def _memory_row(memory_id: str, vector, **fields) -> dict:
+    """One memories-table row for ``table.add``, every omitted column at its default.
+
+    For code that writes rows directly (benchmarks, tests) rather than
+    through ``add_many``.
+    """
+    row = {
+        "id": memory_id,
+        "text": f"memory {memory_id}",
+        "category": "fact",
+        "source_session_id": "",
+        "vector": np.asarray(vector, dtype=np.float32).tolist(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "access_count": 0,
+        "last_recalled_at": "",
+    }
+    row.update(fields)
+    return row
+
+
+def _vector_search(table, vector):
+    """Start a vector query with the configured ANN probe/refine settings.
+
+    ``vector`` may be a single vector or several (rows then carry
+    ``query_index``). Both settings are ignored by LanceDB when the table has
+    no vector index.
+    """
+    query = table.vector_search(vector)
+    if settings.memory_search_nprobes > 0:
+        query = query.nprobes(settings.memory_search_nprobes)
+    if settings.memory_search_refine_factor > 0:
+        query = query.refine_factor(settings.memory_search_refine_factor)
+    return query
+
+
+def _log_insert(requested: int, batch: Optional[pa.Table]) -> None:
+    added = batch.num_rows if batch is not None else 0
+    logger.info("Added %d memories (%d duplicates skipped)", added, requested - added)
+
 
+def _batch_keepers(vectors: np.ndarray) -> list[int]:
+    """Map each row to the first row in the batch it duplicates (itself if unique).
 
-def _get_db() -> lancedb.DBConnection:
-    """Lazy-open the LanceDB connection (thread-safe)."""
-    global _db
-    if _db is None:
-        with _db_lock:
-            if _db is None:
-                os.makedirs(_LANCE_DIR, exist_ok=True)
-                _db = lancedb.connect(_LANCE_DIR)
-                logger.info("LanceDB connected at %s", _LANCE_DIR)
-    return _db
+    One pairwise squared-L2 matrix over the batch; the lower triangle marks
+    each row's near-duplicates among itself and earlier rows.
+    """
+    sq_norms = (vectors * vectors).sum(axis=1)
+    distances = sq_norms[:, None] + sq_norms[None, :] - 2.0 * (vectors @ vectors.T)
+    first = np.tril(distances < _DEDUP_DISTANCE).argmax(axis=1)
+    keepers = list(range(len(vectors)))
+    for i, j in enumerate(first):
+        keepers[i] = keepers[int(j)]
+    return keepers
+
+
+def _nearest_by_item(rows: list[dict], queried: list[int]) -> dict[int, dict]:
+    """Index multi-vector query results by batch position.
+
+    LanceDB tags each row with ``query_index`` when several vectors are
+    searched at once (and omits it for a single vector).
+    """
+    return {queried[row.get("query_index", 0)]: row for row in rows}
+
+
+def _plan_insert(
+    items: list[dict],
+    vectors: np.ndarray,
+    keepers: list[int],
+    nearest: dict[int, dict],
+) -> tuple[list[str], Optional[pa.Table]]:
+    """Assign IDs and build the Arrow batch of new rows (None if all are duplicates)."""
+    ids = [""] * len(items)
+    new_rows: list[int] = []
+    for i, keeper in enumerate(keepers):
+        if keeper != i:
+            ids[i] = ids[keeper]
+            continue
+        hit = nearest.get(i)
+        if hit and hit.get("_distance", 1.0) < _DEDUP_DISTANCE:
+            ids[i] = hit["id"]
+            continue
+        ids[i] = uuid.uuid4().hex
+        new_rows.append(i)
+
+    if not new_rows:
+        return ids, None
 
+    now = datetime.now(timezone.utc).isoformat()
+    dim = _SCHEMA.field("vector").type.list_size
+    batch = pa.Table.from_arrays(
+        [
+            pa.array([ids[i] for i in new_rows], pa.string()),
+            pa.array([items[i]["text"] for i in new_rows], pa.string()),
+            pa.array([items[i].get("category", "fact") for i in new_rows], pa.string()),
+            pa.array([items[i].get("source_session_id", "") for i in new_rows], pa.string()),
+            pa.FixedSizeListArray.from_arrays(pa.array(vectors[new_rows].ravel(), pa.float32()), dim),
+            pa.array([now] * len(new_rows), pa.string()),
+            pa.array([0] * len(new_rows), pa.int32()),
+            pa.array([""] * len(new_rows), pa.string()),
+        ],
+        schema=_SCHEMA,
+    )
+    return ids, batch
 
-def _get_or_create_table():
-    """Get the memories table, creating it if it doesn't exist."""
-    db = _get_db()
-    if _TABLE_NAME in db.table_names():
-        return db.open_table(_TABLE_NAME)
-    return db.create_table(_TABLE_NAME, schema=_SCHEMA)
 
+def _resolve_mode(mode: Optional[str]) -> str:
+    mode = (mode or settings.memory_search_mode).lower()
+    if mode not in _SEARCH_MODES:
+        logger.warning("Unknown memory search mode %r — using vector", mode)
+        mode = "vector"
+    return mode
 
-def add_memory(
-    text: str,
-    category: str = "fact",
-    source_session_id: str = "",
-) -> str:
-    """Embed text and store as a memory. Returns the memory ID or empty string on failure."""
+
+def _build_where(category_filter: Optional[str], max_age_days: Optional[float]) -> Optional[str]:
+    """SQL filter for the scalar-indexed columns (category must already be validated)."""
+    clauses = []
+    if category_filter:
+        clauses.append(f"category = '{category_filter}'")
+    if max_age_days is not None and max_age_days > 0:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=max_age_days)
+        # created_at is a UTC ISO-8601 string, so lexical order is time order
+        clauses.append(f"created_at >= '{cutoff.isoformat()}'")
+    return " AND ".join(clauses) or None
+
+
+def _rerank_depth(top_k: int) -> int:
+    return top_k * max(1, settings.memory_hybrid_candidates)
+
+
+def _recency(created_at: str, now: datetime) -> float:
+    """Exponential decay in [0, 1]: 1.0 for a brand-new memory, 0.5 after one half-life."""
     try:
-        table = _get_or_create_table()
-        vector = embed(text)
+        created = datetime.fromisoformat(created_at)
+    except (TypeError, ValueError):
+        return 0.0
+    if created.tzinfo is None:
+        created = created.replace(tzinfo=timezone.utc)
+    age_days = max(0.0, (now - created).total_seconds() / 86400)
+    half_life = max(settings.memory_recency_half_life_days, 1e-6)
+    return 0.5 ** (age_days / half_life)
+
+
+def _blend_recency(results: list[dict], top_k: int, weight: float, mode: str) -> list[dict]:
+    """Re-rank by a weighted mix of relevance and recency; keeps the top ``top_k``."""
+    if not results:
+        return results
+    if mode == "hybrid":
+        best = max(r["score"] for r in results) or 1.0
+        relevance = [r["score"] / best for r in results]
+    else:
+        # Squared L2 between unit vectors is 2 - 2·cos, so this is cosine similarity
+        relevance = [max(0.0, 1.0 - r["score"] / 2.0) for r in results]
 
-        # Dedup: skip if a very similar memory already exists
+    now = datetime.now(timezone.utc)
+    for r, rel in zip(results, relevance):
+        r["recency_score"] = _recency(r["created_at"], now)
+        r["blended_score"] = (1.0 - weight) * rel + weight * r["recency_score"]
+    results.sort(key=lambda r: r["blended_score"], reverse=True)
+    return results[:top_k]
+
+
+def _format_results(results: list[dict]) -> str:
+    return "\n".join(f"- [{r['category']}] {r['text']}" for r in results)
+
+
+def _to_result(row: dict) -> dict:
+    return {
+        "id": row["id"],
+        "text": row["text"],
+        "category": row["category"],
+        "score": row.get("_distance", 0.0),
+        "created_at": row["created_at"],
+    }
+
+
+def _is_fts(index) -> bool:
+    return "text" in index.columns and str(index.index_type).upper() in {"FTS", "INVERTED"}
+
+
+async def _fts_index(table):
+    """Return the BM25 index on ``text``, or None if it hasn't been built."""
+    for index in await table.list_indices():
+        if _is_fts(index):
+            return index
+    return None
+
+
+async def _ensure_fts_index(table) -> bool:
+    """Create the BM25 index on ``text`` if it's missing. Returns False on failure."""
+    try:
+        if await _fts_index(table) is None:
+            await table.create_index("text", config=FTS(with_position=False), replace=True)
+            logger.info("Built full-text index on memories.text")
+        return True
+    except Exception:
+        logger.warning("Full-text index unavailable", exc_info=True)
+        return False
+
+
+async def _ensure_scalar_indexes(table) -> None:
+    """Index the prefilter columns listed in ``_SCALAR_INDEXES``."""
+    indexed = {col for index in await table.list_indices() for col in index.columns}
+    for column, config in _SCALAR_INDEXES.items():
+        if column in indexed:
+            continue
         try:
-            if table.count_rows() > 0:
-                results = table.search(vector).limit(1).to_list()
-                if results and results[0].get("_distance", 1.0) < 0.05:
-                    logger.info(
-                        "Skipping duplicate memory (distance=%.4f, existing=%s)",
-                        results[0]["_distance"],
-                        results[0]["id"][:8],
-                    )
-                    return results[0]["id"]
+            await table.create_index(column, config=config(), replace=True)
+            logger.info("Built %s index on memories.%s", config.__name__.upper(), column)
         except Exception:
-            logger.debug("Dedup check failed, proceeding with insert", exc_info=True)
+            logger.warning("Scalar index on memories.%s unavailable", column, exc_info=True)
 
-        memory_id = uuid.uuid4().hex
 
-        table.add([{
-            "id": memory_id,
-            "text": text,
-            "category": category,
-            "source_session_id": source_session_id,
-            "vector": vector,
-            "created_at": datetime.now(timezone.utc).isoformat(),
-        }])
+def _rrf_fuse(vector_rows: list[dict], lexical_rows: list[dict], top_k: int) -> list[dict]:
+    """Merge two ranked lists with reciprocal rank fusion."""
+    fused: dict[str, dict] = {}
+    for signal, rows, score_key in (
+        ("vector", vector_rows, "_distance"),
+        ("lexical", lexical_rows, "_score"),
+    ):
+        for rank, row in enumerate(rows, start=1):
+            entry = fused.setdefault(row["id"], {
+                "id": row["id"],
+                "text": row["text"],
+                "category": row["category"],
+                "score": 0.0,
+                "created_at": row["created_at"],
+                "vector_score": None,
+                "lexical_score": None,
+            })
+            entry["score"] += 1.0 / (_RRF_K + rank)
+            entry[f"{signal}_score"] = row.get(score_key)
 
-        logger.info("Added memory %s (category=%s)", memory_id[:8], category)
-        return memory_id
-    except Exception:
-        logger.exception("Failed to add memory")
-        return ""
+    ranked = sorted(fused.values(), key=lambda r: r["score"], reverse=True)
+    return ranked[:top_k]
+
+
+# ─── Index and storage maintenance helpers ──────────────
+
+
+async def _vector_index(table):
+    """Return the vector column's index config, or None if it isn't indexed."""
+    for index in await table.list_indices():
+        if "vector" in index.columns:
+            return index
+    return None
+
+
+def _num_partitions(rows: int) -> int:
+    return max(1, min(1024, round(math.sqrt(rows))))
+
+
+async def _unindexed_rows(table, index) -> int:
+    stats = await table.index_stats(index.name)
+    return stats.num_unindexed_rows if stats else 0
+
+
+def _table_disk_bytes(path: str) -> int:
+    total = 0
+    for root, _dirs, files in os.walk(os.path.join(path, f"{_TABLE_NAME}.lance")):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass  # removed by a concurrent cleanup
+    return total
+
+
+async def _storage_snapshot(table, path: str) -> dict:
+    stats = await table.stats()
+    fragment_stats = stats.get("fragment_stats", {}) if isinstance(stats, dict) else {}
+    return {
+        "fragments": fragment_stats.get("num_fragments", 0),
+        "small_fragments": fragment_stats.get("num_small_fragments", 0),
+        "versions": len(await table.list_versions()),
+        "disk_bytes": _table_disk_bytes(path),
+    }
+
+
+# ─── Store ───────────────────────────────────────────────
 
 
-def search(
-    query: str,
-    top_k: int = 0,
-    category_filter: Optional[str] = None,
-) -> list[dict]:
-    """Search memories by semantic similarity.
+class MemoryStore:
+    """The memories table, behind one LanceDB async connection.
 
-    Returns list of dicts with: id, text, category, score, created_at.
-    Returns [] on any failure.
+    Every read, write and maintenance job in the process goes through the
+    table handle opened here and kept for the life of the process, so a
+    search always sees the latest in-process write and ``query_cache`` is
+    invalidated by the same code path that changed the rows. Embeddings
+    come from ``embedding_service.aembed*``, which awaits the coalescing
+    worker directly.
+
+    Search and write methods log and return an empty result on failure
+    rather than raising; the maintenance methods raise, and their scheduler
+    jobs log.
     """
-    try:
-        if top_k <= 0:
-            top_k = settings.memory_search_top_k
 
-        table = _get_or_create_table()
+    def __init__(self, path: Optional[str] = None) -> None:
+        self._path = path
+        self._db = None
+        self._table = None
+        # Whether the BM25 index exists: None until first checked, then kept
+        # current by maintain_index() — queries never list or build indexes
+        self._fts_ready: Optional[bool] = None
+        # Held by every maintenance operation (index builds, compaction,
+        # lifecycle) so they never commit concurrently; searches and inserts
+        # don't take it.
+        self._maintenance_lock = asyncio.Lock()
+        # Serializes add_many's dedup check + insert
+        self._write_lock = asyncio.Lock()
+        self._open_lock = asyncio.Lock()
+
+    @property
+    def path(self) -> str:
+        return self._path or _LANCE_DIR
+
+    async def _get_db(self):
+        if self._db is None:
+            os.makedirs(self.path, exist_ok=True)
+            self._db = await lancedb.connect_async(self.path)
+        return self._db
+
+    async def _get_table(self):
+        if self._table is None:
+            # Concurrent first callers must share one handle; separate
+            # handles don't see each other's writes
+            async with self._open_lock:
+                if self._table is None:
+                    self._table = await self._open_table()
+        return self._table
+
+    async def _open_table(self):
+        db = await self._get_db()
+        try:
+            table = await db.open_table(_TABLE_NAME)
+        except ValueError:
+            table = await db.create_table(_TABLE_NAME, schema=_SCHEMA, exist_ok=True)
+        missing = _missing_columns(await table.schema())
+        if missing:
+            await table.add_columns(missing)
+            logger.info("Migrated memories table: added %s", ", ".join(missing))
+        logger.info("Memory store opened at %s", self.path)
+        return table
+
+    def reset(self) -> None:
+        """Drop the cached connection and table handle (reopened on next use)."""
+        if self._table is not None:
+            self._table.close()
+        self._db = None
+        self._table = None
+        self._fts_ready = None
+        self._maintenance_lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+        self._open_lock = asyncio.Lock()
 
-        if table.count_rows() == 0:
+    async def warmup(self) -> None:
+        """Open the connection and table ahead of the first request."""
+        await (await self._get_table()).count_rows()
+
+    # ── Writes ───────────────────────────────────────────
+
+    async def add_many(self, items: list[dict]) -> list[str]:
+        """Embed and store several memories with one encode, one dedup query and one write.
+
+        Each item is a dict with ``text`` and optional ``category`` /
+        ``source_session_id``. Items that duplicate an earlier item in the
+        batch, or a memory already in the table, are skipped and report that
+        memory's ID. Returns one ID per item, or all "" on failure.
+        """
+        if not items:
             return []
+        try:
+            table = await self._get_table()
+            vectors = np.asarray(
+                await embedding_service.aembed_many([item["text"] for item in items]), dtype=np.float32,
+            )
+            keepers = _batch_keepers(vectors)
+            unique = sorted(set(keepers))
 
-        query_vector = embed(query)
+            # Dedup check and write as one step, so two concurrent batches
+            # can't both miss each other's rows and insert the same memory
+            async with self._write_lock:
+                nearest: dict[int, dict] = {}
+                try:
+                    if await table.count_rows() > 0:
+                        query = _vector_search(table, vectors[unique]).limit(1).select(["id", "_distance"])
+                        nearest = _nearest_by_item(await query.to_list(), unique)
+                except Exception:
+                    logger.debug("Dedup check failed, proceeding with insert", exc_info=True)
 
-        results = table.search(query_vector).limit(top_k)
+                ids, batch = _plan_insert(items, vectors, keepers, nearest)
+                if batch is not None:
+                    await table.add(batch)
+                    query_cache.invalidate()
+            _log_insert(len(items), batch)
+            return ids
+        except Exception:
+            logger.exception("Failed to add memories")
+            return [""] * len(items)
+
+    async def delete(self, ids: list[str]) -> int:
+        """Delete memories by ID. Returns the number of rows removed (0 on failure)."""
+        ids = [i for i in ids if i]
+        if not ids:
+            return 0
+        try:
+            table = await self._get_table()
+            quoted = ", ".join("'" + i.replace("'", "''") + "'" for i in ids)
+            result = await table.delete(f"id IN ({quoted})")
+            query_cache.invalidate()
+            deleted = getattr(result, "num_deleted_rows", len(ids))
+            logger.info("Deleted %d memories", deleted)
+            return deleted
+        except Exception:
+            logger.exception("Failed to delete memories")
+            return 0
+
+    # ── Search ───────────────────────────────────────────
+
+    async def search(
+        self,
+        query: str,
+        top_k: int = 0,
+        category_filter: Optional[str] = None,
+        mode: Optional[str] = None,
+        max_age_days: Optional[float] = None,
+        recency_weight: float = 0.0,
+    ) -> list[dict]:
+        """Search memories by semantic similarity, optionally fused with BM25.
+
+        ``mode`` is "vector" (default from ``settings.memory_search_mode``) or
+        "hybrid". Vector results carry ``score`` = L2 distance (lower is
+        closer). Hybrid results carry ``score`` = reciprocal-rank-fusion score
+        (higher is better) plus the per-signal ``vector_score`` /
+        ``lexical_score`` (None when that signal didn't return the row).
+        Until ``maintain_index()`` has built the BM25 index, hybrid searches
+        run as vector searches.
+
+        ``category_filter`` and ``max_age_days`` (only memories created in
+        the last N days) are applied as prefilters, backed by scalar indexes,
+        so a filtered search still returns up to ``top_k`` matches. A
+        ``recency_weight`` in (0, 1] re-ranks a wider candidate set by
+        ``(1 - w) * relevance + w * recency``, where recency halves every
+        ``memory_recency_half_life_days``; such results also carry
+        ``recency_score`` and ``blended_score``.
+
+        Results are served from ``query_cache`` when the same search ran
+        since the last write.
+
+        Returns list of dicts with: id, text, category, score, created_at.
+        Returns [] on any failure.
+        """
+        results = await self.search_many(
+            [query], top_k, category_filter, mode=mode,
+            max_age_days=max_age_days, recency_weight=recency_weight,
+        )
+        return results[0] if results else []
+
+    async def search_many(
+        self,
+        queries: list[str],
+        top_k: int = 0,
+        category_filter: Optional[str] = None,
+        mode: Optional[str] = None,
+        max_age_days: Optional[float] = None,
+        recency_weight: float = 0.0,
+    ) -> list[list[dict]]:
+        """Run several searches with one batched embed and concurrent queries.
+
+        Queries answered by ``query_cache`` are neither embedded nor run.
+        Returns one result list per query, in order ([] for a failed query).
+        """
+        if not queries:
+            return []
+        try:
+            if top_k <= 0:
+                top_k = settings.memory_search_top_k
+            mode = _resolve_mode(mode)
 
-        if category_filter:
             # Use parameterized filter to prevent injection
-            allowed_categories = {"fact", "preference", "pattern", "goal", "reflection"}
-            if category_filter not in allowed_categories:
-                return []
-            results = results.where(f"category = '{category_filter}'")
-
-        rows = results.to_list()
-
-        return [
-            {
-                "id": r["id"],
-                "text": r["text"],
-                "category": r["category"],
-                "score": r.get("_distance", 0.0),
-                "created_at": r["created_at"],
-            }
-            for r in rows
-        ]
-    except Exception:
-        logger.exception("Failed to search memories")
-        return []
+            if category_filter and category_filter not in _ALLOWED_CATEGORIES:
+                return [[] for _ in queries]
+            where = _build_where(category_filter, max_age_days)
+            recency_weight = min(max(recency_weight, 0.0), 1.0)
 
+            generation = query_cache.generation
+            keys = [
+                cache_key(q, top_k, category_filter, mode, max_age_days, recency_weight)
+                for q in queries
+            ]
+            results: list[Optional[list[dict]]] = [query_cache.get(key) for key in keys]
+            pending = [i for i, cached in enumerate(results) if cached is None]
+            if not pending:
+                access_tracker.record(r["id"] for rows in results for r in rows)
+                return results
 
-def search_formatted(
-    query: str,
-    top_k: int = 0,
-    category_filter: Optional[str] = None,
-) -> str:
-    """Search memories and return a formatted string for agent context.
+            table = await self._get_table()
+            if await table.count_rows() == 0:
+                outcomes: list = [[] for _ in pending]
+            else:
+                vectors = await embedding_service.aembed_many([queries[i] for i in pending])
+                outcomes = await asyncio.gather(
+                    *(
+                        self._search_one(table, queries[i], v, top_k, where, mode, recency_weight)
+                        for i, v in zip(pending, vectors)
+                    ),
+                    return_exceptions=True,
+                )
 
-    Returns "" on any failure.
-    """
-    try:
-        results = search(query, top_k, category_filter)
-        if not results:
-            return ""
-        lines = []
-        for r in results:
-            lines.append(f"- [{r['category']}] {r['text']}")
-        return "\n".join(lines)
-    except Exception:
-        logger.exception("Failed to format memory search results")
-        return ""
+            for i, outcome in zip(pending, outcomes):
+                if isinstance(outcome, Exception):
+                    logger.error("Failed to search memories", exc_info=outcome)
+                    results[i] = []
+                else:
+                    query_cache.put(keys[i], outcome, generation)
+                    results[i] = outcome
+            access_tracker.record(r["id"] for rows in results for r in rows)
+            return results
+        except Exception:
+            logger.exception("Failed to search memories")
+            return [[] for _ in queries]
+
+    async def search_formatted(
+        self,
+        query: str,
+        top_k: int = 0,
+        category_filter: Optional[str] = None,
+        mode: Optional[str] = None,
+        max_age_days: Optional[float] = None,
+        recency_weight: float = 0.0,
+    ) -> str:
+        """Search memories and return a formatted string for agent context.
+
+        Returns "" on any failure.
+        """
+        return _format_results(await self.search(
+            query, top_k, category_filter, mode=mode,
+            max_age_days=max_age_days, recency_weight=recency_weight,
+        ))
+
+    async def _search_one(
+        self,
+        table,
+        query: str,
+        vector: list[float],
+        top_k: int,
+        where: Optional[str],
+        mode: str,
+        recency_weight: float = 0.0,
+    ) -> list[dict]:
+        limit = _rerank_depth(top_k) if recency_weight > 0 else top_k
+        if mode == "hybrid" and not await self._has_fts(table):
+            mode = "vector"
+        if mode != "hybrid":
+            # Async query filters are prefilters unless .postfilter() is set
+            builder = _vector_search(table, vector).limit(limit)
+            if where:
+                builder = builder.where(where)
+            results = [_to_result(r) for r in await builder.to_list()]
+        else:
+            results = await self._hybrid_one(table, query, vector, top_k, where, limit)
+
+        if recency_weight > 0:
+            results = _blend_recency(results, top_k, recency_weight, mode)
+        return results
+
+    async def _hybrid_one(
+        self, table, query: str, vector: list[float], top_k: int, where: Optional[str], limit: int,
+    ) -> list[dict]:
+        """Run BM25 and vector retrieval concurrently and fuse them with RRF."""
+        depth = _rerank_depth(top_k)
+        started = time.monotonic()
+        vector_builder = _vector_search(table, vector).limit(depth)
+        if where:
+            vector_builder = vector_builder.where(where)
+        vector_rows, lexical_rows = await asyncio.gather(
+            vector_builder.to_list(),
+            self._lexical_rows(table, query, depth, where),
+            return_exceptions=True,
+        )
+        if isinstance(vector_rows, Exception):
+            raise vector_rows
+        if isinstance(lexical_rows, Exception):
+            logger.warning("Lexical memory search failed — using vector results only", exc_info=lexical_rows)
+            lexical_rows = []
+
+        results = _rrf_fuse(vector_rows, lexical_rows, limit)
+        logger.debug(
+            "Hybrid memory search: %d vector + %d lexical candidates → %d results in %.1fms",
+            len(vector_rows), len(lexical_rows), len(results), (time.monotonic() - started) * 1000,
+        )
+        return results
+
+    async def _has_fts(self, table) -> bool:
+        if self._fts_ready is None:
+            self._fts_ready = await _fts_index(table) is not None
+            if not self._fts_ready:
+                logger.info("No full-text index yet — hybrid search is vector-only until maintain_index() runs")
+        return self._fts_ready
+
+    async def _lexical_rows(self, table, query: str, limit: int, where: Optional[str]) -> list[dict]:
+        builder = (await table.search(query, query_type="fts")).limit(limit)
+        if where:
+            builder = builder.where(where)
+        return await builder.to_list()
+
+    # ── Maintenance ──────────────────────────────────────
+
+    @asynccontextmanager
+    async def maintenance(self) -> AsyncGenerator:
+        """Yield the memories table with the maintenance lock held.
+
+        For maintenance jobs outside this class (``lifecycle``) that rewrite
+        rows and must not commit alongside index builds or compaction.
+        """
+        async with self._maintenance_lock:
+            yield await self._get_table()
+
+    async def get_or_create_table(self, name: str, schema: pa.Schema):
+        """Open ``name`` in the store's database, creating it with ``schema`` if missing."""
+        db = await self._get_db()
+        return await db.create_table(name, schema=schema, exist_ok=True)
+
+    async def maintain_index(self) -> dict:
+        """Create or refresh the ANN and full-text indexes on the memories table.
+
+        - Below ``memory_index_min_rows`` a brute-force scan is fast enough; no
+          vector index.
+        - Once the table crosses the threshold an IVF-PQ index is built (L2, so
+          ``_distance`` keeps the same meaning as the flat scan it replaces).
+        - The BM25 index on ``text`` used by hybrid search and the scalar
+          indexes on ``category`` / ``created_at`` used by prefiltered search are
+          created at any size. Searches never build them.
+        - Rows added after a build stay unindexed (searched by flat scan)
+          until ``compact()`` folds them in; this method never calls
+          ``table.optimize()``.
+
+        Returns a report dict with the action taken, the row count and the
+        vector index's unindexed rows.
+        """
+        async with self._maintenance_lock:
+            return await self._maintain_index()
+
+    async def _maintain_index(self) -> dict:
+        table = await self._get_table()
+        rows = await table.count_rows()
+        report = {"action": "none", "rows": rows, "unindexed_rows": 0}
+
+        if rows > 0:
+            fts_was_ready = self._fts_ready
+            self._fts_ready = await _ensure_fts_index(table)
+            if self._fts_ready and not fts_was_ready:
+                # Cached hybrid results were vector-only
+                query_cache.invalidate()
+            await _ensure_scalar_indexes(table)
+
+        index = await _vector_index(table)
+        if index is None:
+            if rows < settings.memory_index_min_rows:
+                return report
+            partitions = _num_partitions(rows)
+            await table.create_index(
+                "vector",
+                config=IvfPq(
+                    distance_type="l2",
+                    num_partitions=partitions,
+                    num_sub_vectors=_VECTOR_INDEX_SUB_VECTORS,
+                ),
+                replace=True,
+            )
+            logger.info("Built IVF_PQ index on %d memories (%d partitions)", rows, partitions)
+            report["action"] = "created"
+            return report
+
+        report["unindexed_rows"] = await _unindexed_rows(table, index)
+        return report
+
+    async def compact(self, retention: Optional[timedelta] = None) -> dict:
+        """Compact small fragments, prune old versions and refresh indexes.
+
+        One ``table.optimize()`` call rewrites the many tiny fragments left by
+        per-memory inserts into larger files, folds unindexed rows into
+        existing indexes, and deletes versions older than ``retention``
+        (default ``memory_version_retention_hours``, never less than 10
+        minutes).
+
+        Safe alongside searches and inserts: LanceDB commits the compaction as
+        a new version, readers keep the version they opened, and only versions
+        older than the retention window are removed.
+
+        Returns a report with fragment/version counts and on-disk bytes before
+        and after, plus ``bytes_reclaimed``.
+        """
+        if retention is None:
+            retention = timedelta(hours=settings.memory_version_retention_hours)
+        retention = max(retention, _MIN_VERSION_RETENTION)
+
+        async with self._maintenance_lock:
+            table = await self._get_table()
+            before = await _storage_snapshot(table, self.path)
+            await table.optimize(cleanup_older_than=retention)
+            after = await _storage_snapshot(table, self.path)
+
+        report = {
+            "before": before,
+            "after": after,
+            "bytes_reclaimed": max(0, before["disk_bytes"] - after["disk_bytes"]),
+        }
+        logger.info(
+            "Compacted memories table: fragments %d → %d, versions %d → %d, "
+            "disk %d → %d bytes (%d reclaimed)",
+            before["fragments"], after["fragments"],
+            before["versions"], after["versions"],
+            before["disk_bytes"], after["disk_bytes"], report["bytes_reclaimed"],
+        )
+        return report
+
+
+memory_store = MemoryStore()
@@ -3,9 +3,9 @@
 import logging
 from datetime import datetime, timezone, timedelta
 
-from sqlmodel import select
+from sqlmodel import col, delete, func, select
 
-from src.db.engine import get_session
+from src.db.engine import get_read_session, get_session
 from src.db.models import QueuedInsight
 
 logger = logging.getLogger(__name__)
@@ -40,42 +40,37 @@ class InsightQueue:
         """Return all non-expired items ordered by urgency desc, then delete all rows atomically."""
         cutoff = datetime.now(timezone.utc) - timedelta(hours=EXPIRY_HOURS)
         async with get_session() as db:
-            # Single fetch of ALL rows, partition in Python, delete in same transaction
-            result = await db.execute(select(QueuedInsight))
-            all_rows = list(result.scalars().all())
-
-            def _is_fresh(row: QueuedInsight) -> bool:
-                ts = row.created_at
-                # SQLite may strip timezone info; make comparison safe
-                if ts.tzinfo is None:
-                    return ts > cutoff.replace(tzinfo=None)
-                return ts > cutoff
-
-            items = sorted(
-                [r for r in all_rows if _is_fresh(r)],
-                key=lambda r: r.urgency,
-                reverse=True,
+            # Drop expired rows, then delete the rest and get them back via RETURNING
+            expired = await db.execute(
+                delete(QueuedInsight)
+                .where(col(QueuedInsight.created_at) <= cutoff)
+                .execution_options(synchronize_session=False)
             )
+            result = await db.execute(
+                delete(QueuedInsight)
+                .returning(QueuedInsight)
+                .execution_options(synchronize_session=False)
+            )
+            items = sorted(result.scalars().all(), key=lambda r: r.urgency, reverse=True)
 
-            for row in all_rows:
-                await db.delete(row)
-
-        logger.info("Drained %d insight(s) from queue (%d expired)", len(items), len(all_rows) - len(items))
+        logger.info("Drained %d insight(s) from queue (%d expired)", len(items), expired.rowcount)
         return items
 
     async def count(self) -> int:
         """Count non-expired items."""
         cutoff = datetime.now(timezone.utc) - timedelta(hours=EXPIRY_HOURS)
-        async with get_session() as db:
+        async with get_read_session() as db:
             result = await db.execute(
-                select(QueuedInsight).where(QueuedInsight.created_at > cutoff)
+                select(func.count())
+                .select_from(QueuedInsight)
+                .where(QueuedInsight.created_at > cutoff)
             )
-            return len(result.scalars().all())
+            return result.scalar_one()
 
     async def peek(self, limit: int = 5) -> list[QueuedInsight]:
         """Preview items without removing them."""
         cutoff = datetime.now(timezone.utc) - timedelta(hours=EXPIRY_HOURS)
-        async with get_session() as db:
+        async with get_read_session() as db:
             result = await db.execute(
                 select(QueuedInsight)
                 .where(QueuedInsight.created_at > cutoff)
@@ -1,17 +1,20 @@
 """Screen observation repository — CRUD and aggregation for activity tracking."""
 
+import asyncio
 import json
 import logging
 from datetime import date, datetime, timedelta, timezone
 from typing import Any
 
-from sqlmodel import select, func, col
+from sqlmodel import col, delete, func, select
 
-from src.db.engine import get_session
+from src.db.engine import get_read_session, get_session
 from src.db.models import ScreenObservation
 
 logger = logging.getLogger(__name__)
 
+_CLEANUP_CHUNK = 5000  # rows per cleanup transaction — keeps each write lock short
+
 
 class ScreenObservationRepository:
     """Async CRUD and aggregation for screen observations."""
@@ -69,7 +72,7 @@ class ScreenObservationRepository:
         start = datetime(target_date.year, target_date.month, target_date.day, tzinfo=timezone.utc)
         end = start + timedelta(days=1)
 
-        async with get_session() as db:
+        async with get_read_session() as db:
             result = await db.execute(
                 select(ScreenObservation)
                 .where(col(ScreenObservation.timestamp) >= start)
@@ -151,20 +154,34 @@ class ScreenObservationRepository:
         }
 
     async def cleanup_old(self, retention_days: int) -> int:
-        """Delete observations older than retention_days. Returns count deleted."""
+        """Delete observations older than retention_days. Returns count deleted.
+
+        Deletes in chunks of ``_CLEANUP_CHUNK`` rows, one transaction each,
+        so other writers get the database between chunks.
+        """
         cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
 
-        async with get_session() as db:
-            result = await db.execute(
-                select(ScreenObservation).where(col(ScreenObservation.timestamp) < cutoff)
+        deleted = 0
+        while True:
+            chunk = (
+                select(ScreenObservation.id)
+                .where(col(ScreenObservation.timestamp) < cutoff)
+                .limit(_CLEANUP_CHUNK)
             )
-            old = list(result.scalars().all())
-            for obs in old:
-                await db.delete(obs)
-
-        if old:
-            logger.info("Cleaned up %d screen observations older than %d days", len(old), retention_days)
-        return len(old)
+            async with get_session() as db:
+                result = await db.execute(
+                    delete(ScreenObservation)
+                    .where(col(ScreenObservation.id).in_(chunk))
+                    .execution_options(synchronize_session=False)
+                )
+            deleted += result.rowcount
+            if result.rowcount < _CLEANUP_CHUNK:
+                break
+            await asyncio.sleep(0)
+
+        if deleted:
+            logger.info("Cleaned up %d screen observations older than %d days", deleted, retention_days)
+        return deleted
 
     @staticmethod
     def _compute_streaks(observations: list[ScreenObservation]) -> list[dict]:
@@ -63,6 +63,9 @@ def init_scheduler() -> AsyncIOScheduler | None:
     from src.scheduler.jobs.activity_digest import run_activity_digest
     from src.scheduler.jobs.weekly_activity_review import run_weekly_activity_review
     from src.scheduler.jobs.screen_cleanup import run_screen_cleanup
+    from src.scheduler.jobs.memory_index import run_memory_index_maintenance
+    from src.scheduler.jobs.memory_compaction import run_memory_compaction
+    from src.scheduler.jobs.memory_lifecycle import run_memory_lifecycle
 
     jobs = [
         {
@@ -132,6 +135,24 @@ def init_scheduler() -> AsyncIOScheduler | None:
             "id": "screen_cleanup",
             "name": "Screen observation cleanup",
         },
+        {
+            "func": _async_job_wrapper(run_memory_index_maintenance, loop),
+            "trigger": IntervalTrigger(minutes=settings.memory_index_interval_min),
+            "id": "memory_index",
+            "name": "Memory index maintenance",
+        },
+        {
+            "func": _async_job_wrapper(run_memory_compaction, loop),
+            "trigger": IntervalTrigger(minutes=settings.memory_compaction_interval_min),
+            "id": "memory_compaction",
+            "name": "Memory table compaction",
+        },
+        {
+            "func": _async_job_wrapper(run_memory_lifecycle, loop),
+            "trigger": CronTrigger(hour=settings.memory_lifecycle_hour, timezone=validated_tz),
+            "id": "memory_lifecycle",
+            "name": "Memory lifecycle",
+        },
     ]
 
     for job in jobs:
@@ -43,7 +43,7 @@ async def run_activity_digest() -> None:
     """Generate and send the daily activity digest to connected clients."""
     try:
         from src.observer.screen_repository import screen_observation_repo
-        from src.memory.soul import read_soul
+        from src.memory.soul import aread_soul
 
         summary = await screen_observation_repo.get_daily_summary(date.today())
 
@@ -51,7 +51,7 @@ async def run_activity_digest() -> None:
             logger.info("activity_digest: no observations today — skipping")
             return
 
-        soul = read_soul()
+        soul = await aread_soul()
 
         # Format breakdowns
         activity_breakdown = "\n".join(
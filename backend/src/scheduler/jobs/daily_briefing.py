@@ -45,8 +45,8 @@ async def run_daily_briefing() -> None:
         ctx = await context_manager.refresh()
 
         # Gather context data
-        from src.memory.soul import read_soul
-        soul = read_soul()
+        from src.memory.soul import aread_soul
+        soul = await aread_soul()
 
         events_text = "No events scheduled."
         if ctx.upcoming_events:
@@ -57,11 +57,11 @@ async def run_daily_briefing() -> None:
 
         goals_text = ctx.active_goals_summary or "No active goals."
 
-        from src.memory.vector_store import search_formatted
-        memories = await asyncio.to_thread(
-            search_formatted,
+        from src.memory.vector_store import memory_store
+        memories = await memory_store.search_formatted(
             "daily priorities and routines",
             top_k=3,
+            recency_weight=0.3,
         )
         memories_text = memories or "No relevant memories yet."
 
@@ -25,6 +25,9 @@ Keep the RPG framing light. Be reflective and encouraging.
 ## Active Goals
 {active_goals}
 
+## Memories From Today
+{memories}
+
 Write a short evening review (3-6 sentences) covering:
 1. Acknowledge what was accomplished today
 2. Note any goals that were completed or progressed
@@ -77,13 +80,20 @@ async def run_evening_review() -> None:
 
         ctx = await context_manager.refresh()
 
-        from src.memory.soul import read_soul
-        soul = read_soul()
+        from src.memory.soul import aread_soul
+        soul = await aread_soul()
 
         # Gather today's data
-        message_count, completed_titles = await asyncio.gather(
+        from src.memory.vector_store import memory_store
+
+        message_count, completed_titles, memories = await asyncio.gather(
             _count_messages_today(),
             _get_completed_goals_today(),
+            memory_store.search_formatted(
+                "progress, decisions and reflections",
+                top_k=5,
+                max_age_days=1,
+            ),
         )
 
         completed_text = ", ".join(completed_titles) if completed_titles else "None today"
@@ -96,6 +106,7 @@ async def run_evening_review() -> None:
             completed_goals=completed_text,
             git_activity=git_text,
             active_goals=goals_text,
+            memories=memories or "Nothing new remembered today.",
         )
 
         import litellm
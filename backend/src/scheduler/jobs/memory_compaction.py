@@ -0,0 +1,21 @@
+"""Memory table compaction — merges small Lance fragments and prunes old versions."""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def run_memory_compaction() -> None:
+    """Compact the memories table, refresh its indexes and drop expired versions."""
+    try:
+        from src.memory.vector_store import memory_store
+
+        report = await memory_store.compact()
+        logger.info(
+            "memory_compaction: %d → %d fragments, %d bytes reclaimed",
+            report["before"]["fragments"],
+            report["after"]["fragments"],
+            report["bytes_reclaimed"],
+        )
+    except Exception:
+        logger.exception("memory_compaction failed")
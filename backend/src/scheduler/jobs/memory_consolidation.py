@@ -1,11 +1,12 @@
 import logging
 from datetime import datetime, timedelta, timezone
 
+from sqlalchemy import exists, or_
 from sqlmodel import select, col
 
 from src.db.engine import get_session
 from src.db.models import Session, Message
-from src.memory.consolidator import consolidate_session
+from src.memory.consolidator import consolidate_sessions
 
 logger = logging.getLogger(__name__)
 
@@ -14,28 +15,35 @@ async def run_memory_consolidation() -> None:
     """Find sessions with recent unconsolidated messages and consolidate them.
 
     This is a periodic catch-all — the ad-hoc trigger in ws.py handles
-    immediate post-conversation consolidation.
+    immediate post-conversation consolidation. Sessions with no messages
+    past their consolidation watermark are skipped in the query itself;
+    the rest are consolidated together in as few LLM calls as fit.
     """
     try:
         cutoff = datetime.now(timezone.utc) - timedelta(hours=1)
+        has_new_messages = exists().where(
+            col(Message.session_id) == col(Session.id),
+            col(Message.role).in_(["user", "assistant"]),
+            or_(
+                col(Session.consolidated_through).is_(None),
+                col(Message.created_at) > col(Session.consolidated_through),
+            ),
+        )
 
         async with get_session() as db:
             result = await db.execute(
                 select(Session)
                 .where(col(Session.updated_at) >= cutoff)
+                .where(has_new_messages)
                 .order_by(col(Session.updated_at).desc())
                 .limit(10)
             )
             sessions = result.scalars().all()
 
-        consolidated = 0
-        for session in sessions:
-            try:
-                await consolidate_session(session.id)
-                consolidated += 1
-            except Exception:
-                logger.exception("Consolidation failed for session %s", session.id[:8])
+        if not sessions:
+            return
 
+        consolidated = await consolidate_sessions([session.id for session in sessions])
         if consolidated:
             logger.info("Scheduled memory consolidation: %d sessions processed", consolidated)
 
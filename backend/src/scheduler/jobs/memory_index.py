@@ -0,0 +1,19 @@
+"""Memory index maintenance — builds the LanceDB vector, full-text and scalar indexes."""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def run_memory_index_maintenance() -> None:
+    """Create the memories vector, full-text and scalar indexes once; compaction folds in new rows."""
+    try:
+        from src.memory.vector_store import memory_store
+
+        report = await memory_store.maintain_index()
+        if report["action"] != "none":
+            logger.info(
+                "memory_index: %s index (%d rows)", report["action"], report["rows"],
+            )
+    except Exception:
+        logger.exception("memory_index maintenance failed")
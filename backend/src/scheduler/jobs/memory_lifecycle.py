@@ -0,0 +1,22 @@
+"""Memory lifecycle — merges near-duplicate memories and archives cold ones."""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def run_memory_lifecycle() -> None:
+    """Flush recall counts, merge near-duplicates and archive cold memories."""
+    try:
+        from src.memory.lifecycle import run_lifecycle
+
+        report = await run_lifecycle()
+        logger.info(
+            "memory_lifecycle: %d merged, %d archived (%d → %d rows)",
+            report["rows_merged"],
+            report["rows_archived"],
+            report["rows_before"],
+            report["rows_after"],
+        )
+    except Exception:
+        logger.exception("memory_lifecycle failed")
@@ -44,7 +44,7 @@ async def run_weekly_activity_review() -> None:
     """Generate and send the weekly activity review to connected clients."""
     try:
         from src.observer.screen_repository import screen_observation_repo
-        from src.memory.soul import read_soul
+        from src.memory.soul import aread_soul
 
         # Calculate the Monday of the current week
         today = date.today()
@@ -56,7 +56,7 @@ async def run_weekly_activity_review() -> None:
             logger.info("weekly_activity_review: no observations this week — skipping")
             return
 
-        soul = read_soul()
+        soul = await aread_soul()
 
         activity_breakdown = "\n".join(
             f"- {act}: {secs // 60}m"
@@ -6,7 +6,7 @@ from typing import Optional
 
 from sqlmodel import select
 
-from src.db.engine import get_session
+from src.db.engine import get_read_session, get_session
 from src.db.models import Secret
 from src.vault.crypto import encrypt, decrypt
 
@@ -47,7 +47,7 @@ class VaultRepository:
 
     async def get(self, key: str) -> Optional[str]:
         """Retrieve and decrypt a secret value. Returns None if not found."""
-        async with get_session() as db:
+        async with get_read_session() as db:
             result = await db.execute(select(Secret).where(Secret.key == key))
             secret = result.scalars().first()
             if not secret:
@@ -56,7 +56,7 @@ class VaultRepository:
 
     async def list_keys(self) -> list[dict]:
         """List all secret keys with metadata (never values)."""
-        async with get_session() as db:
+        async with get_read_session() as db:
             result = await db.execute(select(Secret))
             secrets = result.scalars().all()
             return [
@@ -82,7 +82,7 @@ class VaultRepository:
 
     async def exists(self, key: str) -> bool:
         """Check if a secret exists."""
-        async with get_session() as db:
+        async with get_read_session() as db:
             result = await db.execute(select(Secret).where(Secret.key == key))
             return result.scalars().first() is not None
 
@@ -0,0 +1,96 @@
+"""Background warmup of slow-to-initialize components, with readiness tracking.
+
+The first chat after a restart would otherwise pay for importing the
+embedding runtime, loading the model, opening LanceDB and loading the
+tiktoken encoding. ``start_warmup()`` kicks those off from the app lifespan;
+request handlers consult ``is_warming()`` to skip work that would block on
+them, and ``/health`` reports ``status()``.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Callable
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+IDLE = "idle"
+WARMING = "warming"
+READY = "ready"
+FAILED = "failed"
+
+
+def _warm_embedder() -> None:
+    from src.memory.embedder import warmup
+    warmup()
+
+
+async def _warm_vector_store() -> None:
+    from src.memory.vector_store import memory_store
+    await memory_store.warmup()
+
+
+def _warm_tokenizer() -> None:
+    from src.agent.context_window import warmup
+    warmup()
+
+
+_COMPONENTS: dict[str, Callable[[], object]] = {
+    "embedder": _warm_embedder,
+    "vector_store": _warm_vector_store,
+    "tokenizer": _warm_tokenizer,
+}
+
+_status: dict[str, str] = {name: IDLE for name in _COMPONENTS}
+
+
+def status() -> dict[str, str]:
+    """Return the readiness of each warmed component."""
+    return dict(_status)
+
+
+def is_warming(component: str) -> bool:
+    """True while the component's warmup is still running.
+
+    Components that were never warmed (warmup disabled, tests) report False so
+    callers fall back to the old lazy-initialization behaviour.
+    """
+    return _status.get(component) == WARMING
+
+
+def recall_available() -> bool:
+    """Whether memory recall can run without blocking on warmup."""
+    return not (is_warming("embedder") or is_warming("vector_store"))
+
+
+async def _warm(name: str, func: Callable[[], object]) -> None:
+    started = time.monotonic()
+    try:
+        if asyncio.iscoroutinefunction(func):
+            await func()
+        else:
+            await asyncio.to_thread(func)
+        _status[name] = READY
+        logger.info("Warmup: %s ready in %.1fs", name, time.monotonic() - started)
+    except Exception:
+        _status[name] = FAILED
+        logger.warning("Warmup: %s failed", name, exc_info=True)
+
+
+async def _run_warmup() -> None:
+    await asyncio.gather(*(_warm(name, func) for name, func in _COMPONENTS.items()))
+
+
+def start_warmup() -> asyncio.Task | None:
+    """Start warming all components in the background. Returns the task."""
+    if not settings.startup_warmup_enabled:
+        logger.info("Startup warmup disabled (STARTUP_WARMUP_ENABLED=false)")
+        return None
+
+    from src.utils.background import track_task
+
+    for name in _COMPONENTS:
+        _status[name] = WARMING
+    return track_task(_run_warmup(), name="startup-warmup")
@@ -1,7 +1,9 @@
+import hashlib
 import os
 from contextlib import asynccontextmanager
 from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
@@ -15,7 +17,7 @@ os.environ.setdefault("WORKSPACE_DIR", "/tmp/seraph-test")
 
 from src.app import create_app
 
-# Every place get_session is imported — use the local attribute name.
+# Every place get_session / get_read_session is imported — use the local attribute name.
 _PATCH_TARGETS = [
     "src.db.engine.get_session",
     "src.agent.session.get_session",
@@ -26,6 +28,13 @@ _PATCH_TARGETS = [
     "src.observer.insight_queue.get_session",
     "src.vault.repository.get_session",
     "src.observer.screen_repository.get_session",
+    # Read-only sessions share the same in-memory database in tests
+    "src.db.engine.get_read_session",
+    "src.agent.session.get_read_session",
+    "src.goals.repository.get_read_session",
+    "src.observer.insight_queue.get_read_session",
+    "src.vault.repository.get_read_session",
+    "src.observer.screen_repository.get_read_session",
 ]
 
 
@@ -71,6 +80,57 @@ async def async_db():
     await engine.dispose()
 
 
+# ── LanceDB fixture ─────────────────────────────────────
+
+@pytest.fixture
+def lance_dir(tmp_path, monkeypatch):
+    """Point the vector store at a fresh LanceDB directory."""
+    import src.memory.vector_store as vs
+
+    monkeypatch.setattr(vs, "_LANCE_DIR", str(tmp_path / "lance"))
+    vs.memory_store.reset()
+    vs.query_cache.invalidate()
+    yield tmp_path
+    vs.memory_store.reset()
+    vs.query_cache.invalidate()
+
+
+@pytest_asyncio.fixture
+async def memory_table(lance_dir):
+    """The memory store's table handle on a fresh LanceDB directory."""
+    import src.memory.vector_store as vs
+
+    return await vs.memory_store._get_table()
+
+
+@pytest.fixture
+def memory_row():
+    """Row factory for the memories table: ``memory_row(id, vector, **columns)``.
+
+    Omitted columns take the defaults in ``vector_store._memory_row``, so a
+    schema change is one edit there.
+    """
+    import src.memory.vector_store as vs
+
+    return vs._memory_row
+
+
+@pytest.fixture
+def fake_vector():
+    """Deterministic stand-in for the embedder.
+
+    Returns a function mapping text to a unit vector seeded by its SHA-256,
+    so equal texts embed identically and different texts are effectively
+    orthogonal (no semantic signal).
+    """
+    def _vector(text: str) -> list[float]:
+        seed = int(hashlib.sha256(text.encode()).hexdigest()[:8], 16)
+        v = np.random.default_rng(seed).normal(size=384).astype(np.float32)
+        return (v / np.linalg.norm(v)).tolist()
+
+    return _vector
+
+
 # ── App / HTTP client fixtures ──────────────────────────
 
 @pytest.fixture
@@ -16,7 +16,7 @@ class TestAgentFactory:
                          "view_soul", "update_soul", "create_goal", "shell_execute"]:
             assert expected in tool_names
 
-    @patch("src.agent.factory.LiteLLMModel")
+    @patch("src.agent.factory.CachingLiteLLMModel")
     def test_get_model(self, mock_litellm_cls):
         mock_litellm_cls.return_value = MagicMock()
         model = get_model()
@@ -0,0 +1,107 @@
+"""Tests for batched memory inserts with in-batch and cross-table dedup."""
+
+import asyncio
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+import src.memory.vector_store as vs
+
+
+@pytest.fixture
+def vector(fake_vector):
+    """Case- and whitespace-insensitive fake embedding."""
+    return lambda text: fake_vector(text.lower().strip())
+
+
+@pytest.fixture
+def embed(lance_dir, vector):
+    async def aembed_many(texts):
+        return [vector(t) for t in texts]
+
+    with patch.object(vs.embedding_service, "aembed_many", side_effect=aembed_many) as mock_embed:
+        yield mock_embed
+
+
+async def _table():
+    return await vs.memory_store._get_table()
+
+
+# Texts that differ only in case/whitespace embed identically with `vector`
+_BATCH = [
+    {"text": "User's name is Alice", "category": "fact"},
+    {"text": "User works at ACME Corp", "category": "fact"},
+    {"text": "user's name is alice ", "category": "fact"},
+    {"text": "Wants to run a marathon", "category": "goal"},
+    {"text": "USER WORKS AT ACME CORP", "category": "fact"},
+]
+
+
+class TestBatchKeepers:
+    def test_unique_rows_keep_themselves(self):
+        vectors = np.eye(4, dtype=np.float32)
+        assert vs._batch_keepers(vectors) == [0, 1, 2, 3]
+
+    def test_duplicates_point_at_first_occurrence(self):
+        a, b = np.eye(2, dtype=np.float32)
+        near_a = a + np.array([0.01, 0.0], dtype=np.float32)
+        vectors = np.stack([a, b, near_a, a])
+        assert vs._batch_keepers(vectors) == [0, 1, 0, 0]
+
+    def test_chained_duplicates_resolve_to_root(self):
+        # Each vector is within threshold of its neighbour but not of the one two away
+        step = np.array([0.0, 0.15], dtype=np.float32)
+        base = np.array([1.0, 0.0], dtype=np.float32)
+        vectors = np.stack([base, base + step, base + 2 * step])
+        assert vs._batch_keepers(vectors) == [0, 0, 0]
+
+
+class TestAddMany:
+    async def test_dedups_within_batch(self, embed):
+        ids = await vs.memory_store.add_many(_BATCH)
+        assert ids[2] == ids[0]
+        assert ids[4] == ids[1]
+        assert len({ids[0], ids[1], ids[3]}) == 3
+        assert await (await _table()).count_rows() == 3
+
+    async def test_embeds_once_and_writes_once(self, embed):
+        await vs.memory_store.add_many(_BATCH[:2])
+        versions = len(await (await _table()).list_versions())
+
+        with patch.object(vs, "_vector_search", wraps=vs._vector_search) as search:
+            await vs.memory_store.add_many(_BATCH[3:])
+        assert embed.await_count == 2
+        assert search.call_count == 1
+        assert len(await (await _table()).list_versions()) == versions + 1
+
+    async def test_dedups_against_table(self, embed):
+        first = await vs.memory_store.add_many(_BATCH[:2])
+        again = await vs.memory_store.add_many([_BATCH[4], _BATCH[3], _BATCH[2]])
+        assert again[0] == first[1]
+        assert again[2] == first[0]
+        assert again[1] not in first
+        assert await (await _table()).count_rows() == 3
+
+    async def test_all_duplicates_skips_write(self, embed):
+        await vs.memory_store.add_many(_BATCH[:2])
+        versions = len(await (await _table()).list_versions())
+        await vs.memory_store.add_many(_BATCH[:2])
+        assert len(await (await _table()).list_versions()) == versions
+
+    async def test_concurrent_batches_insert_once(self, embed):
+        results = await asyncio.gather(*(vs.memory_store.add_many(_BATCH[:2]) for _ in range(4)))
+        assert all(ids == results[0] for ids in results)
+        assert await (await _table()).count_rows() == 2
+
+    async def test_stores_item_fields(self, embed, vector):
+        [memory_id] = await vs.memory_store.add_many(
+            [{"text": "Likes tea", "category": "preference", "source_session_id": "s9"}],
+        )
+        row = (await (await _table()).query().where(f"id = '{memory_id}'").to_list())[0]
+        assert (row["text"], row["category"], row["source_session_id"]) == ("Likes tea", "preference", "s9")
+        assert np.allclose(row["vector"], vector("Likes tea"), atol=1e-6)
+
+    async def test_failure_returns_empty_ids(self, embed):
+        embed.side_effect = RuntimeError("model crashed")
+        assert await vs.memory_store.add_many(_BATCH[:2]) == ["", ""]
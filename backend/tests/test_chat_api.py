@@ -5,7 +5,7 @@ import pytest
 
 @pytest.mark.asyncio
 class TestChatAPI:
-    @patch("src.memory.vector_store.search_formatted", return_value="")
+    @patch("src.memory.vector_store.memory_store.search_formatted", return_value="")
     @patch("src.api.chat.build_agent")
     @patch("src.api.chat.create_onboarding_agent")
     async def test_chat_success(self, mock_onboarding, mock_create_agent, mock_search, client):
@@ -19,7 +19,7 @@ class TestChatAPI:
         assert data["response"] == "Hello! I'm Seraph."
         assert "session_id" in data
 
-    @patch("src.memory.vector_store.search_formatted", return_value="")
+    @patch("src.memory.vector_store.memory_store.search_formatted", return_value="")
     @patch("src.api.chat.build_agent")
     @patch("src.api.chat.create_onboarding_agent")
     async def test_chat_with_session(self, mock_onboarding, mock_create_agent, mock_search, client):
@@ -40,7 +40,7 @@ class TestChatAPI:
         response = await client.post("/api/chat", json={"message": ""})
         assert response.status_code == 422
 
-    @patch("src.memory.vector_store.search_formatted", return_value="")
+    @patch("src.memory.vector_store.memory_store.search_formatted", return_value="")
     @patch("src.api.chat.build_agent")
     @patch("src.api.chat.create_onboarding_agent")
     async def test_chat_agent_error(self, mock_onboarding, mock_create_agent, mock_search, client):
@@ -57,4 +57,6 @@ class TestHealthEndpoint:
     async def test_health(self, client):
         response = await client.get("/health")
         assert response.status_code == 200
-        assert response.json() == {"status": "ok"}
+        data = response.json()
+        assert data["status"] == "ok"
+        assert set(data) >= {"embedder", "vector_store", "tokenizer"}
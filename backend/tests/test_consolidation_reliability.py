@@ -53,7 +53,7 @@ class TestEmbeddingFailures:
         mock_resp.choices[0].message.content = llm_response
 
         with patch("litellm.completion", return_value=mock_resp), \
-             patch("src.memory.consolidator.add_memory", side_effect=RuntimeError("Embedding crashed")):
+             patch("src.memory.consolidator.memory_store.add_many", side_effect=RuntimeError("Embedding crashed")):
             # Should not raise — consolidator catches all exceptions
             await consolidate_session("s1")
 
@@ -84,7 +84,7 @@ class TestMalformedLLMOutput:
         mock_resp.choices[0].message.content = llm_response
 
         with patch("litellm.completion", return_value=mock_resp), \
-             patch("src.memory.consolidator.add_memory") as mock_add:
+             patch("src.memory.consolidator.memory_store.add_many") as mock_add:
             await consolidate_session("s1")
             mock_add.assert_not_called()  # no valid categories → no memories stored
 
@@ -106,6 +106,6 @@ class TestMalformedLLMOutput:
         mock_resp.choices[0].message.content = llm_response
 
         with patch("litellm.completion", return_value=mock_resp), \
-             patch("src.memory.consolidator.add_memory") as mock_add:
+             patch("src.memory.consolidator.memory_store.add_many") as mock_add:
             await consolidate_session("s1")
             mock_add.assert_not_called()
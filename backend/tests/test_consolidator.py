@@ -6,7 +6,7 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from src.agent.session import SessionManager
-from src.memory.consolidator import consolidate_session
+from src.memory.consolidator import consolidate_session, consolidate_sessions
 
 
 @pytest.fixture
@@ -22,6 +22,8 @@ class TestConsolidateSession:
         with patch("litellm.completion") as mock_completion:
             await consolidate_session("s1")
             mock_completion.assert_not_called()
+        # Marked seen, so the scheduled job stops re-selecting it
+        assert await sm.get_unconsolidated("s1") == ("", None)
 
     async def test_extracts_facts(self, async_db, sm):
         await sm.get_or_create("s1")
@@ -40,9 +42,15 @@ class TestConsolidateSession:
         mock_resp.choices[0].message.content = llm_response
 
         with patch("litellm.completion", return_value=mock_resp), \
-             patch("src.memory.consolidator.add_memory") as mock_add:
+             patch("src.memory.consolidator.memory_store.add_many") as mock_add:
             await consolidate_session("s1")
-            assert mock_add.call_count == 2
+            mock_add.assert_awaited_once()
+            items = mock_add.call_args.args[0]
+            assert [i["text"] for i in items] == [
+                "User's name is Alice",
+                "User works at ACME Corp as a software engineer",
+            ]
+            assert all(i["category"] == "fact" and i["source_session_id"] == "s1" for i in items)
 
     async def test_applies_soul_updates(self, async_db, sm):
         await sm.get_or_create("s1")
@@ -61,7 +69,7 @@ class TestConsolidateSession:
         mock_resp.choices[0].message.content = llm_response
 
         with patch("litellm.completion", return_value=mock_resp), \
-             patch("src.memory.consolidator.add_memory"), \
+             patch("src.memory.consolidator.memory_store.add_many"), \
              patch("src.memory.consolidator.update_soul_section") as mock_soul:
             await consolidate_session("s1")
             mock_soul.assert_called_once_with("Goals", "- Build an AI startup")
@@ -83,9 +91,9 @@ class TestConsolidateSession:
         mock_resp.choices[0].message.content = fenced
 
         with patch("litellm.completion", return_value=mock_resp), \
-             patch("src.memory.consolidator.add_memory") as mock_add:
+             patch("src.memory.consolidator.memory_store.add_many") as mock_add:
             await consolidate_session("s1")
-            assert mock_add.call_count == 1
+            assert len(mock_add.call_args.args[0]) == 1
 
     async def test_llm_failure_graceful(self, async_db, sm):
         await sm.get_or_create("s1")
@@ -95,3 +103,208 @@ class TestConsolidateSession:
         with patch("litellm.completion", side_effect=RuntimeError("LLM down")):
             # Should not raise
             await consolidate_session("s1")
+
+
+class TestConsolidationWatermark:
+    @staticmethod
+    def _response(facts):
+        mock_resp = MagicMock()
+        mock_resp.choices = [MagicMock()]
+        mock_resp.choices[0].message.content = json.dumps({
+            "facts": facts, "patterns": [], "goals": [], "reflections": [], "soul_updates": {},
+        })
+        return mock_resp
+
+    async def test_second_run_without_new_messages_skips_llm(self, async_db, sm):
+        await sm.get_or_create("s1")
+        await sm.add_message("s1", "user", "I have been learning to play the cello for two years now.")
+        await sm.add_message("s1", "assistant", "That's a lovely instrument, how are the lessons going?")
+
+        with patch("litellm.completion", return_value=self._response(["User plays the cello"])) as mock_llm, \
+             patch("src.memory.consolidator.memory_store.add_many", return_value=["m1"]):
+            await consolidate_session("s1")
+            await consolidate_session("s1")
+            assert mock_llm.call_count == 1
+
+    async def test_only_new_messages_are_sent(self, async_db, sm):
+        await sm.get_or_create("s1")
+        await sm.add_message("s1", "user", "I have been learning to play the cello for two years now.")
+        await sm.add_message("s1", "assistant", "That's a lovely instrument, how are the lessons going?")
+
+        with patch("litellm.completion", return_value=self._response([])) as mock_llm, \
+             patch("src.memory.consolidator.memory_store.add_many"):
+            await consolidate_session("s1")
+            await sm.add_message("s1", "user", "I also started running three times a week in the mornings.")
+            await sm.add_message("s1", "assistant", "Great habit — mornings are a good time for it.")
+            await consolidate_session("s1")
+
+        prompt = mock_llm.call_args_list[1].kwargs["messages"][0]["content"]
+        assert "running three times a week" in prompt
+        assert "cello" not in prompt
+
+    async def test_backlog_drains_oldest_first(self, async_db, sm, monkeypatch):
+        from config.settings import settings
+
+        monkeypatch.setattr(settings, "context_window_token_budget", 40)
+        await sm.get_or_create("s1")
+        for i in range(6):
+            await sm.add_message("s1", "user", f"Message number {i} about a fairly specific personal topic.")
+
+        with patch("litellm.completion", return_value=self._response([])) as mock_llm, \
+             patch("src.memory.consolidator.memory_store.add_many"):
+            for _ in range(6):
+                await consolidate_session("s1")
+
+        prompts = [c.kwargs["messages"][0]["content"] for c in mock_llm.call_args_list]
+        assert "Message number 0" in prompts[0] and "Message number 5" not in prompts[0]
+        for i in range(6):
+            assert sum(f"Message number {i} " in p for p in prompts) == 1
+        assert await sm.get_unconsolidated("s1") == ("", None)
+
+    async def test_failed_llm_call_keeps_messages_pending(self, async_db, sm):
+        await sm.get_or_create("s1")
+        await sm.add_message("s1", "user", "I have been learning to play the cello for two years now.")
+        await sm.add_message("s1", "assistant", "That's a lovely instrument, how are the lessons going?")
+
+        with patch("litellm.completion", side_effect=RuntimeError("LLM down")):
+            await consolidate_session("s1")
+
+        text, _ = await sm.get_unconsolidated("s1")
+        assert "cello" in text
+
+    async def test_failed_store_keeps_messages_pending(self, async_db, sm):
+        await sm.get_or_create("s1")
+        await sm.add_message("s1", "user", "I have been learning to play the cello for two years now.")
+        await sm.add_message("s1", "assistant", "That's a lovely instrument, how are the lessons going?")
+
+        with patch("litellm.completion", return_value=self._response(["User plays the cello"])), \
+             patch("src.memory.consolidator.memory_store.add_many", return_value=[""]):
+            await consolidate_session("s1")
+
+        text, _ = await sm.get_unconsolidated("s1")
+        assert "cello" in text
+
+
+def _llm_reply(content: str) -> MagicMock:
+    mock_resp = MagicMock()
+    mock_resp.choices = [MagicMock()]
+    mock_resp.choices[0].message.content = content
+    return mock_resp
+
+
+def _extraction(facts=(), soul_updates=None) -> dict:
+    return {
+        "facts": list(facts), "patterns": [], "goals": [], "reflections": [],
+        "soul_updates": soul_updates or {},
+    }
+
+
+class TestBatchConsolidation:
+    @pytest.fixture
+    async def two_sessions(self, async_db, sm):
+        for sid, (user, assistant) in {
+            "s1": ("I have been learning to play the cello for two years now.",
+                   "That's a lovely instrument, how are the lessons going?"),
+            "s2": ("I just moved to Lisbon and I'm looking for a climbing gym.",
+                   "Lisbon has a few good bouldering spots, want a list?"),
+        }.items():
+            await sm.get_or_create(sid)
+            await sm.add_message(sid, "user", user)
+            await sm.add_message(sid, "assistant", assistant)
+
+    async def test_one_call_fans_out_per_session(self, two_sessions, sm):
+        reply = json.dumps({
+            "s1": _extraction(["User plays the cello"]),
+            "s2": _extraction(["User lives in Lisbon"], {"Identity": "- Lives in Lisbon"}),
+        })
+        with patch("litellm.completion", return_value=_llm_reply(reply)) as mock_llm, \
+             patch("src.memory.consolidator.memory_store.add_many", return_value=["m"]) as mock_add, \
+             patch("src.memory.consolidator.update_soul_section") as mock_soul:
+            assert await consolidate_sessions(["s1", "s2"]) == 2
+
+        assert mock_llm.call_count == 1
+        prompt = mock_llm.call_args.kwargs["messages"][0]["content"]
+        assert "### Session s1" in prompt and "### Session s2" in prompt
+        assert prompt.count("Current soul file:") == 1
+        by_session = {c.args[0][0]["source_session_id"]: c.args[0][0]["text"] for c in mock_add.call_args_list}
+        assert by_session == {"s1": "User plays the cello", "s2": "User lives in Lisbon"}
+        mock_soul.assert_called_once_with("Identity", "- Lives in Lisbon")
+        assert await sm.get_unconsolidated("s1") == ("", None)
+        assert await sm.get_unconsolidated("s2") == ("", None)
+
+    async def test_unparseable_batch_falls_back_per_session(self, two_sessions):
+        replies = [_llm_reply("not json at all"), _llm_reply(json.dumps(_extraction())),
+                   _llm_reply(json.dumps(_extraction()))]
+        with patch("litellm.completion", side_effect=replies) as mock_llm, \
+             patch("src.memory.consolidator.memory_store.add_many"):
+            await consolidate_sessions(["s1", "s2"])
+        assert mock_llm.call_count == 3
+        single_prompt = mock_llm.call_args_list[1].kwargs["messages"][0]["content"]
+        assert "### Session" not in single_prompt
+
+    async def test_missing_session_key_falls_back_for_that_session(self, two_sessions):
+        replies = [_llm_reply(json.dumps({"s1": _extraction()})), _llm_reply(json.dumps(_extraction()))]
+        with patch("litellm.completion", side_effect=replies) as mock_llm, \
+             patch("src.memory.consolidator.memory_store.add_many"):
+            await consolidate_sessions(["s1", "s2"])
+        assert mock_llm.call_count == 2
+        assert "Lisbon" in mock_llm.call_args_list[1].kwargs["messages"][0]["content"]
+
+    async def test_oversized_sessions_use_per_session_calls(self, two_sessions, monkeypatch):
+        from config.settings import settings
+
+        monkeypatch.setattr(settings, "consolidation_batch_token_budget", 10)
+        with patch("litellm.completion", return_value=_llm_reply(json.dumps(_extraction()))) as mock_llm, \
+             patch("src.memory.consolidator.memory_store.add_many"):
+            await consolidate_sessions(["s1", "s2"])
+        assert mock_llm.call_count == 2
+        for call in mock_llm.call_args_list:
+            assert "### Session" not in call.kwargs["messages"][0]["content"]
+
+    async def test_failed_store_keeps_batched_session_pending(self, two_sessions, sm):
+        reply = json.dumps({
+            "s1": _extraction(["User plays the cello"]),
+            "s2": _extraction(["User lives in Lisbon"]),
+        })
+        stored = {"User plays the cello": ["m1"], "User lives in Lisbon": [""]}
+        with patch("litellm.completion", return_value=_llm_reply(reply)), \
+             patch("src.memory.consolidator.memory_store.add_many",
+                   side_effect=lambda items: stored[items[0]["text"]]):
+            await consolidate_sessions(["s1", "s2"])
+        assert await sm.get_unconsolidated("s1") == ("", None)
+        text, _ = await sm.get_unconsolidated("s2")
+        assert "Lisbon" in text
+
+    def test_batches_fit_budget_with_prompt_template(self, monkeypatch):
+        from config.settings import settings
+        from src.agent.prompt_budget import count_tokens
+        from src.memory import consolidator
+
+        soul = "# Soul\n\n## Identity\nA climber who plays the cello."
+        pending = [(f"s{i}", f"User: {'detail ' * 60}", None) for i in range(6)]
+        empty = consolidator._BATCH_CONSOLIDATION_PROMPT.format(conversations="", soul=soul)
+        budget = count_tokens(empty) + 250
+        monkeypatch.setattr(settings, "consolidation_batch_token_budget", budget)
+        monkeypatch.setattr(settings, "consolidation_batch_max_sessions", 10)
+
+        batches, singles = consolidator._plan_batches(pending, count_tokens(soul))
+        assert batches and not singles
+        for batch in batches:
+            assert count_tokens(consolidator._batch_prompt(batch, soul)) <= budget
+
+    async def test_short_sessions_are_marked_seen(self, two_sessions, sm):
+        await sm.get_or_create("s3")
+        await sm.add_message("s3", "user", "ok")
+        with patch("litellm.completion", return_value=_llm_reply(json.dumps(_extraction()))), \
+             patch("src.memory.consolidator.memory_store.add_many"):
+            await consolidate_sessions(["s3"])
+        assert await sm.get_unconsolidated("s3") == ("", None)
+
+    async def test_sessions_without_new_messages_are_skipped(self, two_sessions, sm):
+        _, through = await sm.get_unconsolidated("s2")
+        await sm.mark_consolidated("s2", through)
+        with patch("litellm.completion", return_value=_llm_reply(json.dumps(_extraction()))) as mock_llm, \
+             patch("src.memory.consolidator.memory_store.add_many"):
+            assert await consolidate_sessions(["s1", "s2"]) == 1
+        assert mock_llm.call_count == 1
+        assert "Lisbon" not in mock_llm.call_args.kwargs["messages"][0]["content"]
@@ -9,6 +9,7 @@ from src.agent.context_window import (
     _format_messages,
     _count_tokens,
     _summary_cache,
+    pending_fold,
 )
 
 
@@ -190,3 +191,107 @@ class TestSettingsIntegration:
             result = build_context_window(msgs, token_budget=999999)
         for i in range(10):
             assert f"msg {i}" in result
+
+
+class TestTokenCountCache:
+    """Per-message counts are tokenized once and reused across turns."""
+
+    @pytest.fixture(autouse=True)
+    def fake_encoding(self):
+        from src.agent import context_window as cw
+
+        encoder = MagicMock()
+        encoder.encode.side_effect = lambda text: text.split()
+        cw._token_counts.clear()
+        with patch.object(cw, "_get_encoding", return_value=encoder):
+            yield encoder
+        cw._token_counts.clear()
+
+    def _history(self, n: int) -> list[dict]:
+        return [{"id": f"m{i}", **_msg("user", f"message {i}")} for i in range(n)]
+
+    def test_only_new_messages_are_tokenized(self, fake_encoding):
+        build_context_window(self._history(50), token_budget=50000)
+        assert fake_encoding.encode.call_count == 50
+
+        fake_encoding.encode.reset_mock()
+        build_context_window(self._history(52), token_budget=50000)
+        assert fake_encoding.encode.call_count == 2
+
+    def test_messages_without_id_are_keyed_by_content(self, fake_encoding):
+        msgs = [_msg("user", f"message {i}") for i in range(10)]
+        build_context_window(msgs, token_budget=50000)
+        fake_encoding.encode.reset_mock()
+        build_context_window(msgs, token_budget=50000)
+        fake_encoding.encode.assert_not_called()
+
+    def test_prefix_sum_matches_full_count(self):
+        from src.agent.context_window import _message_token_counts, _span_tokens
+        from itertools import accumulate
+
+        msgs = self._history(20)
+        prefix = [0, *accumulate(_message_token_counts(msgs))]
+        # whitespace "tokenizer" ignores the newline separators the estimate adds
+        assert _span_tokens(prefix, 0, 20) - 19 == len(_format_messages(msgs).split())
+        assert _span_tokens(prefix, 5, 5) == 0
+
+    @patch("src.agent.context_window._summarize_middle", return_value="summary")
+    def test_budget_check_uses_cached_counts(self, _mock_summary, fake_encoding):
+        msgs = self._history(40)
+        # 40 lines x 3 tokens + 39 separators = 159 tokens
+        assert "[Summary of" not in build_context_window(msgs, token_budget=159)
+        fake_encoding.encode.reset_mock()
+        result = build_context_window(msgs, token_budget=158, keep_first=1, keep_recent=5)
+        assert "[Summary of 34 earlier messages: summary]" in result
+        # Only the summary line itself was tokenized
+        assert fake_encoding.encode.call_count == 1
+
+
+class TestRollingSummary:
+    """The persisted rolling summary replaces the middle with no LLM call."""
+
+    @pytest.fixture(autouse=True)
+    def fake_encoding(self):
+        from src.agent import context_window as cw
+
+        encoder = MagicMock()
+        encoder.encode.side_effect = lambda text: text.split()
+        cw._token_counts.clear()
+        with patch.object(cw, "_get_encoding", return_value=encoder):
+            yield encoder
+        cw._token_counts.clear()
+
+    def _history(self, n: int) -> list[dict]:
+        return [
+            {"id": f"m{i}", "role": "user", "content": f"message {i} " + "pad " * 20,
+             "created_at": f"2025-01-01T00:{i // 60:02d}:{i % 60:02d}"}
+            for i in range(n)
+        ]
+
+    @patch("src.agent.context_window._summarize_middle", side_effect=AssertionError("LLM on hot path"))
+    def test_uses_stored_summary(self, _mock):
+        msgs = self._history(60)
+        result = build_context_window(
+            msgs, token_budget=400, keep_first=2, keep_recent=5,
+            summary="They planned a trip.", summary_through=msgs[54]["created_at"],
+        )
+        assert "[Summary of earlier conversation: They planned a trip.]" in result
+        assert "message 10 " not in result
+        assert "message 0 " in result and "message 59 " in result
+
+    @patch("src.agent.context_window._summarize_middle", side_effect=AssertionError("LLM on hot path"))
+    def test_unfolded_messages_kept_newest_first(self, _mock):
+        msgs = self._history(60)
+        result = build_context_window(
+            msgs, token_budget=400, keep_first=2, keep_recent=5,
+            summary="", summary_through=None,
+        )
+        assert "message 54 " in result
+        assert "message 3 " not in result
+        assert "earlier messages not yet summarized]" in result
+
+    def test_pending_fold(self):
+        msgs = self._history(60)
+        assert pending_fold(msgs, None, token_budget=100000) == []
+        pending = pending_fold(msgs, msgs[29]["created_at"], token_budget=400, keep_first=2, keep_recent=5)
+        assert [m["id"] for m in pending] == [f"m{i}" for i in range(30, 55)]
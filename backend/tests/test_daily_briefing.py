@@ -39,7 +39,7 @@ async def test_daily_briefing_happy_path():
     with (
         patch("src.observer.manager.context_manager", mock_cm),
         patch("src.memory.soul.read_soul", return_value="# Soul\nName: Hero"),
-        patch("src.memory.vector_store.search_formatted", return_value="- [fact] User likes mornings"),
+        patch("src.memory.vector_store.memory_store.search_formatted", return_value="- [fact] User likes mornings"),
         patch("litellm.completion", return_value=_mock_litellm_response("Good morning, Hero! Here's your briefing...")),
         patch("src.observer.delivery.deliver_or_queue", mock_deliver),
     ):
@@ -84,7 +84,7 @@ async def test_daily_briefing_llm_failure():
     with (
         patch("src.observer.manager.context_manager", mock_cm),
         patch("src.memory.soul.read_soul", return_value="# Soul"),
-        patch("src.memory.vector_store.search_formatted", return_value=""),
+        patch("src.memory.vector_store.memory_store.search_formatted", return_value=""),
         patch("litellm.completion", side_effect=Exception("LLM API error")),
         patch("src.observer.delivery.deliver_or_queue", mock_deliver),
     ):
@@ -104,7 +104,7 @@ async def test_daily_briefing_empty_calendar_goals():
     with (
         patch("src.observer.manager.context_manager", mock_cm),
         patch("src.memory.soul.read_soul", return_value="# Soul"),
-        patch("src.memory.vector_store.search_formatted", return_value=""),
+        patch("src.memory.vector_store.memory_store.search_formatted", return_value=""),
         patch("litellm.completion", return_value=_mock_litellm_response("A quiet morning ahead.")),
         patch("src.observer.delivery.deliver_or_queue", mock_deliver),
     ):
@@ -135,7 +135,7 @@ async def test_daily_briefing_with_events():
     with (
         patch("src.observer.manager.context_manager", mock_cm),
         patch("src.memory.soul.read_soul", return_value="# Soul"),
-        patch("src.memory.vector_store.search_formatted", return_value=""),
+        patch("src.memory.vector_store.memory_store.search_formatted", return_value=""),
         patch("litellm.completion", side_effect=mock_completion),
         patch("src.observer.delivery.deliver_or_queue", mock_deliver),
     ):
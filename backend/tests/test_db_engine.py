@@ -0,0 +1,131 @@
+"""Tests for the SQLite connection profile (src/db/engine.py)."""
+
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from config.settings import settings
+from src.db.engine import create_sqlite_engine
+from src.db.models import PREVIEW_CHARS
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    return f"sqlite+aiosqlite:///{tmp_path / 'profile.db'}"
+
+
+async def _pragma(engine, name):
+    async with engine.connect() as conn:
+        return (await conn.exec_driver_sql(f"PRAGMA {name}")).scalar()
+
+
+@pytest.mark.asyncio
+async def test_writer_pragmas(db_url):
+    engine = create_sqlite_engine(db_url)
+    try:
+        assert (await _pragma(engine, "journal_mode")).lower() == "wal"
+        assert await _pragma(engine, "synchronous") == 1  # NORMAL
+        assert await _pragma(engine, "busy_timeout") == settings.sqlite_busy_timeout_ms
+        assert await _pragma(engine, "cache_size") == -settings.sqlite_cache_size_kb
+        assert await _pragma(engine, "temp_store") == 2  # MEMORY
+        assert await _pragma(engine, "query_only") == 0
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_single_writer_and_reader_pool(db_url):
+    writer = create_sqlite_engine(db_url)
+    reader = create_sqlite_engine(db_url, read_only=True)
+    try:
+        assert writer.pool.size() == 1
+        assert reader.pool.size() == settings.sqlite_reader_pool_size
+    finally:
+        await reader.dispose()
+        await writer.dispose()
+
+
+@pytest.mark.asyncio
+async def test_reader_is_read_only_and_sees_commits(db_url):
+    writer = create_sqlite_engine(db_url)
+    reader = create_sqlite_engine(db_url, read_only=True)
+    try:
+        async with writer.begin() as conn:
+            await conn.execute(text("CREATE TABLE t (x INTEGER)"))
+            await conn.execute(text("INSERT INTO t VALUES (1)"))
+
+        async with reader.connect() as conn:
+            assert (await conn.execute(text("SELECT COUNT(*) FROM t"))).scalar() == 1
+            with pytest.raises(OperationalError, match="readonly"):
+                await conn.execute(text("INSERT INTO t VALUES (2)"))
+    finally:
+        await reader.dispose()
+        await writer.dispose()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_queue_on_the_writer(db_url):
+    writer = create_sqlite_engine(db_url)
+    reader = create_sqlite_engine(db_url, read_only=True)
+    try:
+        async with writer.begin() as conn:
+            await conn.execute(text("CREATE TABLE t (x INTEGER)"))
+
+        async def write(i):
+            async with writer.begin() as conn:
+                await conn.execute(text("INSERT INTO t VALUES (:x)"), {"x": i})
+
+        async def read():
+            async with reader.connect() as conn:
+                return (await conn.execute(text("SELECT COUNT(*) FROM t"))).scalar()
+
+        results = await asyncio.gather(*(write(i) for i in range(50)), *(read() for _ in range(20)))
+        assert all(r is None or 0 <= r <= 50 for r in results)
+        assert await read() == 50
+    finally:
+        await reader.dispose()
+        await writer.dispose()
+
+
+@pytest.mark.asyncio
+async def test_init_db_backfills_session_summaries(db_url, monkeypatch):
+    import src.db.engine as db_engine
+
+    writer = create_sqlite_engine(db_url)
+    try:
+        async with writer.begin() as conn:
+            # Tables as they were before the denormalized session columns
+            await conn.execute(text(
+                "CREATE TABLE sessions (id VARCHAR PRIMARY KEY, title VARCHAR, "
+                "created_at DATETIME, updated_at DATETIME)"
+            ))
+            await conn.execute(text(
+                "CREATE TABLE messages (id VARCHAR PRIMARY KEY, session_id VARCHAR, role VARCHAR, "
+                "content VARCHAR, metadata_json VARCHAR, step_number INTEGER, tool_used VARCHAR, "
+                "created_at DATETIME)"
+            ))
+            await conn.execute(text(
+                "INSERT INTO sessions VALUES ('a', 't', '2026-01-01 00:00:00', '2026-01-01 00:00:00'), "
+                "('b', 't', '2026-01-01 00:00:00', '2026-01-01 00:00:00')"
+            ))
+            await conn.execute(text(
+                "INSERT INTO messages (id, session_id, role, content, created_at) VALUES "
+                "('m1', 'a', 'user', 'first', '2026-01-01 00:00:01'), "
+                "('m2', 'a', 'assistant', :long, '2026-01-01 00:00:02')"
+            ), {"long": "y" * 300})
+
+        monkeypatch.setattr(db_engine, "engine", writer)
+        await db_engine.init_db()
+        await db_engine.init_db()  # second run adds nothing and leaves the backfill alone
+
+        async with writer.connect() as conn:
+            rows = (await conn.execute(text(
+                "SELECT id, message_count, last_message_role, last_message_preview "
+                "FROM sessions ORDER BY id"
+            ))).all()
+    finally:
+        await writer.dispose()
+
+    assert rows == [("a", 2, "assistant", "y" * PREVIEW_CHARS), ("b", 0, None, None)]
@@ -0,0 +1,163 @@
+"""Tests for pluggable embedding backends (src/memory/embedder.py, src/memory/onnx_encoder.py)."""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from config.settings import settings
+from src.memory import embedder
+from src.memory.onnx_encoder import OnnxSentenceEncoder, mean_pool, resolve_repo_id
+
+_PARITY_SENTENCES = [
+    "My name is Alice and I work at ACME Corp as a software engineer.",
+    "daily priorities and routines",
+    "User prefers deep work in the morning and meetings after lunch.",
+    "Build an AI startup within two years",
+    "hi",
+]
+
+
+def _fake_onnx_encoder(dim: int = 384) -> OnnxSentenceEncoder:
+    """An encoder wired to a stub tokenizer and session (no onnxruntime needed)."""
+    enc = object.__new__(OnnxSentenceEncoder)
+
+    def encode_batch(texts):
+        longest = max(len(t.split()) for t in texts)
+        out = []
+        for t in texts:
+            n = len(t.split())
+            out.append(SimpleNamespace(
+                ids=list(range(1, n + 1)) + [0] * (longest - n),
+                attention_mask=[1] * n + [0] * (longest - n),
+                type_ids=[0] * longest,
+            ))
+        return out
+
+    def run(_outputs, feeds):
+        ids = feeds["input_ids"].astype(np.float32)
+        return [np.repeat(ids[..., None], dim, axis=2) + 1.0]
+
+    enc._tokenizer = SimpleNamespace(encode_batch=encode_batch)
+    enc._session = SimpleNamespace(run=run)
+    enc._input_names = {"input_ids", "attention_mask", "token_type_ids"}
+    return enc
+
+
+class TestMeanPool:
+    def test_ignores_padding_tokens(self):
+        tokens = np.array([[[1.0, 1.0], [3.0, 3.0], [100.0, 100.0]]], dtype=np.float32)
+        mask = np.array([[1, 1, 0]])
+        pooled = mean_pool(tokens, mask, normalize=False)
+        assert np.allclose(pooled, [[2.0, 2.0]])
+
+    def test_normalizes_to_unit_length(self):
+        tokens = np.random.default_rng(0).normal(size=(3, 5, 384)).astype(np.float32)
+        mask = np.ones((3, 5), dtype=np.int64)
+        pooled = mean_pool(tokens, mask, normalize=True)
+        assert pooled.shape == (3, 384)
+        assert np.allclose(np.linalg.norm(pooled, axis=1), 1.0, atol=1e-5)
+
+
+class TestOnnxSentenceEncoder:
+    def test_encode_list_returns_normalized_384_dim(self):
+        vectors = _fake_onnx_encoder().encode(["one two", "three"], normalize_embeddings=True)
+        assert vectors.shape == (2, 384)
+        assert vectors.dtype == np.float32
+        assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0, atol=1e-5)
+
+    def test_encode_single_string_returns_vector(self):
+        vector = _fake_onnx_encoder().encode("hello there")
+        assert vector.shape == (384,)
+
+    def test_repo_id_resolution(self):
+        assert resolve_repo_id("all-MiniLM-L6-v2") == "sentence-transformers/all-MiniLM-L6-v2"
+        assert resolve_repo_id("org/custom-model") == "org/custom-model"
+
+    @pytest.mark.parametrize("files, expected", [
+        ({"sentence_bert_config.json": {"max_seq_length": 128},
+          "tokenizer_config.json": {"model_max_length": 512},
+          "config.json": {"max_position_embeddings": 512}}, 128),
+        ({"tokenizer_config.json": {"model_max_length": 8192},
+          "config.json": {"max_position_embeddings": 512}}, 512),
+        ({"tokenizer_config.json": {"model_max_length": int(1e30)}}, 256),
+        ({"config.json": {"max_position_embeddings": 384}}, 384),
+        ({}, 256),
+    ])
+    def test_max_seq_length_from_model_files(self, tmp_path, files, expected):
+        import json
+
+        for name, data in files.items():
+            (tmp_path / name).write_text(json.dumps(data))
+        assert OnnxSentenceEncoder._max_seq_length(str(tmp_path)) == expected
+
+
+class TestBackendSelection:
+    def test_model_key_for_torch_is_model_name(self, monkeypatch):
+        monkeypatch.setattr(settings, "embedding_backend", "torch")
+        assert embedder.model_key() == settings.embedding_model
+
+    def test_model_key_distinguishes_onnx_variants(self, monkeypatch):
+        monkeypatch.setattr(settings, "embedding_backend", "onnx")
+        monkeypatch.setattr(settings, "embedding_onnx_quantized", False)
+        fp32 = embedder.model_key()
+        monkeypatch.setattr(settings, "embedding_onnx_quantized", True)
+        int8 = embedder.model_key()
+        assert fp32 != int8
+        assert fp32 != settings.embedding_model
+
+    def test_unknown_backend_falls_back_to_torch(self, monkeypatch):
+        monkeypatch.setattr(settings, "embedding_backend", "tpu")
+        assert embedder.model_key() == settings.embedding_model
+
+    def test_onnx_backend_loads_onnx_encoder(self, monkeypatch):
+        monkeypatch.setattr(settings, "embedding_backend", "onnx")
+        monkeypatch.setattr(settings, "embedding_onnx_quantized", True)
+        with patch("src.memory.onnx_encoder.OnnxSentenceEncoder") as mock_cls:
+            embedder._load_model()
+        mock_cls.assert_called_once_with(settings.embedding_model, quantized=True)
+
+    def test_embed_batch_works_with_onnx_encoder(self, monkeypatch, tmp_path):
+        from src.memory.embedding_cache import EmbeddingCache
+
+        monkeypatch.setattr(settings, "embedding_backend", "onnx")
+        cache = EmbeddingCache(path=str(tmp_path / "c.sqlite"))
+        with patch.object(embedder, "embedding_cache", cache), \
+             patch.object(embedder, "_get_model", return_value=_fake_onnx_encoder()):
+            vectors = embedder.embed_batch(["alpha beta", "gamma"])
+        cache.close()
+        assert len(vectors) == 2
+        assert all(len(v) == 384 for v in vectors)
+
+
+class TestTorchOnnxParity:
+    """Cosine agreement between the torch and ONNX backends on real models.
+
+    Skipped unless sentence-transformers and onnxruntime are installed and the
+    model files can be loaded (cached locally or downloadable).
+    """
+
+    @staticmethod
+    def _load_or_skip(factory):
+        try:
+            return factory()
+        except Exception as exc:  # pragma: no cover - depends on network/cache
+            pytest.skip(f"embedding model unavailable: {exc}")
+
+    @pytest.mark.parametrize("quantized,min_cosine", [(False, 0.999), (True, 0.95)])
+    def test_cosine_agreement(self, quantized, min_cosine):
+        st = pytest.importorskip("sentence_transformers")
+        pytest.importorskip("onnxruntime")
+
+        torch_model = self._load_or_skip(lambda: st.SentenceTransformer(settings.embedding_model))
+        onnx_model = self._load_or_skip(
+            lambda: OnnxSentenceEncoder(settings.embedding_model, quantized=quantized)
+        )
+
+        reference = torch_model.encode(_PARITY_SENTENCES, normalize_embeddings=True)
+        candidate = onnx_model.encode(_PARITY_SENTENCES, normalize_embeddings=True)
+
+        assert candidate.shape == reference.shape == (len(_PARITY_SENTENCES), 384)
+        cosines = (reference * candidate).sum(axis=1)
+        assert cosines.min() >= min_cosine
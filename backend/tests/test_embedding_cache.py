@@ -0,0 +1,141 @@
+"""Tests for the persistent embedding cache (src/memory/embedding_cache.py)."""
+
+import os
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from config.settings import settings
+from src.memory import embedder
+from src.memory.embedding_cache import EmbeddingCache, normalize_text, text_hash
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = EmbeddingCache(path=os.path.join(str(tmp_path), "cache.sqlite"))
+    yield c
+    c.close()
+
+
+def _fake_model():
+    """Model stub whose vectors encode the text length."""
+    model = MagicMock()
+    model.encode.side_effect = lambda texts, normalize_embeddings=True: np.array(
+        [[float(len(t)), 0.5] for t in texts], dtype=np.float32,
+    )
+    return model
+
+
+class TestKeys:
+    def test_normalize_collapses_whitespace(self):
+        assert normalize_text("  daily   priorities\nand routines ") == "daily priorities and routines"
+
+    def test_hash_ignores_whitespace_differences(self):
+        assert text_hash("a  b") == text_hash(" a b ")
+        assert text_hash("a b") != text_hash("a c")
+
+
+class TestEmbeddingCache:
+    def test_miss_then_hit(self, cache):
+        assert cache.get_many("m", ["hello"]) == [None]
+        cache.put_many("m", ["hello"], [[1.0, 2.0]])
+        assert cache.get_many("m", ["hello"]) == [[1.0, 2.0]]
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_model_name_is_part_of_key(self, cache):
+        cache.put_many("model-a", ["hello"], [[1.0]])
+        assert cache.get_many("model-b", ["hello"]) == [None]
+
+    def test_returned_vectors_are_copies(self, cache):
+        stored = [1.0, 2.0]
+        cache.put_many("m", ["hello", "hola"], [stored, [3.0, 4.0]])
+        stored[0] = 99.0
+        first, _ = cache.get_many("m", ["hello", "hello"])
+        first[1] = -1.0
+        assert cache.get_many("m", ["hello", "hello"]) == [[1.0, 2.0], [1.0, 2.0]]
+
+    def test_persists_across_instances(self, tmp_path):
+        path = os.path.join(str(tmp_path), "cache.sqlite")
+        first = EmbeddingCache(path=path)
+        first.put_many("m", ["persist me"], [[0.25, 0.75]])
+        first.close()
+
+        second = EmbeddingCache(path=path)
+        assert second.get_many("m", ["persist me"]) == [[0.25, 0.75]]
+        assert second.stats()["disk_hits"] == 1
+        second.close()
+
+    def test_memory_tier_is_bounded(self, tmp_path):
+        c = EmbeddingCache(path=os.path.join(str(tmp_path), "c.sqlite"), max_memory_items=2)
+        c.put_many("m", ["a", "b", "c"], [[1.0], [2.0], [3.0]])
+        assert c.stats()["memory_items"] == 2
+        # Evicted from memory but still served from disk
+        assert c.get_many("m", ["a"]) == [[1.0]]
+        c.close()
+
+    def test_disk_tier_evicts_least_recently_used(self, tmp_path):
+        # Each 4-dim float32 vector is 16 bytes; allow roughly three of them
+        c = EmbeddingCache(
+            path=os.path.join(str(tmp_path), "c.sqlite"), max_memory_items=1, max_bytes=50,
+        )
+        for i in range(6):
+            c.put_many("m", [f"text {i}"], [[float(i)] * 4])
+        assert c.stats()["disk_bytes"] <= 50
+        assert c.get_many("m", ["text 0"]) == [None]
+        assert c.get_many("m", ["text 5"]) == [[5.0] * 4]
+        c.close()
+
+    def test_disabled_cache_is_passthrough(self, cache, monkeypatch):
+        monkeypatch.setattr(settings, "embedding_cache_enabled", False)
+        cache.put_many("m", ["x"], [[1.0]])
+        assert cache.get_many("m", ["x"]) == [None]
+
+    def test_clear(self, cache):
+        cache.put_many("m", ["x"], [[1.0]])
+        cache.clear()
+        assert cache.get_many("m", ["x"]) == [None]
+
+
+class TestEmbedderUsesCache:
+    def test_embed_batch_only_encodes_misses(self, cache):
+        model = _fake_model()
+        with patch.object(embedder, "embedding_cache", cache), \
+             patch.object(embedder, "_get_model", return_value=model):
+            embedder.embed_batch(["alpha", "beta"])
+            vectors = embedder.embed_batch(["alpha", "gamma!", "beta"])
+
+        assert vectors == [[5.0, 0.5], [6.0, 0.5], [4.0, 0.5]]
+        assert model.encode.call_count == 2
+        assert model.encode.call_args_list[1].args[0] == ["gamma!"]
+
+    def test_embed_reuses_cached_query(self, cache):
+        model = _fake_model()
+        with patch.object(embedder, "embedding_cache", cache), \
+             patch.object(embedder, "_get_model", return_value=model):
+            first = embedder.embed("daily priorities and routines")
+            second = embedder.embed("daily  priorities and routines")
+
+        assert first == second
+        model.encode.assert_called_once()
+
+    def test_duplicate_texts_encoded_once(self, cache):
+        model = _fake_model()
+        with patch.object(embedder, "embedding_cache", cache), \
+             patch.object(embedder, "_get_model", return_value=model):
+            vectors = embedder.embed_batch(["same", "same", "other"])
+
+        assert vectors[0] == vectors[1]
+        assert model.encode.call_args.args[0] == ["same", "other"]
+
+    def test_changing_model_setting_bypasses_old_vectors(self, cache, monkeypatch):
+        model = _fake_model()
+        with patch.object(embedder, "embedding_cache", cache), \
+             patch.object(embedder, "_get_model", return_value=model):
+            embedder.embed("hello")
+            monkeypatch.setattr(settings, "embedding_model", "another-model")
+            embedder.embed("hello")
+
+        assert model.encode.call_count == 2
@@ -0,0 +1,127 @@
+"""Tests for the coalescing embedding service (src/memory/embedding_service.py)."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.memory.embedding_service import EmbeddingService
+
+
+class _RecordingEncoder:
+    """Fake encoder that records each batch it receives."""
+
+    def __init__(self):
+        self.batches: list[list[str]] = []
+
+    def __call__(self, texts: list[str]) -> list[list[float]]:
+        self.batches.append(list(texts))
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+class TestEmbed:
+    def test_single_call_returns_own_vector(self):
+        encoder = _RecordingEncoder()
+        svc = EmbeddingService(max_batch_size=8, max_wait_ms=1, encode_fn=encoder)
+        assert svc.embed("hello") == [5.0, 1.0]
+        assert encoder.batches == [["hello"]]
+
+    def test_embed_many_preserves_order(self):
+        encoder = _RecordingEncoder()
+        svc = EmbeddingService(max_batch_size=8, max_wait_ms=50, encode_fn=encoder)
+        vectors = svc.embed_many(["a", "bbb", "cc"])
+        assert vectors == [[1.0, 1.0], [3.0, 1.0], [2.0, 1.0]]
+        assert encoder.batches == [["a", "bbb", "cc"]]
+
+    def test_concurrent_callers_share_one_encode(self):
+        encoder = _RecordingEncoder()
+        svc = EmbeddingService(max_batch_size=16, max_wait_ms=200, encode_fn=encoder)
+        texts = [f"text-{i:02d}" + "x" * i for i in range(10)]
+
+        with ThreadPoolExecutor(max_workers=10) as pool:
+            results = list(pool.map(svc.embed, texts))
+
+        assert results == [[float(len(t)), 1.0] for t in texts]
+        assert len(encoder.batches) < len(texts)
+        assert sorted(t for b in encoder.batches for t in b) == sorted(texts)
+
+    def test_respects_max_batch_size(self):
+        encoder = _RecordingEncoder()
+        svc = EmbeddingService(max_batch_size=3, max_wait_ms=50, encode_fn=encoder)
+        svc.embed_many([str(i) for i in range(7)])
+        assert all(len(b) <= 3 for b in encoder.batches)
+        assert sum(len(b) for b in encoder.batches) == 7
+
+    def test_encoder_failure_propagates_to_every_caller(self):
+        def boom(texts):
+            raise RuntimeError("model crashed")
+
+        svc = EmbeddingService(max_batch_size=4, max_wait_ms=20, encode_fn=boom)
+        with pytest.raises(RuntimeError, match="model crashed"):
+            svc.embed_many(["a", "b"])
+        assert svc.stats()["failed_batches"] >= 1
+
+    def test_worker_survives_failure(self):
+        calls = {"n": 0}
+
+        def flaky(texts):
+            calls["n"] += 1
+            if calls["n"] == 1:
+                raise RuntimeError("first call fails")
+            return [[0.0] for _ in texts]
+
+        svc = EmbeddingService(max_batch_size=4, max_wait_ms=1, encode_fn=flaky)
+        with pytest.raises(RuntimeError):
+            svc.embed("a")
+        assert svc.embed("b") == [0.0]
+
+
+class TestAsyncEmbed:
+    async def test_aembed_returns_own_vector(self):
+        encoder = _RecordingEncoder()
+        svc = EmbeddingService(max_batch_size=8, max_wait_ms=1, encode_fn=encoder)
+        assert await svc.aembed("hello") == [5.0, 1.0]
+
+    async def test_aembed_many_shares_one_encode(self):
+        encoder = _RecordingEncoder()
+        svc = EmbeddingService(max_batch_size=8, max_wait_ms=50, encode_fn=encoder)
+        vectors = await svc.aembed_many(["a", "bbb", "cc"])
+        assert vectors == [[1.0, 1.0], [3.0, 1.0], [2.0, 1.0]]
+        assert encoder.batches == [["a", "bbb", "cc"]]
+
+    async def test_aembed_failure_raises(self):
+        def boom(texts):
+            raise RuntimeError("model crashed")
+
+        svc = EmbeddingService(max_batch_size=4, max_wait_ms=1, encode_fn=boom)
+        with pytest.raises(RuntimeError, match="model crashed"):
+            await svc.aembed("a")
+
+
+class TestStats:
+    def test_counters_track_batches_and_latency(self):
+        encoder = _RecordingEncoder()
+        svc = EmbeddingService(max_batch_size=8, max_wait_ms=20, encode_fn=encoder)
+        svc.embed_many(["one", "two", "three", "four"])
+
+        stats = svc.stats()
+        assert stats["items"] == 4
+        assert stats["batches"] == len(encoder.batches)
+        assert stats["max_batch_size"] == max(len(b) for b in encoder.batches)
+        assert stats["avg_batch_size"] > 0
+        assert stats["max_latency_ms"] >= stats["avg_latency_ms"] >= 0
+
+    def test_reset_stats(self):
+        svc = EmbeddingService(max_batch_size=2, max_wait_ms=1, encode_fn=_RecordingEncoder())
+        svc.embed("x")
+        svc.reset_stats()
+        assert svc.stats()["items"] == 0
+        assert svc.stats()["batches"] == 0
+
+    def test_defaults_read_from_settings(self, monkeypatch):
+        from config.settings import settings
+
+        monkeypatch.setattr(settings, "embedding_batch_max_size", 12)
+        monkeypatch.setattr(settings, "embedding_batch_max_wait_ms", 7.5)
+        svc = EmbeddingService(encode_fn=_RecordingEncoder())
+        assert svc.max_batch_size == 12
+        assert svc.max_wait_ms == 7.5
@@ -45,6 +45,7 @@ async def test_evening_review_happy_path():
         patch("src.memory.soul.read_soul", return_value="# Soul\nName: Hero"),
         patch("src.scheduler.jobs.evening_review._count_messages_today", AsyncMock(return_value=15)),
         patch("src.scheduler.jobs.evening_review._get_completed_goals_today", AsyncMock(return_value=["Exercise"])),
+        patch("src.memory.vector_store.memory_store.search_formatted", AsyncMock(return_value="")),
         patch("litellm.completion", return_value=_mock_litellm_response("Great day, Hero! You completed Exercise.")),
         patch("src.observer.delivery.deliver_or_queue", mock_deliver),
     ):
@@ -79,6 +80,7 @@ async def test_evening_review_no_completed_goals():
         patch("src.memory.soul.read_soul", return_value="# Soul"),
         patch("src.scheduler.jobs.evening_review._count_messages_today", AsyncMock(return_value=5)),
         patch("src.scheduler.jobs.evening_review._get_completed_goals_today", AsyncMock(return_value=[])),
+        patch("src.memory.vector_store.memory_store.search_formatted", AsyncMock(return_value="")),
         patch("litellm.completion", side_effect=mock_completion),
         patch("src.observer.delivery.deliver_or_queue", mock_deliver),
     ):
@@ -87,6 +89,36 @@ async def test_evening_review_no_completed_goals():
         mock_deliver.assert_called_once()
         prompt_text = captured_prompt["messages"][0]["content"]
         assert "None today" in prompt_text
+        assert "Nothing new remembered today." in prompt_text
+
+
+@pytest.mark.asyncio
+async def test_evening_review_includes_todays_memories():
+    ctx = _make_context()
+    mock_cm = MagicMock()
+    mock_cm.refresh = AsyncMock(return_value=ctx)
+
+    captured_prompt = {}
+
+    def mock_completion(**kwargs):
+        captured_prompt["messages"] = kwargs.get("messages", [])
+        return _mock_litellm_response("Good work today.")
+
+    mock_search = AsyncMock(return_value="- [reflection] Decided to ship on Friday")
+
+    with (
+        patch("src.observer.manager.context_manager", mock_cm),
+        patch("src.memory.soul.read_soul", return_value="# Soul"),
+        patch("src.scheduler.jobs.evening_review._count_messages_today", AsyncMock(return_value=5)),
+        patch("src.scheduler.jobs.evening_review._get_completed_goals_today", AsyncMock(return_value=[])),
+        patch("src.memory.vector_store.memory_store.search_formatted", mock_search),
+        patch("litellm.completion", side_effect=mock_completion),
+        patch("src.observer.delivery.deliver_or_queue", AsyncMock()),
+    ):
+        await run_evening_review()
+
+    assert mock_search.call_args.kwargs["max_age_days"] == 1
+    assert "Decided to ship on Friday" in captured_prompt["messages"][0]["content"]
 
 
 @pytest.mark.asyncio
@@ -108,6 +140,7 @@ async def test_evening_review_no_messages_today():
         patch("src.memory.soul.read_soul", return_value="# Soul"),
         patch("src.scheduler.jobs.evening_review._count_messages_today", AsyncMock(return_value=0)),
         patch("src.scheduler.jobs.evening_review._get_completed_goals_today", AsyncMock(return_value=[])),
+        patch("src.memory.vector_store.memory_store.search_formatted", AsyncMock(return_value="")),
         patch("litellm.completion", side_effect=mock_completion),
         patch("src.observer.delivery.deliver_or_queue", mock_deliver),
     ):
@@ -148,6 +181,7 @@ async def test_evening_review_llm_failure():
         patch("src.memory.soul.read_soul", return_value="# Soul"),
         patch("src.scheduler.jobs.evening_review._count_messages_today", AsyncMock(return_value=0)),
         patch("src.scheduler.jobs.evening_review._get_completed_goals_today", AsyncMock(return_value=[])),
+        patch("src.memory.vector_store.memory_store.search_formatted", AsyncMock(return_value="")),
         patch("litellm.completion", side_effect=Exception("LLM down")),
         patch("src.observer.delivery.deliver_or_queue", mock_deliver),
     ):
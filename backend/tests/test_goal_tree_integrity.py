@@ -117,6 +117,20 @@ class TestCascadeDeletion:
         assert await repo.get(parent.id) is not None
         assert await repo.get(child.id) is None
 
+    async def test_delete_nonexistent_returns_false(self, async_db, repo):
+        await repo.create("Keep", level="vision")
+        assert await repo.delete("missing") is False
+        assert len(await repo.list_goals()) == 1
+
+    async def test_delete_leaves_other_trees_alone(self, async_db, repo):
+        a = await repo.create("A", level="vision")
+        await repo.create("A child", level="annual", parent_id=a.id)
+        b = await repo.create("B", level="vision")
+        b_child = await repo.create("B child", level="annual", parent_id=b.id)
+
+        assert await repo.delete(a.id) is True
+        assert {g.id for g in await repo.list_goals()} == {b.id, b_child.id}
+
 
 class TestTreeStructure:
     async def test_multiple_roots(self, async_db, repo):
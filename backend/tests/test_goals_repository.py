@@ -39,6 +39,15 @@ class TestCreate:
         g2 = await repo.create("Second")
         assert g2.sort_order == 1
 
+    async def test_sort_order_is_per_parent_and_follows_last_sibling(self, async_db, repo):
+        parent = await repo.create("Parent", level="vision")
+        a = await repo.create("A", parent_id=parent.id)
+        b = await repo.create("B", parent_id=parent.id)
+        assert (a.sort_order, b.sort_order) == (0, 1)
+        await repo.delete(a.id)
+        c = await repo.create("C", parent_id=parent.id)
+        assert c.sort_order == 2  # no collision with B after A was removed
+
 
 class TestGet:
     async def test_existing(self, async_db, repo):
@@ -138,3 +147,16 @@ class TestGetDashboard:
         assert dashboard["domains"]["health"]["active"] == 1
         assert dashboard["domains"]["health"]["completed"] == 1
         assert dashboard["domains"]["health"]["progress"] == 50
+
+    async def test_counts_across_domains_and_statuses(self, async_db, repo):
+        await repo.create("A", domain="health")
+        paused = await repo.create("B", domain="health")
+        await repo.update(paused.id, status="paused")
+        done = await repo.create("C", domain="growth")
+        await repo.update(done.id, status="completed")
+        dashboard = await repo.get_dashboard()
+        assert dashboard["total_count"] == 3
+        assert dashboard["active_count"] == 1
+        assert dashboard["completed_count"] == 1
+        assert dashboard["domains"]["health"] == {"active": 1, "completed": 0, "total": 2, "progress": 0}
+        assert dashboard["domains"]["growth"] == {"active": 0, "completed": 1, "total": 1, "progress": 100}
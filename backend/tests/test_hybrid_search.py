@@ -0,0 +1,122 @@
+"""Tests for hybrid BM25 + vector memory retrieval (src/memory/vector_store.py)."""
+
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+
+import src.memory.vector_store as vs
+from config.settings import settings
+
+
+_MEMORIES = [
+    ("User holds NVDA and TSLA in their brokerage account", "fact"),
+    ("Project Orion ships its beta at the end of March", "goal"),
+    ("Alice from ACME is the user's main design contact", "fact"),
+    ("User prefers deep work blocks before lunch", "preference"),
+    ("User tends to skip workouts on busy Mondays", "pattern"),
+    ("Weekly planning happens on Sunday evenings", "pattern"),
+]
+
+
+@pytest_asyncio.fixture
+async def memories(memory_table, memory_row, fake_vector):
+    await memory_table.add([
+        memory_row(f"m{i}", fake_vector(text), text=text, category=category)
+        for i, (text, category) in enumerate(_MEMORIES)
+    ])
+
+    await vs.memory_store.maintain_index()
+
+    async def aembed_many(texts):
+        return [fake_vector(t) for t in texts]
+
+    with patch.object(vs.embedding_service, "aembed_many", side_effect=aembed_many):
+        yield memory_table
+
+
+class TestRRFFuse:
+    def test_rows_in_both_lists_rank_first(self):
+        row = lambda i: {"id": i, "text": i, "category": "fact", "created_at": ""}  # noqa: E731
+        vector = [dict(row("a"), _distance=0.1), dict(row("b"), _distance=0.2)]
+        lexical = [dict(row("b"), _score=3.0), dict(row("c"), _score=1.0)]
+
+        fused = vs._rrf_fuse(vector, lexical, top_k=3)
+        assert [r["id"] for r in fused] == ["b", "a", "c"]
+        assert fused[0]["vector_score"] == 0.2
+        assert fused[0]["lexical_score"] == 3.0
+        assert fused[1]["lexical_score"] is None
+        assert fused[2]["vector_score"] is None
+
+    def test_truncates_to_top_k(self):
+        rows = [{"id": str(i), "text": "", "category": "fact", "created_at": "", "_distance": i} for i in range(10)]
+        assert len(vs._rrf_fuse(rows, [], top_k=3)) == 3
+
+
+class TestHybridSearch:
+    async def test_exact_term_found_by_hybrid(self, memories):
+        results = await vs.memory_store.search("NVDA", top_k=1, mode="hybrid")
+        assert results[0]["id"] == "m0"
+        assert results[0]["lexical_score"] is not None
+
+    async def test_result_shape_includes_signal_scores(self, memories):
+        results = await vs.memory_store.search("Project Orion beta", top_k=3, mode="hybrid")
+        assert results
+        for r in results:
+            assert {"id", "text", "category", "score", "created_at", "vector_score", "lexical_score"} <= set(r)
+        scores = [r["score"] for r in results]
+        assert scores == sorted(scores, reverse=True)
+
+    async def test_category_filter_applies_to_both_signals(self, memories):
+        results = await vs.memory_store.search("Orion", top_k=5, category_filter="fact", mode="hybrid")
+        assert all(r["category"] == "fact" for r in results)
+        assert "m1" not in {r["id"] for r in results}
+
+    async def test_vector_mode_unchanged(self, memories):
+        results = await vs.memory_store.search("NVDA", top_k=2, mode="vector")
+        assert set(results[0]) == {"id", "text", "category", "score", "created_at"}
+
+    async def test_unknown_mode_falls_back_to_vector(self, memories):
+        results = await vs.memory_store.search("NVDA", top_k=2, mode="telepathy")
+        assert len(results) == 2
+        assert "lexical_score" not in results[0]
+
+    async def test_default_mode_from_settings(self, memories, monkeypatch):
+        monkeypatch.setattr(settings, "memory_search_mode", "hybrid")
+        results = await vs.memory_store.search("ACME", top_k=1)
+        assert results[0]["id"] == "m2"
+
+    async def test_lexical_failure_degrades_to_vector(self, memories):
+        with patch.object(vs.memory_store, "_lexical_rows", side_effect=RuntimeError("fts broken")):
+            results = await vs.memory_store.search("NVDA", top_k=2, mode="hybrid")
+        assert len(results) == 2
+        assert all(r["lexical_score"] is None for r in results)
+
+    async def test_search_formatted_passes_mode(self, memories):
+        text = await vs.memory_store.search_formatted("Orion", top_k=1, mode="hybrid")
+        assert text == "- [goal] Project Orion ships its beta at the end of March"
+
+
+class TestFtsMaintenance:
+    async def test_maintain_index_creates_fts_index(self, memories):
+        assert await vs._fts_index(memories) is not None
+
+    async def test_search_without_index_is_vector_only(self, memory_table, memory_row, fake_vector):
+        text = "Portfolio holds NVDA shares"
+        await memory_table.add([memory_row("m0", fake_vector(text), text=text)])
+        with patch.object(vs.embedding_service, "aembed_many", return_value=[fake_vector("NVDA")]), \
+             patch.object(vs.memory_store, "_lexical_rows") as lexical:
+            results = await vs.memory_store.search("NVDA", top_k=1, mode="hybrid")
+        lexical.assert_not_called()
+        assert results[0]["id"] == "m0"
+        assert "lexical_score" not in results[0]
+        assert await vs._fts_index(memory_table) is None
+
+    async def test_index_built_later_enables_hybrid(self, memory_table, memory_row, fake_vector):
+        text = "Portfolio holds NVDA shares"
+        await memory_table.add([memory_row("m0", fake_vector(text), text=text)])
+        with patch.object(vs.embedding_service, "aembed_many", return_value=[fake_vector("NVDA")]):
+            await vs.memory_store.search("NVDA", top_k=1, mode="hybrid")
+            await vs.memory_store.maintain_index()
+            results = await vs.memory_store.search("NVDA", top_k=1, mode="hybrid")
+        assert results[0]["lexical_score"] is not None
@@ -135,3 +135,13 @@ async def test_drain_cleans_expired(queue, async_db):
     await queue.drain()
     # Even the expired row should be gone
     assert await queue.count() == 0
+
+
+@pytest.mark.asyncio
+async def test_drained_items_keep_their_fields(queue):
+    """Rows returned by the bulk delete are fully loaded."""
+    queued = await queue.enqueue("Check in", "nudge", 4, "idle for an hour")
+    items = await queue.drain()
+    assert [(i.id, i.content, i.intervention_type, i.urgency, i.reasoning) for i in items] == [
+        (queued.id, "Check in", "nudge", 4, "idle for an hour"),
+    ]
@@ -150,6 +150,68 @@ class TestFailureEvent:
         assert "rate limited" in e["error"]
 
 
+class TestCacheTokens:
+    def _response(self, usage):
+        resp = _make_response()
+        resp.usage = usage
+        return resp
+
+    def test_openai_style_cached_tokens(self, log_dir):
+        """prompt_tokens_details.cached_tokens is logged as cache hits."""
+        usage = {"prompt_tokens": 100, "prompt_tokens_details": {"cached_tokens": 80}}
+        with patch("src.llm_logger.settings", _make_settings(log_dir)):
+            from src.llm_logger import SeraphLLMLogger
+
+            lg = SeraphLLMLogger()
+            lg.log_success_event(
+                _make_kwargs(), self._response(usage),
+                datetime.now(timezone.utc), datetime.now(timezone.utc),
+            )
+
+        e = _read_log(log_dir)[0]
+        assert e["tokens"]["cached"] == 80
+        assert e["tokens"]["cache_write"] == 0
+
+    def test_anthropic_style_and_running_stats(self, log_dir):
+        """Anthropic read/write counts are logged and accumulated."""
+        with patch("src.llm_logger.settings", _make_settings(log_dir)):
+            from src.llm_logger import SeraphLLMLogger
+
+            lg = SeraphLLMLogger()
+            now = datetime.now(timezone.utc)
+            lg.log_success_event(
+                _make_kwargs(), self._response({"cache_creation_input_tokens": 90}), now, now,
+            )
+            lg.log_success_event(
+                _make_kwargs(), self._response({"cache_read_input_tokens": 90}), now, now,
+            )
+
+        first, second = _read_log(log_dir)
+        assert first["tokens"]["cache_write"] == 90 and first["tokens"]["cached"] == 0
+        assert second["tokens"]["cached"] == 90
+        stats = lg.cache_stats()
+        assert stats["calls"] == 2
+        assert stats["prompt_tokens"] == 200
+        assert stats["cached_tokens"] == 90
+        assert stats["cache_write_tokens"] == 90
+        assert stats["hit_rate"] == 0.45
+
+    def test_mock_usage_counts_as_zero(self, log_dir):
+        """Non-integer usage fields (e.g. missing attributes) are ignored."""
+        with patch("src.llm_logger.settings", _make_settings(log_dir)):
+            from src.llm_logger import SeraphLLMLogger
+
+            lg = SeraphLLMLogger()
+            lg.log_success_event(
+                _make_kwargs(), _make_response(),
+                datetime.now(timezone.utc), datetime.now(timezone.utc),
+            )
+
+        e = _read_log(log_dir)[0]
+        assert e["tokens"]["cached"] == 0
+        assert e["tokens"]["cache_write"] == 0
+
+
 class TestErrorSafety:
     def test_malformed_data_does_not_raise(self, log_dir):
         """Callback never raises even with broken data."""
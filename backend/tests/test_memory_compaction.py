@@ -0,0 +1,102 @@
+"""Tests for LanceDB compaction and version pruning of the memories table."""
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+import src.memory.vector_store as vs
+
+
+@pytest.fixture
+def add_one_by_one(memory_row):
+    async def _add_one_by_one(table, n: int) -> np.ndarray:
+        vectors = np.random.default_rng(0).normal(size=(n, 384)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        for i, vec in enumerate(vectors):
+            await table.add([memory_row(f"m{i}", vec)])
+        return vectors
+
+    return _add_one_by_one
+
+
+class TestCompactTable:
+    async def test_merges_small_fragments(self, memory_table, add_one_by_one):
+        await add_one_by_one(memory_table, 25)
+        report = await vs.memory_store.compact()
+
+        assert report["before"]["fragments"] == 25
+        assert report["after"]["fragments"] == 1
+        assert await memory_table.count_rows() == 25
+
+    async def test_default_retention_keeps_recent_versions(self, memory_table, add_one_by_one):
+        await add_one_by_one(memory_table, 5)
+        report = await vs.memory_store.compact()
+        assert report["after"]["versions"] >= report["before"]["versions"]
+
+    async def test_retention_has_a_floor(self, memory_table, add_one_by_one):
+        await add_one_by_one(memory_table, 5)
+        report = await vs.memory_store.compact(retention=timedelta(0))
+        assert report["after"]["versions"] >= report["before"]["versions"]
+
+    async def test_prunes_expired_versions_and_reports_bytes(self, memory_table, add_one_by_one, monkeypatch):
+        monkeypatch.setattr(vs, "_MIN_VERSION_RETENTION", timedelta(0))
+        await add_one_by_one(memory_table, 20)
+        with pytest.warns(UserWarning):
+            report = await vs.memory_store.compact(retention=timedelta(0))
+
+        assert report["after"]["versions"] == 1
+        assert report["after"]["disk_bytes"] < report["before"]["disk_bytes"]
+        assert report["bytes_reclaimed"] == report["before"]["disk_bytes"] - report["after"]["disk_bytes"]
+
+    async def test_searches_during_compaction_succeed(self, memory_table, add_one_by_one):
+        vectors = await add_one_by_one(memory_table, 40)
+        found: list[str] = []
+        done = asyncio.Event()
+
+        async def search_loop():
+            while not done.is_set():
+                rows = await memory_table.vector_search(vectors[7].tolist()).limit(1).to_list()
+                found.append(rows[0]["id"])
+                await asyncio.sleep(0)
+
+        async def compact():
+            try:
+                await vs.memory_store.compact()
+            finally:
+                done.set()
+
+        await asyncio.gather(compact(), *(search_loop() for _ in range(3)))
+        assert found and set(found) == {"m7"}
+
+    async def test_holds_maintenance_lock(self, memory_table, add_one_by_one):
+        await add_one_by_one(memory_table, 2)
+        lock = vs.memory_store._maintenance_lock
+        await lock.acquire()
+        task = asyncio.create_task(vs.memory_store.compact())
+        await asyncio.sleep(0.05)
+        assert not task.done()
+        lock.release()
+        await task
+
+
+class TestMemoryCompactionJob:
+    async def test_job_runs_compaction(self):
+        from src.scheduler.jobs.memory_compaction import run_memory_compaction
+
+        report = {
+            "before": {"fragments": 40, "small_fragments": 40, "versions": 41, "disk_bytes": 9000},
+            "after": {"fragments": 1, "small_fragments": 1, "versions": 2, "disk_bytes": 3000},
+            "bytes_reclaimed": 6000,
+        }
+        with patch.object(vs.memory_store, "compact", return_value=report) as mock_compact:
+            await run_memory_compaction()
+            mock_compact.assert_called_once()
+
+    async def test_job_swallows_errors(self):
+        from src.scheduler.jobs.memory_compaction import run_memory_compaction
+
+        with patch.object(vs.memory_store, "compact", side_effect=RuntimeError("disk full")):
+            await run_memory_compaction()  # should not raise
@@ -0,0 +1,122 @@
+"""Tests for prefiltered, time-aware memory search (src/memory/vector_store.py)."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+import pytest_asyncio
+
+import src.memory.vector_store as vs
+from config.settings import settings
+
+
+def _unit(v: np.ndarray) -> np.ndarray:
+    return (v / np.linalg.norm(v)).astype(np.float32)
+
+
+def _days_ago(days: float) -> str:
+    return (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+
+
+@pytest.fixture
+def query_vector():
+    return _unit(np.random.default_rng(1).normal(size=384))
+
+
+def _embed_as(vector: np.ndarray):
+    async def aembed_many(texts):
+        return [vector.tolist() for _ in texts]
+
+    return patch.object(vs.embedding_service, "aembed_many", side_effect=aembed_many)
+
+
+@pytest_asyncio.fixture
+async def table(memory_table, memory_row, query_vector):
+    """200 memories: 5% goals, ages spread over 0-199 days, all fairly close to the query."""
+    rng = np.random.default_rng(0)
+    rows = []
+    for i in range(200):
+        vec = _unit(query_vector + rng.normal(scale=0.08, size=384))
+        rows.append(memory_row(
+            f"m{i}", vec, text=f"memory number {i}",
+            category="goal" if i % 20 == 0 else "fact", created_at=_days_ago(i),
+        ))
+    await memory_table.add(rows)
+    await vs.memory_store.maintain_index()
+    with _embed_as(query_vector):
+        yield memory_table
+
+
+class TestBuildWhere:
+    def test_no_filters(self):
+        assert vs._build_where(None, None) is None
+
+    def test_category_and_age(self):
+        where = vs._build_where("goal", 7)
+        assert where.startswith("category = 'goal' AND created_at >= '")
+
+    def test_non_positive_age_ignored(self):
+        assert vs._build_where(None, 0) is None
+
+
+class TestPrefilter:
+    async def test_rare_category_still_fills_top_k(self, table):
+        results = await vs.memory_store.search("anything", top_k=5, category_filter="goal")
+        assert len(results) == 5
+        assert all(r["category"] == "goal" for r in results)
+
+    async def test_max_age_days(self, table):
+        results = await vs.memory_store.search("anything", top_k=50, max_age_days=7.5)
+        assert {r["id"] for r in results} == {f"m{i}" for i in range(8)}
+
+    async def test_age_and_category_combined(self, table):
+        results = await vs.memory_store.search("anything", top_k=10, category_filter="goal", max_age_days=45)
+        assert {r["id"] for r in results} == {"m0", "m20", "m40"}
+
+    async def test_hybrid_respects_age(self, table):
+        results = await vs.memory_store.search("memory number", top_k=20, mode="hybrid", max_age_days=3.5)
+        assert {r["id"] for r in results} == {"m0", "m1", "m2", "m3"}
+
+    async def test_maintain_index_builds_scalar_indexes(self, table):
+        await vs.memory_store.maintain_index()
+        types = {tuple(i.columns): str(i.index_type).upper() for i in await table.list_indices()}
+        assert types[("category",)] == "BITMAP"
+        assert types[("created_at",)] == "BTREE"
+        assert len(await vs.memory_store.search("anything", top_k=5, category_filter="goal")) == 5
+
+
+class TestRecencyBlend:
+    @pytest_asyncio.fixture
+    async def pair(self, memory_table, memory_row, query_vector):
+        """An old exact match and a fresh near-match."""
+        near = _unit(query_vector + np.random.default_rng(2).normal(scale=0.02, size=384))
+        await memory_table.add([
+            memory_row("old", query_vector, text="old exact", created_at=_days_ago(365)),
+            memory_row("new", near, text="fresh near", created_at=_days_ago(0)),
+        ])
+        await vs.memory_store.maintain_index()
+        with _embed_as(query_vector):
+            yield
+
+    async def test_pure_relevance_by_default(self, pair):
+        results = await vs.memory_store.search("q", top_k=2)
+        assert [r["id"] for r in results] == ["old", "new"]
+        assert "blended_score" not in results[0]
+
+    async def test_recency_weight_promotes_fresh_memory(self, pair):
+        results = await vs.memory_store.search("q", top_k=2, recency_weight=0.5)
+        assert [r["id"] for r in results] == ["new", "old"]
+        assert results[0]["recency_score"] == pytest.approx(1.0, abs=1e-3)
+        assert results[1]["recency_score"] < 0.01
+        assert results[0]["blended_score"] > results[1]["blended_score"]
+
+    async def test_half_life_setting(self, pair, monkeypatch):
+        monkeypatch.setattr(settings, "memory_recency_half_life_days", 365.0)
+        results = await vs.memory_store.search("q", top_k=2, recency_weight=0.5)
+        old = next(r for r in results if r["id"] == "old")
+        assert old["recency_score"] == pytest.approx(0.5, abs=0.01)
+
+    async def test_recency_blend_in_hybrid_mode(self, pair):
+        results = await vs.memory_store.search("fresh", top_k=2, mode="hybrid", recency_weight=0.5)
+        assert results[0]["id"] == "new"
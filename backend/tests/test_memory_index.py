@@ -0,0 +1,88 @@
+"""Tests for ANN index lifecycle on the LanceDB memories table."""
+
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+import src.memory.vector_store as vs
+from config.settings import settings
+
+
+def _unit_vectors(n: int, seed: int = 0) -> np.ndarray:
+    v = np.random.default_rng(seed).normal(size=(n, 384)).astype(np.float32)
+    return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+
+@pytest.fixture
+def insert(memory_row):
+    async def _insert(table, vectors: np.ndarray, offset: int = 0) -> None:
+        await table.add([memory_row(f"m{offset + i}", vec) for i, vec in enumerate(vectors)])
+
+    return _insert
+
+
+class TestMaintainIndex:
+    async def test_no_index_below_threshold(self, memory_table, insert, monkeypatch):
+        monkeypatch.setattr(settings, "memory_index_min_rows", 1000)
+        await insert(memory_table, _unit_vectors(50))
+
+        report = await vs.memory_store.maintain_index()
+        assert report == {"action": "none", "rows": 50, "unindexed_rows": 0}
+        assert await vs._vector_index(memory_table) is None
+
+    async def test_creates_index_past_threshold(self, memory_table, insert, monkeypatch):
+        monkeypatch.setattr(settings, "memory_index_min_rows", 300)
+        await insert(memory_table, _unit_vectors(300))
+
+        report = await vs.memory_store.maintain_index()
+        assert report["action"] == "created"
+        assert await vs._vector_index(memory_table) is not None
+
+    async def test_leaves_new_rows_to_compaction(self, memory_table, insert, monkeypatch):
+        monkeypatch.setattr(settings, "memory_index_min_rows", 300)
+        table = memory_table
+        await insert(table, _unit_vectors(300))
+        await vs.memory_store.maintain_index()
+
+        await insert(table, _unit_vectors(20, seed=1), offset=300)
+        with patch.object(table, "optimize", wraps=table.optimize) as optimize:
+            report = await vs.memory_store.maintain_index()
+        optimize.assert_not_called()
+        assert report == {"action": "none", "rows": 320, "unindexed_rows": 20}
+
+        await vs.memory_store.compact()
+        stats = await table.index_stats((await vs._vector_index(table)).name)
+        assert stats.num_unindexed_rows == 0
+
+    async def test_indexed_search_still_finds_exact_match(self, memory_table, insert, monkeypatch):
+        monkeypatch.setattr(settings, "memory_index_min_rows", 300)
+        vectors = _unit_vectors(300)
+        await insert(memory_table, vectors)
+        await vs.memory_store.maintain_index()
+
+        async def aembed_many(texts):
+            return [vectors[42].tolist() for _ in texts]
+
+        with patch.object(vs.embedding_service, "aembed_many", side_effect=aembed_many):
+            results = await vs.memory_store.search("anything", top_k=1)
+        assert results[0]["id"] == "m42"
+        assert results[0]["score"] == pytest.approx(0.0, abs=1e-4)
+
+
+class TestMemoryIndexJob:
+    async def test_job_runs_maintenance(self):
+        from src.scheduler.jobs.memory_index import run_memory_index_maintenance
+
+        with patch.object(
+            vs.memory_store, "maintain_index",
+            return_value={"action": "created", "rows": 6000, "unindexed_rows": 0},
+        ) as mock_maintain:
+            await run_memory_index_maintenance()
+            mock_maintain.assert_called_once()
+
+    async def test_job_swallows_errors(self):
+        from src.scheduler.jobs.memory_index import run_memory_index_maintenance
+
+        with patch.object(vs.memory_store, "maintain_index", side_effect=RuntimeError("disk full")):
+            await run_memory_index_maintenance()  # should not raise
@@ -0,0 +1,235 @@
+"""Tests for the memory lifecycle: access tracking, merging and archival."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pyarrow as pa
+import pytest
+
+import src.memory.vector_store as vs
+from config.settings import settings
+from src.memory import lifecycle
+from src.memory.access_tracker import AccessTracker, access_tracker
+
+
+def _unit(v) -> list[float]:
+    v = np.asarray(v, dtype=np.float32)
+    return (v / np.linalg.norm(v)).tolist()
+
+
+def _basis(i: int, noise: float = 0.0, seed: int = 0) -> list[float]:
+    v = np.zeros(384, dtype=np.float32)
+    v[i] = 1.0
+    if noise:
+        v += np.random.default_rng(seed).normal(scale=noise, size=384).astype(np.float32)
+    return _unit(v)
+
+
+def _days_ago(days: float) -> str:
+    return (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+
+
+@pytest.fixture
+def row(memory_row):
+    def _row(memory_id, vector, age_days=0.0, **columns):
+        return memory_row(memory_id, vector, created_at=_days_ago(age_days), **columns)
+
+    return _row
+
+
+async def _rows_by_id(table) -> dict[str, dict]:
+    return {r["id"]: r for r in (await table.query().to_arrow()).to_pylist()}
+
+
+@pytest.fixture(autouse=True)
+def clean_tracker():
+    access_tracker.drain()
+    yield
+    access_tracker.drain()
+
+
+class TestAccessTracker:
+    def test_counts_and_drains(self):
+        tracker = AccessTracker()
+        tracker.record(["a", "b", "a", ""])
+        pending = tracker.drain()
+        assert {k: v[0] for k, v in pending.items()} == {"a": 2, "b": 1}
+        assert tracker.drain() == {}
+
+    def test_restore_merges_counts(self):
+        tracker = AccessTracker()
+        tracker.record(["a"])
+        drained = tracker.drain()
+        tracker.record(["a"])
+        tracker.restore(drained)
+        assert tracker.drain()["a"][0] == 2
+
+    async def test_search_records_returned_ids(self, row, memory_table):
+        await memory_table.add([row("m1", _basis(0)), row("m2", _basis(1))])
+        with patch.object(vs.embedding_service, "aembed_many", return_value=[_basis(0)]):
+            await vs.memory_store.search("q", top_k=1)
+            await vs.memory_store.search("q", top_k=1)  # cache hit still counts as a recall
+        assert {k: v[0] for k, v in access_tracker.drain().items()} == {"m1": 2}
+
+
+class TestSchemaMigration:
+    async def test_adds_access_columns_to_old_table(self, row, lance_dir):
+        import lancedb
+
+        old_schema = pa.schema([f for f in vs._SCHEMA if f.name not in vs._ADDED_COLUMNS])
+        db = await lancedb.connect_async(vs._LANCE_DIR)
+        old = await db.create_table(vs._TABLE_NAME, schema=old_schema)
+        await old.add([
+            {k: v for k, v in row("old", _basis(0)).items() if k in old_schema.names},
+        ])
+        old.close()
+
+        table = await vs.memory_store._get_table()
+        assert {"access_count", "last_recalled_at"} <= set((await table.schema()).names)
+        assert (await _rows_by_id(table))["old"]["access_count"] == 0
+
+        with patch.object(vs.embedding_service, "aembed_many", return_value=[_basis(5)]):
+            assert (await vs.memory_store.add_many([{"text": "new after migration"}]))[0]
+        assert await table.count_rows() == 2
+
+
+class TestFlushAccessCounts:
+    async def test_accumulates_into_table(self, row, memory_table):
+        table = memory_table
+        await table.add([row("m1", _basis(0), access_count=3), row("m2", _basis(1))])
+        access_tracker.record(["m1", "m1", "missing"])
+
+        assert await lifecycle.flush_access_counts(table) == 1
+        m1 = (await _rows_by_id(table))["m1"]
+        assert m1["access_count"] == 5
+        assert m1["last_recalled_at"] > _days_ago(1)
+        assert (await _rows_by_id(table))["m2"]["access_count"] == 0
+
+    async def test_failure_restores_pending(self, row, memory_table):
+        table = memory_table
+        await table.add([row("m1", _basis(0))])
+        access_tracker.record(["m1"])
+        with patch.object(lifecycle, "_update_access", side_effect=RuntimeError("disk full")):
+            with pytest.raises(RuntimeError):
+                await lifecycle.flush_access_counts(table)
+        assert access_tracker.pending_count() == 1
+
+
+class TestMergeNearDuplicates:
+    async def test_merges_cluster_into_most_recalled(self, row, memory_table):
+        table = memory_table
+        latest_recall = _days_ago(1)
+        await table.add([
+            row("a", _basis(0), access_count=1, age_days=10),
+            row("b", _basis(0, noise=0.01, seed=1), access_count=4, last_recalled_at=_days_ago(2)),
+            row("c", _basis(0, noise=0.01, seed=2), access_count=0, last_recalled_at=latest_recall),
+            row("d", _basis(1)),
+            row("e", _basis(0, noise=0.01, seed=3), category="goal"),
+        ])
+        clusters, removed = await lifecycle.merge_near_duplicates(table)
+
+        assert (clusters, removed) == (1, 2)
+        rows = await _rows_by_id(table)
+        assert set(rows) == {"b", "d", "e"}
+        assert rows["b"]["access_count"] == 5
+        assert rows["b"]["last_recalled_at"] == latest_recall
+
+    async def test_neighbours_found_across_chunks(self, row, memory_table, monkeypatch):
+        monkeypatch.setattr(lifecycle, "_NEIGHBOR_CHUNK", 2)
+        table = memory_table
+        await table.add([row(f"m{i}", _basis(i)) for i in range(5)])
+        await table.add([row("dup", _basis(0, noise=0.01, seed=1), access_count=2)])
+
+        assert await lifecycle.merge_near_duplicates(table) == (1, 1)
+        rows = await _rows_by_id(table)
+        assert set(rows) == {"dup", "m1", "m2", "m3", "m4"}
+        assert rows["dup"]["access_count"] == 2
+
+    async def test_no_duplicates_no_changes(self, row, memory_table):
+        table = memory_table
+        await table.add([row(f"m{i}", _basis(i)) for i in range(5)])
+        assert await lifecycle.merge_near_duplicates(table) == (0, 0)
+        assert await table.count_rows() == 5
+
+
+class TestArchiveCold:
+    async def test_moves_old_unrecalled_rows(self, row, memory_table, monkeypatch):
+        monkeypatch.setattr(settings, "memory_archive_after_days", 90)
+        monkeypatch.setattr(settings, "memory_archive_max_access", 0)
+        table = memory_table
+        await table.add([
+            row("cold", _basis(0), age_days=200),
+            row("recalled", _basis(1), age_days=200, access_count=3, last_recalled_at=_days_ago(100)),
+            row("recent_recall", _basis(2), age_days=200, last_recalled_at=_days_ago(5)),
+            row("young", _basis(3), age_days=10),
+        ])
+
+        assert await lifecycle.archive_cold(table) == 1
+        assert set(await _rows_by_id(table)) == {"recalled", "recent_recall", "young"}
+
+        db = await vs.memory_store._get_db()
+        archive = (await (await db.open_table(lifecycle.ARCHIVE_TABLE_NAME)).query().to_arrow()).to_pylist()
+        assert [r["id"] for r in archive] == ["cold"]
+        assert archive[0]["archived_at"]
+        assert len(archive[0]["vector"]) == 384
+
+    async def test_archives_across_pages(self, row, memory_table, monkeypatch):
+        monkeypatch.setattr(lifecycle, "_ARCHIVE_CHUNK", 2)
+        monkeypatch.setattr(settings, "memory_archive_after_days", 90)
+        table = memory_table
+        await table.add([row(f"cold{i}", _basis(i), age_days=200) for i in range(5)])
+        await table.add([row("young", _basis(9))])
+
+        assert await lifecycle.archive_cold(table) == 5
+        assert set(await _rows_by_id(table)) == {"young"}
+        archive = await vs.memory_store.get_or_create_table(lifecycle.ARCHIVE_TABLE_NAME, lifecycle._ARCHIVE_SCHEMA)
+        assert sorted((await archive.query().to_arrow()).column("id").to_pylist()) == [f"cold{i}" for i in range(5)]
+
+    async def test_nothing_cold(self, row, memory_table):
+        table = memory_table
+        await table.add([row("young", _basis(0))])
+        assert await lifecycle.archive_cold(table) == 0
+        db = await vs.memory_store._get_db()
+        assert lifecycle.ARCHIVE_TABLE_NAME not in (await db.list_tables()).tables
+
+
+class TestRunLifecycle:
+    async def test_report_and_cache_invalidation(self, row, memory_table, monkeypatch):
+        monkeypatch.setattr(settings, "memory_archive_after_days", 90)
+        await memory_table.add([
+            row("a", _basis(0)),
+            row("a2", _basis(0, noise=0.01, seed=1)),
+            row("old", _basis(1), age_days=365),
+            row("keep", _basis(2)),
+        ])
+        access_tracker.record(["keep"])
+        generation = vs.query_cache.generation
+
+        report = await lifecycle.run_lifecycle()
+        assert report == {
+            "rows_before": 4,
+            "accesses_flushed": 1,
+            "clusters_merged": 1,
+            "rows_merged": 1,
+            "rows_archived": 1,
+            "rows_after": 2,
+        }
+        assert vs.query_cache.generation > generation
+
+
+class TestMemoryLifecycleJob:
+    async def test_job_runs_lifecycle(self):
+        from src.scheduler.jobs.memory_lifecycle import run_memory_lifecycle
+
+        report = {"rows_before": 10, "accesses_flushed": 0, "clusters_merged": 1,
+                  "rows_merged": 2, "rows_archived": 3, "rows_after": 5}
+        with patch("src.memory.lifecycle.run_lifecycle", new_callable=AsyncMock, return_value=report) as mock_run:
+            await run_memory_lifecycle()
+            mock_run.assert_called_once()
+
+    async def test_job_swallows_errors(self):
+        from src.scheduler.jobs.memory_lifecycle import run_memory_lifecycle
+
+        with patch("src.memory.lifecycle.run_lifecycle", new_callable=AsyncMock, side_effect=RuntimeError("boom")):
+            await run_memory_lifecycle()  # should not raise
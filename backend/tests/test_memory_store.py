@@ -0,0 +1,120 @@
+"""Tests for the memory store (src/memory/vector_store.py MemoryStore)."""
+
+from unittest.mock import patch
+
+import pytest
+
+import src.memory.vector_store as vs
+
+
+@pytest.fixture
+def embed_mock(lance_dir, fake_vector):
+    async def aembed_many(texts):
+        return [fake_vector(t) for t in texts]
+
+    with patch.object(vs.embedding_service, "aembed_many", side_effect=aembed_many) as mock_embed:
+        yield mock_embed
+
+
+@pytest.fixture
+def store(embed_mock):
+    return vs.memory_store
+
+
+_ITEMS = [
+    {"text": "User holds NVDA in their brokerage account", "category": "fact", "source_session_id": "s1"},
+    {"text": "Project Orion ships its beta at the end of March", "category": "goal"},
+    {"text": "User prefers deep work blocks before lunch", "category": "preference"},
+]
+
+
+class TestAddMany:
+    async def test_stores_all_items_in_one_write(self, store):
+        ids = await store.add_many(_ITEMS)
+        assert len(ids) == 3 and all(ids) and len(set(ids)) == 3
+
+        table = await store._get_table()
+        assert await table.count_rows() == 3
+        assert len(await table.list_versions()) == 2  # create + one append
+        row = (await table.query().where(f"id = '{ids[0]}'").to_list())[0]
+        assert row["category"] == "fact"
+        assert row["source_session_id"] == "s1"
+
+    async def test_duplicate_of_existing_returns_existing_id(self, store):
+        first = await store.add_many(_ITEMS[:1])
+        again = await store.add_many(_ITEMS[:1])
+        assert again == first
+        assert await (await store._get_table()).count_rows() == 1
+
+    async def test_empty_batch(self, store):
+        assert await store.add_many([]) == []
+
+    async def test_embedding_failure_returns_empty_ids(self, store, embed_mock):
+        embed_mock.side_effect = RuntimeError("model crashed")
+        assert await store.add_many(_ITEMS[:2]) == ["", ""]
+
+
+class TestSearch:
+    async def test_search_finds_stored_memory(self, store):
+        ids = await store.add_many(_ITEMS)
+        results = await store.search(_ITEMS[1]["text"], top_k=1)
+        assert results[0]["id"] == ids[1]
+        assert set(results[0]) == {"id", "text", "category", "score", "created_at"}
+
+    async def test_search_empty_table(self, store):
+        assert await store.search("anything") == []
+
+    async def test_category_filter(self, store):
+        await store.add_many(_ITEMS)
+        results = await store.search(_ITEMS[1]["text"], top_k=5, category_filter="preference")
+        assert [r["category"] for r in results] == ["preference"]
+        assert await store.search("x", category_filter="bogus") == []
+
+    async def test_hybrid_mode_uses_lexical_signal(self, store):
+        ids = await store.add_many(_ITEMS)
+        await store.maintain_index()
+        results = await store.search("NVDA", top_k=1, mode="hybrid")
+        assert results[0]["id"] == ids[0]
+        assert results[0]["lexical_score"] is not None
+
+    async def test_search_many_embeds_once(self, store, embed_mock):
+        await store.add_many(_ITEMS)
+        embed_mock.reset_mock()
+
+        results = await store.search_many([_ITEMS[0]["text"], _ITEMS[2]["text"]], top_k=1)
+        assert embed_mock.await_count == 1
+        assert [r[0]["text"] for r in results] == [_ITEMS[0]["text"], _ITEMS[2]["text"]]
+
+    async def test_search_formatted(self, store):
+        await store.add_many(_ITEMS[1:2])
+        text = await store.search_formatted("Orion", top_k=1)
+        assert text == "- [goal] Project Orion ships its beta at the end of March"
+
+    async def test_sees_its_own_writes_immediately(self, store):
+        await store.warmup()
+        assert await store.search(_ITEMS[2]["text"], top_k=1) == []
+        [memory_id] = await store.add_many(_ITEMS[2:3])
+        results = await store.search(_ITEMS[2]["text"], top_k=1)
+        assert results[0]["id"] == memory_id
+
+
+class TestDelete:
+    async def test_deletes_by_id(self, store):
+        ids = await store.add_many(_ITEMS)
+        assert await store.delete([ids[0], ids[2], "missing"]) == 2
+        remaining = (await (await store._get_table()).to_arrow()).column("id").to_pylist()
+        assert remaining == [ids[1]]
+
+    async def test_delete_nothing(self, store):
+        assert await store.delete([]) == 0
+
+
+class TestTableHandle:
+    async def test_handle_is_cached(self, store):
+        first = await store._get_table()
+        assert await store._get_table() is first
+
+    async def test_reset_reopens(self, store):
+        first = await store._get_table()
+        store.reset()
+        assert await store._get_table() is not first
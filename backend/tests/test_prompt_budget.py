@@ -0,0 +1,149 @@
+"""Tests for the prompt token-budget planner (src/agent/prompt_budget.py)."""
+
+import logging
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.agent import prompt_budget as pb
+from src.agent.prompt_budget import KEEP_ALL, PromptSection, plan_prompt, render
+
+
+@pytest.fixture(autouse=True)
+def word_tokenizer():
+    """One token per whitespace-separated word."""
+    from src.agent import context_window as cw
+
+    encoder = MagicMock()
+    encoder.encode.side_effect = lambda text: text.split()
+    pb._token_counts.clear()
+    with patch.object(cw, "_get_encoding", return_value=encoder):
+        yield encoder
+    pb._token_counts.clear()
+
+
+def _lines(prefix: str, n: int) -> str:
+    return "\n".join(f"{prefix}{i} a b c" for i in range(n))  # 4 tokens per line
+
+
+class TestPlanPrompt:
+    def test_everything_fits_untouched(self):
+        sections = [PromptSection("a", _lines("a", 3), 1), PromptSection("b", _lines("b", 3), 2)]
+        planned = plan_prompt(sections, total=1000)
+        assert [p.text for p in planned] == [s.text for s in sections]
+        assert not any(p.trimmed for p in planned)
+
+    def test_empty_sections_dropped(self):
+        planned = plan_prompt([PromptSection("a", "", 1), PromptSection("b", "x", 1)], total=10)
+        assert [p.section.name for p in planned] == ["b"]
+
+    def test_max_tokens_clamps_even_under_budget(self):
+        planned = plan_prompt([PromptSection("a", _lines("a", 10), 1, max_tokens=8)], total=1000)
+        assert planned[0].text == _lines("a", 1)
+        assert planned[0].original_tokens == 40
+
+    def test_lowest_priority_trimmed_first(self):
+        sections = [
+            PromptSection("important", _lines("i", 10), priority=9),
+            PromptSection("optional", _lines("o", 10), priority=1),
+        ]
+        planned = plan_prompt(sections, total=60)
+        assert planned[0].text == sections[0].text
+        assert planned[1].tokens <= 20
+        assert sum(p.tokens for p in planned) <= 60
+
+    def test_min_tokens_respected(self):
+        sections = [
+            PromptSection("important", _lines("i", 10), priority=9),
+            PromptSection("optional", _lines("o", 10), priority=1, min_tokens=12),
+        ]
+        planned = plan_prompt(sections, total=40)
+        # optional stops at its minimum; the rest comes out of "important"
+        assert planned[1].tokens >= 12
+        assert sum(p.tokens for p in planned) <= 40
+
+    def test_keep_all_section_never_trimmed(self):
+        sections = [
+            PromptSection("persona", _lines("p", 10), priority=100, min_tokens=KEEP_ALL),
+            PromptSection("history", _lines("h", 10), priority=50),
+        ]
+        planned = plan_prompt(sections, total=10)
+        assert planned[0].text == sections[0].text
+        assert planned[1].text == ""
+
+    def test_tail_sections_keep_most_recent_lines(self):
+        planned = plan_prompt([PromptSection("history", _lines("h", 10), 1, keep="tail")], total=12)
+        assert planned[0].text == "h8 a b c\nh9 a b c"
+
+    @pytest.mark.parametrize("keep", ["head", "tail"])
+    def test_oversized_line_never_exceeds_tiny_limit(self, word_tokenizer, keep):
+        word_tokenizer.encode.side_effect = lambda text: list(text) * 4  # 4 tokens per char
+        assert pb._trim("hello", 3, keep) == ""
+        assert pb._trim("hello", 4, keep) == ("h" if keep == "head" else "o")
+
+    def test_logs_breakdown(self, caplog):
+        with caplog.at_level(logging.INFO, logger="src.agent.prompt_budget"):
+            plan_prompt([PromptSection("soul", _lines("s", 10), 1)], total=20)
+        assert "soul=" in caplog.text and "/40" in caplog.text
+
+
+class TestCountTokens:
+    def test_cached(self, word_tokenizer):
+        pb.count_tokens("one two three")
+        pb.count_tokens("one two three")
+        assert word_tokenizer.encode.call_count == 1
+
+    def test_keyed_by_digest_and_bounded(self, monkeypatch):
+        monkeypatch.setattr(pb, "_TOKEN_CACHE_SIZE", 2)
+        for text in ("a " * 1000, "b", "c"):
+            pb.count_tokens(text)
+        assert len(pb._token_counts) == 2
+        assert all(isinstance(k, bytes) and len(k) == 16 for k in pb._token_counts)
+
+
+class TestRender:
+    def test_headers_and_spacing(self):
+        planned = plan_prompt([
+            PromptSection("persona", "You are Seraph.", 100),
+            PromptSection("soul", "Name: Ada", 90, header="--- USER IDENTITY ---"),
+        ], total=1000)
+        assert render(planned) == "You are Seraph.\n\n--- USER IDENTITY ---\nName: Ada"
+
+
+class TestFactoryIntegration:
+    @patch("src.agent.factory.ToolCallingAgent")
+    @patch("src.agent.factory.get_model")
+    def test_history_trimmed_to_prompt_budget(self, _mock_model, mock_agent_cls, monkeypatch):
+        from config.settings import settings
+        from src.agent.factory import create_agent
+
+        monkeypatch.setattr(settings, "prompt_token_budget", 1500)
+        history = _lines("turn", 1000)
+        create_agent(additional_context=history, soul_context="Name: Ada")
+        instructions = mock_agent_cls.call_args.kwargs["instructions"]
+        assert "Name: Ada" in instructions
+        assert "turn999 a b c" in instructions
+        assert "turn0 a b c" not in instructions
+        assert pb.count_tokens(instructions) <= 1500
+
+    @patch("src.agent.factory.ToolCallingAgent")
+    def test_stable_prefix_leads_and_marks_cache_seam(self, mock_agent_cls):
+        from src.agent.factory import create_agent
+
+        with patch("src.agent.factory.get_model") as mock_get_model:
+            from src.agent.prompt_cache import CachingLiteLLMModel
+            model = CachingLiteLLMModel(model_id="openrouter/anthropic/claude-sonnet-4")
+            mock_get_model.return_value = model
+            create_agent(
+                additional_context="user: hi",
+                soul_context="Name: Ada",
+                memory_context="likes tea",
+                observer_context="Last interaction: 2 min ago",
+            )
+        instructions = mock_agent_cls.call_args.kwargs["instructions"]
+        assert instructions.startswith(model.cache_prefix)
+        assert "Name: Ada" in model.cache_prefix
+        assert "likes tea" not in model.cache_prefix
+        assert "Last interaction" not in model.cache_prefix
+        assert instructions.index("USER IDENTITY") < instructions.index("RELEVANT MEMORIES")
+        assert instructions.index("CURRENT CONTEXT") < instructions.index("CONVERSATION HISTORY")
@@ -0,0 +1,83 @@
+"""Tests for prompt-cache breakpoints (src/agent/prompt_cache.py)."""
+
+from unittest.mock import patch
+
+from src.agent.prompt_cache import (
+    CachingLiteLLMModel,
+    add_cache_breakpoints,
+    supports_cache_control,
+)
+
+_EPHEMERAL = {"type": "ephemeral"}
+
+
+def _system(text):
+    return {"role": "system", "content": [{"type": "text", "text": text}]}
+
+
+def _user(text):
+    return {"role": "user", "content": [{"type": "text", "text": text}]}
+
+
+class TestSupportsCacheControl:
+    def test_anthropic_models(self):
+        assert supports_cache_control("openrouter/anthropic/claude-sonnet-4")
+        assert supports_cache_control("anthropic/claude-3-5-haiku")
+
+    def test_other_models(self):
+        assert not supports_cache_control("openrouter/openai/gpt-4o")
+        assert not supports_cache_control("")
+
+
+class TestAddCacheBreakpoints:
+    def test_splits_system_after_stable_prefix(self):
+        messages = [_system("TOOLS\nPERSONA SOUL\n\nMEMORIES\nRULES"), _user("hi")]
+        out = add_cache_breakpoints(messages, "PERSONA SOUL")
+        blocks = out[0]["content"]
+        assert [b["text"] for b in blocks] == ["TOOLS\nPERSONA SOUL", "\n\nMEMORIES\nRULES"]
+        assert blocks[0]["cache_control"] == _EPHEMERAL
+        assert "cache_control" not in blocks[1]
+        assert "".join(b["text"] for b in blocks) == messages[0]["content"][0]["text"]
+
+    def test_marks_last_message(self):
+        out = add_cache_breakpoints([_system("PREFIX rest"), _user("hi")], "PREFIX")
+        assert out[-1]["content"][-1]["cache_control"] == _EPHEMERAL
+
+    def test_does_not_mutate_input(self):
+        messages = [_system("PREFIX rest"), _user("hi")]
+        add_cache_breakpoints(messages, "PREFIX")
+        assert messages == [_system("PREFIX rest"), _user("hi")]
+
+    def test_prefix_not_found_leaves_system_alone(self):
+        messages = [_system("something else"), _user("hi")]
+        out = add_cache_breakpoints(messages, "PREFIX")
+        assert out[0] == messages[0]
+
+    def test_string_content(self):
+        out = add_cache_breakpoints(
+            [{"role": "system", "content": "PREFIX rest"}, {"role": "user", "content": "hi"}],
+            "PREFIX",
+        )
+        assert out[0]["content"][0] == {"type": "text", "text": "PREFIX", "cache_control": _EPHEMERAL}
+        assert out[1]["content"] == [{"type": "text", "text": "hi", "cache_control": _EPHEMERAL}]
+
+
+class TestCachingLiteLLMModel:
+    def _completion_messages(self, model_id, prefix):
+        model = CachingLiteLLMModel(model_id=model_id, api_key="k")
+        model.cache_prefix = prefix
+        with patch.object(model.client, "completion") as mock_completion:
+            mock_completion.side_effect = RuntimeError("stop")
+            try:
+                model.generate([_system("TOOLS PREFIX volatile"), _user("hi")])
+            except Exception:
+                pass
+            return mock_completion.call_args.kwargs["messages"]
+
+    def test_breakpoints_for_anthropic(self):
+        messages = self._completion_messages("openrouter/anthropic/claude-sonnet-4", "TOOLS PREFIX")
+        assert messages[0]["content"][0]["cache_control"] == _EPHEMERAL
+
+    def test_untouched_for_other_providers(self):
+        messages = self._completion_messages("openrouter/openai/gpt-4o", "TOOLS PREFIX")
+        assert all("cache_control" not in b for m in messages for b in m["content"])
@@ -0,0 +1,119 @@
+"""Tests for the memory recall result cache (src/memory/query_cache.py)."""
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+import src.memory.vector_store as vs
+from src.memory.query_cache import QueryCache, cache_key
+
+
+_ROWS = [{"id": "a", "text": "likes tea", "category": "preference", "score": 0.1, "created_at": ""}]
+
+
+class TestQueryCache:
+    def test_hit_after_put(self):
+        cache = QueryCache(max_items=4, ttl_s=60)
+        key = cache_key("tea", 5, None, "vector")
+        assert cache.get(key) is None
+        cache.put(key, _ROWS, cache.generation)
+        assert cache.get(key) == _ROWS
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_returns_copies(self):
+        cache = QueryCache(max_items=4, ttl_s=60)
+        key = cache_key("tea", 5, None, "vector")
+        cache.put(key, _ROWS, cache.generation)
+        cache.get(key)[0]["text"] = "mutated"
+        assert cache.get(key)[0]["text"] == "likes tea"
+
+    def test_key_normalizes_whitespace_and_separates_params(self):
+        assert cache_key("  likes   tea ", 5, None, "vector") == cache_key("likes tea", 5, None, "vector")
+        assert cache_key("tea", 5, None, "vector") != cache_key("tea", 3, None, "vector")
+        assert cache_key("tea", 5, None, "vector") != cache_key("tea", 5, "fact", "vector")
+        assert cache_key("tea", 5, None, "vector") != cache_key("tea", 5, None, "hybrid")
+
+    def test_invalidate_drops_entries(self):
+        cache = QueryCache(max_items=4, ttl_s=60)
+        key = cache_key("tea", 5, None, "vector")
+        cache.put(key, _ROWS, cache.generation)
+        cache.invalidate()
+        assert cache.get(key) is None
+        assert cache.stats()["generation"] == 1
+
+    def test_put_from_older_generation_is_dropped(self):
+        cache = QueryCache(max_items=4, ttl_s=60)
+        key = cache_key("tea", 5, None, "vector")
+        generation = cache.generation
+        cache.invalidate()  # a write lands while the search is running
+        cache.put(key, _ROWS, generation)
+        assert cache.get(key) is None
+
+    def test_ttl_expiry(self):
+        cache = QueryCache(max_items=4, ttl_s=0.01)
+        key = cache_key("tea", 5, None, "vector")
+        cache.put(key, _ROWS, cache.generation)
+        time.sleep(0.02)
+        assert cache.get(key) is None
+        assert cache.stats()["expired"] == 1
+
+    def test_lru_eviction(self):
+        cache = QueryCache(max_items=2, ttl_s=60)
+        keys = [cache_key(q, 5, None, "vector") for q in ("a", "b", "c")]
+        cache.put(keys[0], _ROWS, 0)
+        cache.put(keys[1], _ROWS, 0)
+        cache.get(keys[0])  # a is now most recent
+        cache.put(keys[2], _ROWS, 0)
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) is not None
+        assert cache.stats()["evictions"] == 1
+
+    def test_zero_size_disables(self):
+        cache = QueryCache(max_items=0, ttl_s=60)
+        key = cache_key("tea", 5, None, "vector")
+        cache.put(key, _ROWS, cache.generation)
+        assert cache.get(key) is None
+
+
+@pytest.fixture
+def embed(lance_dir, fake_vector):
+    async def aembed_many(texts):
+        return [fake_vector(t) for t in texts]
+
+    with patch.object(vs.embedding_service, "aembed_many", side_effect=aembed_many) as mock_embed:
+        yield mock_embed
+
+
+class TestSearchCaching:
+    async def test_repeat_search_skips_embedding(self, embed):
+        await vs.memory_store.add_many([{"text": "User likes green tea"}])
+        embed.reset_mock()
+        first = await vs.memory_store.search("tea preferences")
+        second = await vs.memory_store.search("tea  preferences")
+        assert first == second
+        assert embed.await_count == 1
+
+    async def test_add_invalidates(self, embed):
+        await vs.memory_store.add_many([{"text": "User likes green tea"}])
+        await vs.memory_store.search("User drinks coffee", top_k=5)
+        await vs.memory_store.add_many([{"text": "User drinks coffee"}])
+        embed.reset_mock()
+        results = await vs.memory_store.search("User drinks coffee", top_k=5)
+        assert len(results) == 2
+        assert embed.await_count == 1
+
+    async def test_failed_search_not_cached(self, embed):
+        await vs.memory_store.add_many([{"text": "User likes green tea"}])
+        side_effect = embed.side_effect
+        embed.side_effect = RuntimeError("model crashed")
+        assert await vs.memory_store.search("tea") == []
+        embed.side_effect = side_effect
+        assert await vs.memory_store.search("tea") != []
+
+    async def test_delete_invalidates(self, embed):
+        [memory_id] = await vs.memory_store.add_many([{"text": "User likes green tea"}])
+        assert await vs.memory_store.search("tea") != []
+        await vs.memory_store.delete([memory_id])
+        assert await vs.memory_store.search("tea") == []
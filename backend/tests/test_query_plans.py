@@ -0,0 +1,197 @@
+"""EXPLAIN QUERY PLAN regression tests for hot queries.
+
+Each test runs a repository method against the in-memory database, captures
+the SQL it emits and checks SQLite's plan: no statement on ``messages`` or
+``screen_observations`` may fall back to a full table scan, and the
+expected index must be used.
+"""
+
+import re
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+
+from src.agent.session import SessionManager
+from src.observer.screen_repository import ScreenObservationRepository
+
+_GUARDED = re.compile(r"\b(messages|screen_observations)\b")
+_ALL = re.compile(r"\w")
+_SCAN = re.compile(r"^SCAN (\w+)")
+
+
+@pytest_asyncio.fixture
+async def capture(async_db):
+    """Record (statement, parameters) for every SELECT/DELETE."""
+    async with async_db() as db:
+        engine = db.bind.sync_engine
+
+    captured: list[tuple[str, tuple]] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        head = statement.lstrip().upper()
+        if head.startswith(("SELECT", "DELETE")):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _record)
+    yield captured
+    if event.contains(engine, "before_cursor_execute", _record):
+        event.remove(engine, "before_cursor_execute", _record)
+
+
+async def _plans(async_db, captured, tables=_GUARDED) -> list[tuple[str, list[str]]]:
+    """Plans for the captured statements that mention ``tables``."""
+    statements = [(s, p) for s, p in captured if tables.search(s)]
+    captured.clear()
+    plans = []
+    async with async_db() as db:
+        conn = await db.connection()
+        for statement, parameters in statements:
+            rows = (await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)).all()
+            plans.append((statement, [row[3] for row in rows]))
+    return plans
+
+
+def _assert_no_full_scan(plans, allowed=frozenset({"s"})):
+    assert plans, "no queries captured"
+    for statement, plan in plans:
+        for line in plan:
+            m = _SCAN.match(line)
+            if m and m.group(1) not in allowed and not m.group(1).startswith("("):
+                pytest.fail(f"full scan ({line}) in plan {plan} for:\n{statement}")
+
+
+def _uses(plans, index: str) -> bool:
+    return any(index in line for _, plan in plans for line in plan)
+
+
+@pytest.fixture
+def sm():
+    return SessionManager()
+
+
+@pytest.fixture
+def repo():
+    return ScreenObservationRepository()
+
+
+async def _seed_session(sm, session_id="s1"):
+    await sm.get_or_create(session_id)
+    for i in range(3):
+        await sm.add_message(session_id, "user", f"question {i}")
+        await sm.add_message(session_id, "step", "thinking")
+        await sm.add_message(session_id, "assistant", f"answer {i}")
+
+
+class TestMessageQueries:
+    async def test_history_window(self, async_db, capture, sm):
+        await _seed_session(sm)
+        capture.clear()
+        await sm.get_history_text("s1")
+        plans = await _plans(async_db, capture)
+        _assert_no_full_scan(plans)
+        assert _uses(plans, "ix_messages_session")
+
+    async def test_list_sessions_reads_only_sessions(self, async_db, capture, sm):
+        await _seed_session(sm, "s1")
+        await _seed_session(sm, "s2")
+        page = await sm.list_sessions(limit=1)
+        capture.clear()
+        before = (datetime.fromisoformat(page[0]["updated_at"]), page[0]["id"])
+        sessions = await sm.list_sessions(limit=10, before=before)
+        assert [s["last_message"] for s in sessions] == ["answer 2"]
+        assert not _GUARDED.search(" ".join(s for s, _ in capture))
+        plans = await _plans(async_db, capture, tables=_ALL)
+        assert any("SEARCH sessions USING INDEX ix_sessions_updated_id" in line
+                   for _, plan in plans for line in plan)
+        assert not any("TEMP B-TREE" in line for _, plan in plans for line in plan)
+
+    async def test_count_messages(self, async_db, capture, sm):
+        await _seed_session(sm)
+        capture.clear()
+        assert await sm.count_messages("s1") == 6
+        plans = await _plans(async_db, capture)
+        _assert_no_full_scan(plans)
+        assert _uses(plans, "COVERING INDEX ix_messages_session_role_created")
+
+    async def test_unconsolidated(self, async_db, capture, sm):
+        await _seed_session(sm)
+        await sm.mark_consolidated("s1", datetime.now(timezone.utc) - timedelta(hours=1))
+        capture.clear()
+        await sm.get_unconsolidated("s1")
+        _assert_no_full_scan(await _plans(async_db, capture))
+
+
+class TestScreenQueries:
+    async def test_backfill_uses_partial_index(self, async_db, capture, repo):
+        now = datetime.now(timezone.utc)
+        await repo.create(app_name="A", timestamp=now - timedelta(minutes=5))
+        capture.clear()
+        await repo.create(app_name="B", timestamp=now)
+        plans = await _plans(async_db, capture)
+        _assert_no_full_scan(plans)
+        assert _uses(plans, "ix_screen_observations_open_timestamp")
+
+    async def test_daily_summary(self, async_db, capture, repo):
+        await repo.create(app_name="A", timestamp=datetime.now(timezone.utc))
+        capture.clear()
+        await repo.get_daily_summary(date.today())
+        plans = await _plans(async_db, capture)
+        _assert_no_full_scan(plans)
+        assert _uses(plans, "ix_screen_observations_blocked_timestamp")
+
+    async def test_cleanup(self, async_db, capture, repo):
+        await repo.create(app_name="Old", timestamp=datetime.now(timezone.utc) - timedelta(days=100))
+        capture.clear()
+        await repo.cleanup_old(retention_days=90)
+        _assert_no_full_scan(await _plans(async_db, capture))
+
+
+class TestMigration:
+    async def test_indexes_added_to_existing_tables(self, tmp_path):
+        from sqlalchemy import text
+        from sqlalchemy.ext.asyncio import create_async_engine
+        from sqlmodel import SQLModel
+
+        from src.db.engine import _add_missing_indexes
+
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'old.db'}")
+        try:
+            async with engine.begin() as conn:
+                # A messages table from before the composite indexes existed
+                await conn.execute(text(
+                    "CREATE TABLE messages (id VARCHAR PRIMARY KEY, session_id VARCHAR, "
+                    "role VARCHAR, content VARCHAR, metadata_json VARCHAR, "
+                    "step_number INTEGER, tool_used VARCHAR, created_at DATETIME)"
+                ))
+                await conn.execute(text(
+                    "CREATE TABLE screen_observations (id VARCHAR PRIMARY KEY, timestamp DATETIME, "
+                    "app_name VARCHAR, window_title VARCHAR, activity_type VARCHAR, project VARCHAR, "
+                    "summary VARCHAR, details_json VARCHAR, duration_s INTEGER, blocked BOOLEAN, "
+                    "created_at DATETIME)"
+                ))
+            existing = {"messages", "screen_observations"}
+
+            def _migrate(sync_conn):
+                # Same order as init_db: create_all fills in the other tables
+                SQLModel.metadata.create_all(sync_conn)
+                _add_missing_indexes(sync_conn)
+                _add_missing_indexes(sync_conn)  # idempotent
+
+            async with engine.begin() as conn:
+                await conn.run_sync(_migrate)
+                names = {
+                    row[1]
+                    for table in existing
+                    for row in (await conn.exec_driver_sql(f"PRAGMA index_list({table})")).all()
+                }
+        finally:
+            await engine.dispose()
+
+        assert {
+            "ix_messages_session_role_created",
+            "ix_messages_session_created",
+            "ix_screen_observations_blocked_timestamp",
+            "ix_screen_observations_open_timestamp",
+        } <= names
@@ -90,6 +90,9 @@ class TestSchedulerEngine:
         with patch("src.scheduler.engine.settings") as mock_settings:
             mock_settings.scheduler_enabled = True
             mock_settings.memory_consolidation_interval_min = 30
+            mock_settings.memory_index_interval_min = 60
+            mock_settings.memory_compaction_interval_min = 360
+            mock_settings.memory_lifecycle_hour = 4
             mock_settings.goal_check_interval_hours = 4
             mock_settings.calendar_scan_interval_min = 15
             mock_settings.strategist_interval_min = 15
@@ -115,6 +118,9 @@ class TestSchedulerEngine:
                     "activity_digest",
                     "weekly_activity_review",
                     "screen_cleanup",
+                    "memory_index",
+                    "memory_compaction",
+                    "memory_lifecycle",
                 }
             finally:
                 shutdown_scheduler()
@@ -142,11 +148,11 @@ class TestMemoryConsolidationJob:
             db.add(msg)
 
         with patch(
-            "src.scheduler.jobs.memory_consolidation.consolidate_session",
+            "src.scheduler.jobs.memory_consolidation.consolidate_sessions",
             new_callable=AsyncMock,
         ) as mock_consolidate:
             await run_memory_consolidation()
-            mock_consolidate.assert_called_once_with("test-session-1")
+            mock_consolidate.assert_called_once_with(["test-session-1"])
 
     @pytest.mark.asyncio
     async def test_skips_old_sessions(self, async_db):
@@ -161,14 +167,34 @@ class TestMemoryConsolidationJob:
             db.add(session)
 
         with patch(
-            "src.scheduler.jobs.memory_consolidation.consolidate_session",
+            "src.scheduler.jobs.memory_consolidation.consolidate_sessions",
             new_callable=AsyncMock,
         ) as mock_consolidate:
             await run_memory_consolidation()
             mock_consolidate.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_continues_on_individual_failure(self, async_db):
+    async def test_skips_sessions_without_new_messages(self, async_db):
+        from src.db.models import Session, Message
+        from src.scheduler.jobs.memory_consolidation import run_memory_consolidation
+
+        async with async_db() as db:
+            msg = Message(session_id="done", role="user", content="hello world")
+            db.add(Session(id="done", title="Done", consolidated_through=msg.created_at))
+            db.add(msg)
+            # Only step output since the watermark — nothing to consolidate
+            db.add(Session(id="steps", title="Steps"))
+            db.add(Message(session_id="steps", role="step", content="Thinking..."))
+
+        with patch(
+            "src.scheduler.jobs.memory_consolidation.consolidate_sessions",
+            new_callable=AsyncMock,
+        ) as mock_consolidate:
+            await run_memory_consolidation()
+            mock_consolidate.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_passes_all_candidates_in_one_call(self, async_db):
         from src.db.models import Session, Message
         from src.scheduler.jobs.memory_consolidation import run_memory_consolidation
 
@@ -180,18 +206,24 @@ class TestMemoryConsolidationJob:
                 msg = Message(session_id=f"session-{i}", role="user", content="hi")
                 db.add(msg)
 
-        call_count = 0
+        with patch(
+            "src.scheduler.jobs.memory_consolidation.consolidate_sessions",
+            new_callable=AsyncMock,
+        ) as mock_consolidate:
+            await run_memory_consolidation()
+            assert sorted(mock_consolidate.call_args.args[0]) == ["session-0", "session-1"]
 
-        async def fail_first(session_id):
-            nonlocal call_count
-            call_count += 1
-            if call_count == 1:
-                raise RuntimeError("consolidation error")
+    @pytest.mark.asyncio
+    async def test_swallows_consolidation_errors(self, async_db):
+        from src.db.models import Session, Message
+        from src.scheduler.jobs.memory_consolidation import run_memory_consolidation
+
+        async with async_db() as db:
+            db.add(Session(id="session-0", title="Test"))
+            db.add(Message(session_id="session-0", role="user", content="hi"))
 
         with patch(
-            "src.scheduler.jobs.memory_consolidation.consolidate_session",
-            side_effect=fail_first,
+            "src.scheduler.jobs.memory_consolidation.consolidate_sessions",
+            side_effect=RuntimeError("consolidation error"),
         ):
-            await run_memory_consolidation()
-            # Should have attempted both despite first failing
-            assert call_count == 2
+            await run_memory_consolidation()  # should not raise
@@ -164,6 +164,22 @@ class TestScreenObservationRepository:
         summary = await repo.get_daily_summary(now.date())
         assert summary["total_observations"] == 1
 
+    @pytest.mark.asyncio
+    async def test_cleanup_old_in_chunks(self, async_db, monkeypatch):
+        import src.observer.screen_repository as screen_repository
+
+        monkeypatch.setattr(screen_repository, "_CLEANUP_CHUNK", 3)
+        repo = ScreenObservationRepository()
+        now = datetime.now(timezone.utc)
+        for i in range(7):
+            await repo.create(app_name=f"Old {i}", timestamp=now - timedelta(days=100, minutes=i))
+        await repo.create(app_name="New App", timestamp=now)
+
+        assert await repo.cleanup_old(retention_days=90) == 7
+        assert await repo.cleanup_old(retention_days=90) == 0
+        summary = await repo.get_daily_summary(now.date())
+        assert summary["total_observations"] == 1
+
     @pytest.mark.asyncio
     async def test_details_json_round_trip(self, async_db):
         repo = ScreenObservationRepository()
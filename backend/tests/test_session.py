@@ -1,5 +1,6 @@
 """Tests for the async DB-backed SessionManager (src/agent/session.py)."""
 
+from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -57,6 +58,15 @@ class TestDelete:
         msgs = await sm.get_messages("s1")
         assert msgs == []
 
+    async def test_leaves_other_sessions_alone(self, async_db, sm):
+        await sm.get_or_create("s1")
+        await sm.get_or_create("s2")
+        await sm.add_message("s1", "user", "hello")
+        await sm.add_message("s2", "user", "still here")
+        await sm.delete("s1")
+        msgs = await sm.get_messages("s2")
+        assert [m["content"] for m in msgs] == ["still here"]
+
 
 class TestAddMessage:
     async def test_basic(self, async_db, sm):
@@ -97,6 +107,61 @@ class TestGetHistoryText:
         assert "Thinking..." not in text
 
 
+class TestConsolidationWatermark:
+    async def test_everything_is_new_initially(self, async_db, sm):
+        await sm.get_or_create("s1")
+        await sm.add_message("s1", "user", "Hello")
+        last = await sm.add_message("s1", "assistant", "Hi!")
+        text, through = await sm.get_unconsolidated("s1")
+        assert "User: Hello" in text
+        assert through.replace(tzinfo=None) == last.created_at.replace(tzinfo=None)
+
+    async def test_only_messages_after_watermark(self, async_db, sm):
+        await sm.get_or_create("s1")
+        await sm.add_message("s1", "user", "Old question")
+        await sm.add_message("s1", "assistant", "Old answer")
+        _, through = await sm.get_unconsolidated("s1")
+        assert await sm.mark_consolidated("s1", through)
+
+        assert await sm.get_unconsolidated("s1") == ("", None)
+
+        await sm.add_message("s1", "step", "Thinking...")
+        assert await sm.get_unconsolidated("s1") == ("", None)
+
+        await sm.add_message("s1", "user", "New question")
+        text, _ = await sm.get_unconsolidated("s1")
+        assert "New question" in text
+        assert "Old question" not in text
+
+    async def test_oldest_first_and_through_is_last_rendered(self, async_db, sm):
+        await sm.get_or_create("s1")
+        sent = [await sm.add_message("s1", "user", f"message {i} " * 20) for i in range(5)]
+
+        text, through = await sm.get_unconsolidated("s1", limit=3)
+        assert "message 0" in text and "message 2" in text and "message 3" not in text
+        assert through.replace(tzinfo=None) == sent[2].created_at.replace(tzinfo=None)
+
+        text, through = await sm.get_unconsolidated("s1", token_budget=1)
+        assert text.startswith("User: message 0") and "message 1" not in text
+        assert through.replace(tzinfo=None) == sent[0].created_at.replace(tzinfo=None)
+
+    async def test_watermark_never_moves_backwards(self, async_db, sm):
+        await sm.get_or_create("s1")
+        await sm.add_message("s1", "user", "First")
+        _, first = await sm.get_unconsolidated("s1")
+        await sm.add_message("s1", "user", "Second")
+        _, second = await sm.get_unconsolidated("s1")
+
+        await sm.mark_consolidated("s1", second)
+        await sm.mark_consolidated("s1", first)
+        assert (await sm.get("s1")).consolidated_through == second
+
+    async def test_mark_missing_session(self, async_db, sm):
+        from datetime import datetime, timezone
+
+        assert await sm.mark_consolidated("nope", datetime.now(timezone.utc)) is False
+
+
 class TestGetMessages:
     async def test_pagination(self, async_db, sm):
         await sm.get_or_create("s1")
@@ -126,6 +191,44 @@ class TestListSessions:
         result = await sm.list_sessions()
         assert result[0]["last_message"] == "Hello world"
 
+    async def test_summary_columns_track_messages(self, async_db, sm):
+        await sm.get_or_create("s1")
+        await sm.add_message("s1", "user", "x" * 300)
+        await sm.add_message("s1", "step", "thinking")
+        await sm.add_message("s1", "assistant", "done")
+        [row] = await sm.list_sessions()
+        assert row["last_message"] == "done"
+        assert row["last_message_role"] == "assistant"
+        assert row["message_count"] == 3
+
+    async def test_preview_truncated(self, async_db, sm):
+        await sm.get_or_create("s1")
+        await sm.add_message("s1", "user", "x" * 300)
+        [row] = await sm.list_sessions()
+        assert row["last_message"] == "x" * 100
+
+    async def test_newest_first(self, async_db, sm):
+        await sm.get_or_create("old")
+        await sm.get_or_create("new")
+        await sm.add_message("old", "user", "bump")
+        result = await sm.list_sessions()
+        assert [s["id"] for s in result] == ["old", "new"]
+
+    async def test_keyset_pagination(self, async_db, sm):
+        for i in range(5):
+            await sm.get_or_create(f"s{i}")
+            await sm.add_message(f"s{i}", "user", f"msg {i}")
+
+        seen, before = [], None
+        while True:
+            page = await sm.list_sessions(limit=2, before=before)
+            seen.extend(s["id"] for s in page)
+            if len(page) < 2:
+                break
+            before = (datetime.fromisoformat(page[-1]["updated_at"]), page[-1]["id"])
+        assert seen == [s["id"] for s in await sm.list_sessions()]
+        assert seen == ["s4", "s3", "s2", "s1", "s0"]
+
 
 class TestUpdateTitle:
     async def test_success(self, async_db, sm):
@@ -144,6 +247,13 @@ class TestCountMessages:
         await sm.add_message("s1", "step", "thinking")
         assert await sm.count_messages("s1") == 2
 
+    async def test_scoped_to_session(self, async_db, sm):
+        await sm.get_or_create("s1")
+        await sm.get_or_create("s2")
+        await sm.add_message("s2", "user", "elsewhere")
+        assert await sm.count_messages("s1") == 0
+        assert await sm.count_messages("s2") == 1
+
 
 class TestGenerateTitle:
     async def test_generates_title(self, async_db, sm):
@@ -166,3 +276,142 @@ class TestGenerateTitle:
         # Need to re-fetch since generate_title reads from DB
         title = await sm.generate_title("s1")
         assert title == "Custom Title"
+
+
+class TestSummaryTree:
+    @pytest.fixture(autouse=True)
+    def fake_encoding(self):
+        from src.agent import context_window as cw
+
+        encoder = MagicMock()
+        encoder.encode.side_effect = lambda text: text.split()
+        cw._token_counts.clear()
+        with patch.object(cw, "_get_encoding", return_value=encoder):
+            yield
+        cw._token_counts.clear()
+
+    @pytest.fixture
+    def small_window(self, monkeypatch):
+        from config.settings import settings
+
+        monkeypatch.setattr(settings, "context_window_token_budget", 300)
+        monkeypatch.setattr(settings, "context_window_keep_first", 2)
+        monkeypatch.setattr(settings, "context_window_keep_recent", 4)
+
+    @pytest.fixture
+    def fake_llm(self):
+        calls = {"chunk": 0, "combine": 0}
+
+        def chunk(messages):
+            calls["chunk"] += 1
+            return f"chunk {calls['chunk']}"
+
+        def combine(texts):
+            calls["combine"] += 1
+            return f"combined({'+'.join(texts)})"
+
+        with patch("src.agent.summary_tree.summarize_chunk", side_effect=chunk), \
+             patch("src.agent.summary_tree.combine_summaries", side_effect=combine):
+            yield calls
+
+    async def _long_session(self, sm, n):
+        await sm.get_or_create("s1")
+        for i in range(n):
+            await sm.add_message("s1", "user" if i % 2 == 0 else "assistant", f"turn {i} " + "word " * 15)
+
+    async def _nodes(self, async_db):
+        from sqlmodel import select
+        from src.db.models import SummaryNode
+
+        async with async_db() as db:
+            result = await db.execute(select(SummaryNode).order_by(SummaryNode.level, SummaryNode.seq))
+            return [(n.level, n.seq, n.content) for n in result.scalars().all()]
+
+    async def test_chunks_then_combines(self, async_db, sm, small_window, fake_llm):
+        # 2 first + 4 recent + 90 middle -> 4 complete chunks of 20, 10 left over
+        await self._long_session(sm, 96)
+        assert await sm.summarize_history("s1") == 80
+        nodes = await self._nodes(async_db)
+        assert [n[:2] for n in nodes] == [(1, 0), (1, 1), (1, 2), (1, 3), (2, 0)]
+        assert nodes[-1][2] == "combined(chunk 1+chunk 2+chunk 3+chunk 4)"
+
+    async def test_chunk_summaries_are_never_redone(self, async_db, sm, small_window, fake_llm):
+        await self._long_session(sm, 46)
+        assert await sm.summarize_history("s1") == 40
+        assert await sm.summarize_history("s1") == 0
+        assert fake_llm["chunk"] == 2
+
+        for i in range(46, 66):
+            await sm.add_message("s1", "user", f"turn {i} " + "word " * 15)
+        assert await sm.summarize_history("s1") == 20
+        assert fake_llm["chunk"] == 3
+
+    async def test_history_uses_tree_without_llm(self, async_db, sm, small_window, fake_llm):
+        await self._long_session(sm, 96)
+        await sm.summarize_history("s1")
+
+        with patch("src.agent.context_window._summarize_middle", side_effect=AssertionError("LLM")), \
+             patch("src.agent.summary_tree.summarize_chunk", side_effect=AssertionError("LLM")), \
+             patch("src.utils.background.track_task") as mock_track:
+            text = await sm.get_history_text("s1")
+        assert "[Summary of earlier conversation:" in text
+        assert "turn 95 " in text
+        # 10 unsummarized middle messages are not a full chunk yet
+        mock_track.assert_not_called()
+
+    async def test_prefers_detailed_level_when_it_fits(self, async_db, sm, small_window, fake_llm):
+        await self._long_session(sm, 96)
+        await sm.summarize_history("s1")
+        with patch("src.utils.background.track_task"):
+            text = await sm.get_history_text("s1")
+        assert "chunk 1\nchunk 2\nchunk 3\nchunk 4" in text
+        assert "combined(" not in text
+
+    async def test_backlog_schedules_one_background_run(self, async_db, sm, small_window):
+        await self._long_session(sm, 40)
+        with patch("src.utils.background.track_task") as mock_track:
+            await sm.get_history_text("s1")
+            await sm.get_history_text("s1")
+        mock_track.assert_called_once()
+        mock_track.call_args.args[0].close()
+
+    async def test_turns_older_than_window_are_summarized(self, async_db, sm, small_window, monkeypatch):
+        import src.agent.session as session_module
+
+        monkeypatch.setattr(session_module, "_WINDOW_TURNS", 30)
+        await self._long_session(sm, 96)
+        chunks = []
+
+        def chunk(messages):
+            chunks.append([m["content"].split()[1] for m in messages])
+            return f"chunk {len(chunks)}"
+
+        with patch("src.agent.summary_tree.summarize_chunk", side_effect=chunk), \
+             patch("src.agent.summary_tree.combine_summaries", return_value="combined"):
+            # Turns 2-65 sit between the opening turns and the latest 30
+            assert await sm.summarize_history("s1") == 80
+            assert await sm.summarize_history("s1") == 0
+        covered = [int(turn) for c in chunks for turn in c]
+        assert covered == list(range(2, 82))
+
+    async def test_aged_out_backlog_schedules_a_run(self, async_db, sm, small_window, monkeypatch):
+        import src.agent.session as session_module
+
+        monkeypatch.setattr(session_module, "_WINDOW_TURNS", 4)
+        await self._long_session(sm, 30)
+        with patch("src.utils.background.track_task") as mock_track:
+            await sm.get_history_text("s1")
+        mock_track.assert_called_once()
+        mock_track.call_args.args[0].close()
+
+    async def test_failed_summary_keeps_existing_nodes(self, async_db, sm, small_window):
+        await self._long_session(sm, 46)
+        with patch("src.agent.summary_tree.summarize_chunk", side_effect=RuntimeError("LLM down")):
+            assert await sm.summarize_history("s1") == 0
+        assert await self._nodes(async_db) == []
+
+    async def test_delete_removes_summary_nodes(self, async_db, sm, small_window, fake_llm):
+        await self._long_session(sm, 46)
+        await sm.summarize_history("s1")
+        await sm.delete("s1")
+        assert await self._nodes(async_db) == []
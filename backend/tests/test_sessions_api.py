@@ -24,6 +24,24 @@ class TestListSessions:
         assert res.status_code == 200
         assert len(res.json()) == 2
 
+    async def test_paginated(self, client, async_db):
+        sm = SessionManager()
+        for i in range(3):
+            await sm.get_or_create(f"s{i}")
+            await sm.add_message(f"s{i}", "user", f"msg {i}")
+
+        res = await client.get("/api/sessions", params={"limit": 2})
+        assert [s["id"] for s in res.json()] == ["s2", "s1"]
+        cursor = res.headers["X-Next-Cursor"]
+
+        res = await client.get("/api/sessions", params={"limit": 2, "cursor": cursor})
+        assert [s["id"] for s in res.json()] == ["s0"]
+        assert "X-Next-Cursor" not in res.headers
+
+    async def test_invalid_cursor(self, client):
+        res = await client.get("/api/sessions", params={"limit": 2, "cursor": "garbage"})
+        assert res.status_code == 400
+
 
 class TestGetMessages:
     async def test_success(self, client, async_db):
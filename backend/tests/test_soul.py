@@ -1,6 +1,8 @@
 """Tests for soul file persistence (src/memory/soul.py)."""
 
 import os
+import threading
+from unittest.mock import patch
 
 import pytest
 
@@ -61,6 +63,65 @@ class TestUpdateSoulSection:
         assert "C" in result
 
 
+class TestSoulDocument:
+    def test_section_index(self, soul_dir):
+        soul_mod.write_soul("# Soul\n\n## Identity\nA\n\n## Values\nB\n")
+        assert soul_mod.soul.sections() == ["Identity", "Values"]
+        assert soul_mod.soul.section("Values") == "B\n"
+        assert soul_mod.soul.section("Missing") is None
+
+    def test_update_keeps_layout(self, soul_dir):
+        soul_mod.write_soul("# Soul\n\n## Identity\nA\n\n## Values\nB\n")
+        result = soul_mod.update_soul_section("Identity", "New A")
+        assert result == "# Soul\n\n## Identity\nNew A\n\n## Values\nB\n"
+        result = soul_mod.update_soul_section("Goals", "C")
+        assert result == "# Soul\n\n## Identity\nNew A\n\n## Values\nB\n\n## Goals\nC\n"
+
+    def test_unchanged_file_is_not_reread(self, soul_dir):
+        soul_mod.write_soul("# Soul\n\n## Identity\nA\n")
+        with patch("builtins.open", side_effect=AssertionError("re-read")):
+            assert soul_mod.read_soul() == "# Soul\n\n## Identity\nA\n"
+            assert soul_mod.soul.section("Identity") == "A\n"
+
+    def test_picks_up_outside_edits(self, soul_dir):
+        soul_mod.write_soul("# Soul\n\n## Identity\nA\n")
+        with open(soul_mod._soul_path, "w", encoding="utf-8") as f:
+            f.write("# Soul\n\n## Identity\nEdited by hand\n")
+        assert soul_mod.soul.section("Identity") == "Edited by hand\n"
+        assert "Edited by hand" in soul_mod.update_soul_section("Values", "B")
+
+    def test_write_is_atomic(self, soul_dir):
+        soul_mod.write_soul("original")
+        with patch("os.replace", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                soul_mod.update_soul_section("Identity", "lost")
+        assert soul_mod.read_soul() == "original"
+        assert sorted(os.listdir(soul_dir)) == ["soul.md"]
+
+    def test_write_keeps_file_mode(self, soul_dir):
+        soul_mod.write_soul("# Soul\n")
+        os.chmod(soul_mod._soul_path, 0o644)
+        soul_mod.update_soul_section("Identity", "A")
+        assert os.stat(soul_mod._soul_path).st_mode & 0o777 == 0o644
+
+    def test_concurrent_updates_all_land(self, soul_dir):
+        soul_mod.write_soul("# Soul\n")
+        threads = [
+            threading.Thread(target=soul_mod.update_soul_section, args=(f"S{i}", f"body {i}"))
+            for i in range(20)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert sorted(soul_mod.soul.sections()) == sorted(f"S{i}" for i in range(20))
+        assert "body 7" in soul_mod.read_soul()
+
+    async def test_async_read(self, soul_dir):
+        soul_mod.write_soul("async content")
+        assert await soul_mod.aread_soul() == "async content"
+
+
 class TestEnsureSoulExists:
     def test_creates_default(self, soul_dir):
         soul_mod.ensure_soul_exists()
@@ -0,0 +1,53 @@
+"""Tests for hierarchical conversation summaries (src/agent/summary_tree.py)."""
+
+from types import SimpleNamespace
+
+from src.agent.summary_tree import FAN_IN, frontier, select_summary
+
+
+def _node(level: int, seq: int, tokens: int = 10):
+    return SimpleNamespace(level=level, seq=seq, content=f"L{level}.{seq}", token_count=tokens)
+
+
+def _tree(leaves: int) -> list:
+    """Every node a complete build would have for `leaves` level-1 chunks."""
+    nodes, count, level = [], leaves, 1
+    while count:
+        nodes.extend(_node(level, i) for i in range(count))
+        count //= FAN_IN
+        level += 1
+    return nodes
+
+
+class TestFrontier:
+    def test_level_one_is_all_leaves(self):
+        nodes = _tree(6)
+        assert [n.content for n in frontier(nodes, 1)] == [f"L1.{i}" for i in range(6)]
+
+    def test_higher_level_plus_uncombined_leaves(self):
+        nodes = _tree(6)  # L2.0 covers L1.0-3; L1.4 and L1.5 are not combined yet
+        assert [n.content for n in frontier(nodes, 2)] == ["L2.0", "L1.4", "L1.5"]
+
+    def test_three_levels_in_chronological_order(self):
+        nodes = _tree(FAN_IN * FAN_IN + FAN_IN + 1)  # 21 leaves with FAN_IN=4
+        assert [n.content for n in frontier(nodes, 3)] == ["L3.0", "L2.4", "L1.20"]
+
+
+class TestSelectSummary:
+    def test_empty(self):
+        assert select_summary([], 100) == ("", 0)
+
+    def test_most_detailed_level_that_fits(self):
+        nodes = _tree(16)  # level 1: 16 nodes, level 2: 4, level 3: 1
+        assert select_summary(nodes, 1000)[1] == 1
+        assert select_summary(nodes, 60)[1] == 2
+        assert select_summary(nodes, 15) == ("L3.0", 3)
+
+    def test_coarsest_level_when_nothing_fits(self):
+        assert select_summary(_tree(16), 1)[1] == 3
+
+    def test_size_stays_bounded_as_history_grows(self):
+        # With a fixed budget, the rendered size does not grow with the tree
+        for leaves in (16, 64, 256, 1024):
+            text, _ = select_summary(_tree(leaves), 100)
+            assert len(text.split("\n")) <= 2 * FAN_IN
@@ -34,7 +34,7 @@ def _make_context(**overrides) -> CurrentContext:
 
 @pytest.mark.asyncio
 class TestRestChatTimeout:
-    @patch("src.memory.vector_store.search_formatted", return_value="")
+    @patch("src.memory.vector_store.memory_store.search_formatted", return_value="")
     @patch("src.api.chat.build_agent")
     @patch("src.api.chat.create_onboarding_agent")
     async def test_returns_504_on_timeout(
@@ -69,7 +69,7 @@ class TestDailyBriefingTimeout:
             with (
                 patch("src.observer.manager.context_manager", mock_cm),
                 patch("src.memory.soul.read_soul", return_value="# Soul"),
-                patch("src.memory.vector_store.search_formatted", return_value=""),
+                patch("src.memory.vector_store.memory_store.search_formatted", return_value=""),
                 patch("litellm.completion", side_effect=_slow_litellm),
                 patch("src.observer.delivery.deliver_or_queue", mock_deliver),
             ):
@@ -94,7 +94,7 @@ class TestEveningReviewTimeout:
             with (
                 patch("src.observer.manager.context_manager", mock_cm),
                 patch("src.memory.soul.read_soul", return_value="# Soul"),
-                patch("src.memory.vector_store.search_formatted", return_value=""),
+                patch("src.memory.vector_store.memory_store.search_formatted", return_value=""),
                 patch(
                     "src.scheduler.jobs.evening_review._count_messages_today",
                     new_callable=AsyncMock,
@@ -129,7 +129,7 @@ class TestConsolidationTimeout:
         try:
             with (
                 patch("litellm.completion", side_effect=_slow_litellm),
-                patch("src.memory.consolidator.add_memory") as mock_add,
+                patch("src.memory.consolidator.memory_store.add_many") as mock_add,
             ):
                 from src.memory.consolidator import consolidate_session
 
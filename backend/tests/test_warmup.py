@@ -0,0 +1,122 @@
+"""Tests for startup warmup and readiness gating (src/warmup.py)."""
+
+import asyncio
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+import src.warmup as warmup
+from config.settings import settings
+
+
+@pytest.fixture(autouse=True)
+def reset_status(monkeypatch):
+    monkeypatch.setattr(warmup, "_status", {name: warmup.IDLE for name in warmup._COMPONENTS})
+    monkeypatch.setattr(settings, "startup_warmup_enabled", True)
+
+
+class TestStartWarmup:
+    async def test_components_become_ready(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(warmup, "_COMPONENTS", {
+            "embedder": lambda: calls.append("embedder"),
+            "vector_store": lambda: calls.append("vector_store"),
+            "tokenizer": lambda: calls.append("tokenizer"),
+        })
+        task = warmup.start_warmup()
+        await task
+        assert sorted(calls) == ["embedder", "tokenizer", "vector_store"]
+        assert warmup.status() == {
+            "embedder": "ready", "vector_store": "ready", "tokenizer": "ready",
+        }
+
+    async def test_coroutine_components_are_awaited(self, monkeypatch):
+        warm_store = AsyncMock()
+        monkeypatch.setattr(warmup, "_COMPONENTS", {
+            "embedder": lambda: None,
+            "vector_store": warm_store,
+            "tokenizer": lambda: None,
+        })
+        await warmup.start_warmup()
+        warm_store.assert_awaited_once()
+        assert warmup.status()["vector_store"] == "ready"
+
+    async def test_failure_is_isolated(self, monkeypatch):
+        def boom():
+            raise RuntimeError("no model")
+
+        monkeypatch.setattr(warmup, "_COMPONENTS", {
+            "embedder": boom,
+            "vector_store": lambda: None,
+            "tokenizer": lambda: None,
+        })
+        await warmup.start_warmup()
+        status = warmup.status()
+        assert status["embedder"] == "failed"
+        assert status["vector_store"] == "ready"
+        assert status["tokenizer"] == "ready"
+
+    async def test_reports_warming_while_running(self, monkeypatch):
+        release = threading.Event()
+        monkeypatch.setattr(warmup, "_COMPONENTS", {
+            "embedder": lambda: release.wait(5),
+            "vector_store": lambda: None,
+            "tokenizer": lambda: None,
+        })
+        task = warmup.start_warmup()
+        await asyncio.sleep(0.05)
+        assert warmup.status()["embedder"] == "warming"
+        assert warmup.recall_available() is False
+        release.set()
+        await task
+        assert warmup.recall_available() is True
+
+    async def test_disabled_leaves_components_idle(self, monkeypatch):
+        monkeypatch.setattr(settings, "startup_warmup_enabled", False)
+        assert warmup.start_warmup() is None
+        assert set(warmup.status().values()) == {"idle"}
+        assert warmup.recall_available() is True
+
+
+class TestRecallGating:
+    async def test_ws_skips_recall_while_warming(self, monkeypatch):
+        from src.api import ws
+
+        warmup._status["embedder"] = warmup.WARMING
+        profile = MagicMock(onboarding_completed=True)
+        mock_search = AsyncMock(return_value="- [fact] should not appear")
+
+        with patch("src.api.ws.get_or_create_profile", AsyncMock(return_value=profile)), \
+             patch.object(ws.session_manager, "get_history_text", AsyncMock(return_value="")), \
+             patch("src.memory.soul.read_soul", return_value="# Soul"), \
+             patch("src.api.ws.memory_store.search_formatted", mock_search), \
+             patch("src.api.ws.build_agent") as mock_build:
+            await ws._build_agent("s1", "hello")
+
+        mock_search.assert_not_called()
+        assert mock_build.call_args.kwargs["memory_context"] == ""
+
+    async def test_ws_recalls_once_ready(self, monkeypatch):
+        from src.api import ws
+
+        warmup._status["embedder"] = warmup.READY
+        warmup._status["vector_store"] = warmup.READY
+        profile = MagicMock(onboarding_completed=True)
+
+        with patch("src.api.ws.get_or_create_profile", AsyncMock(return_value=profile)), \
+             patch.object(ws.session_manager, "get_history_text", AsyncMock(return_value="")), \
+             patch("src.memory.soul.read_soul", return_value="# Soul"), \
+             patch("src.api.ws.memory_store.search_formatted", return_value="- [fact] likes tea"), \
+             patch("src.api.ws.build_agent") as mock_build:
+            await ws._build_agent("s1", "hello")
+
+        assert mock_build.call_args.kwargs["memory_context"] == "- [fact] likes tea"
+
+
+class TestHealth:
+    async def test_health_reports_readiness(self, client):
+        warmup._status["embedder"] = warmup.WARMING
+        response = await client.get("/health")
+        assert response.status_code == 200
+        assert response.json()["embedder"] == "warming"
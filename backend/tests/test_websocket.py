@@ -52,6 +52,9 @@ def _make_sync_client_with_db():
         "src.agent.session.get_session",
         "src.goals.repository.get_session",
         "src.api.profile.get_db",
+        "src.db.engine.get_read_session",
+        "src.agent.session.get_read_session",
+        "src.goals.repository.get_read_session",
     ]
     patches = [patch(t, _get_session) for t in targets]
     patches.append(patch("src.app.init_db", _test_init_db))
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Memory index benchmark — recall vs latency of the LanceDB ANN index.
+
+Builds synthetic `memories` tables at several sizes, indexes them with the
+same `maintain_index()` the scheduler job uses, and compares IVF-PQ search
+(across nprobes / refine_factor settings) against exact brute-force results.
+
+Usage:
+    cd backend && python ../scripts/memory_index_benchmark.py
+    cd backend && python ../scripts/memory_index_benchmark.py --sizes 1000 100000 --queries 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault("WORKSPACE_DIR", tempfile.mkdtemp(prefix="seraph-bench-"))
+os.environ.setdefault("OPENROUTER_API_KEY", "bench")
+
+DIM = 384
+TOP_K = 10
+CHUNK = 50_000
+SEARCH_CONFIGS = [(5, 0), (10, 0), (20, 0), (20, 5), (50, 5), (100, 10)]
+
+
+def synthetic_vectors(n: int, rng: np.random.Generator, centers: np.ndarray) -> np.ndarray:
+    """Unit vectors clustered around topic centers, like real memory embeddings."""
+    labels = rng.integers(0, len(centers), size=n)
+    v = centers[labels] + rng.normal(scale=0.35, size=(n, DIM)).astype(np.float32) / np.sqrt(DIM) * 4
+    return (v / np.linalg.norm(v, axis=1, keepdims=True)).astype(np.float32)
+
+
+def exact_top_k(table_vectors: list[np.ndarray], queries: np.ndarray) -> np.ndarray:
+    """Brute-force top-k ids by squared L2, scanning the table in chunks."""
+    best_d = np.full((len(queries), TOP_K), np.inf, dtype=np.float32)
+    best_i = np.zeros((len(queries), TOP_K), dtype=np.int64)
+    offset = 0
+    for chunk in table_vectors:
+        d = 2.0 - 2.0 * queries @ chunk.T
+        cand_d = np.concatenate([best_d, d], axis=1)
+        cand_i = np.concatenate([best_i, np.arange(offset, offset + len(chunk))[None, :].repeat(len(queries), 0)], axis=1)
+        order = np.argsort(cand_d, axis=1)[:, :TOP_K]
+        best_d = np.take_along_axis(cand_d, order, axis=1)
+        best_i = np.take_along_axis(cand_i, order, axis=1)
+        offset += len(chunk)
+    return best_i
+
+
+async def timed_search(query_fn, queries: np.ndarray) -> tuple[list[list[int]], list[float]]:
+    ids, latencies = [], []
+    for q in queries:
+        start = time.perf_counter()
+        rows = await query_fn(q).limit(TOP_K).select(["id"]).to_list()
+        latencies.append((time.perf_counter() - start) * 1000)
+        ids.append([int(r["id"]) for r in rows])
+    return ids, latencies
+
+
+def recall(found: list[list[int]], truth: np.ndarray) -> float:
+    hits = sum(len(set(f) & set(t.tolist())) for f, t in zip(found, truth))
+    return hits / (len(truth) * TOP_K)
+
+
+def summarize(latencies: list[float]) -> dict:
+    arr = np.array(latencies)
+    return {"p50_ms": round(float(np.percentile(arr, 50)), 2), "p95_ms": round(float(np.percentile(arr, 95)), 2)}
+
+
+async def bench_size(n: int, n_queries: int, seed: int) -> list[dict]:
+    import src.memory.vector_store as vs
+    from config.settings import settings
+
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(max(8, n // 500), DIM)).astype(np.float32)
+    centers /= np.linalg.norm(centers, axis=1, keepdims=True)
+
+    vs._LANCE_DIR = tempfile.mkdtemp(prefix=f"lance-{n}-")
+    vs.memory_store.reset()
+    table = await vs.memory_store._get_table()
+
+    print(f"\n{'=' * 60}\n  {n:,} memories\n{'=' * 60}")
+    start = time.perf_counter()
+    chunks = []
+    for lo in range(0, n, CHUNK):
+        vectors = synthetic_vectors(min(CHUNK, n - lo), rng, centers)
+        chunks.append(vectors)
+        await table.add([
+            vs._memory_row(str(lo + i), v, text=f"synthetic memory {lo + i}")
+            for i, v in enumerate(vectors)
+        ])
+    print(f"  insert: {time.perf_counter() - start:.1f}s")
+
+    queries = synthetic_vectors(n_queries, rng, centers)
+    truth = exact_top_k(chunks, queries)
+
+    results = []
+    ids, lat = await timed_search(lambda q: table.vector_search(q.tolist()), queries)
+    flat = {"size": n, "mode": "flat", "nprobes": None, "refine_factor": None,
+            "recall@10": round(recall(ids, truth), 4), **summarize(lat)}
+    results.append(flat)
+    print(f"  flat scan            recall={flat['recall@10']:.3f}  p50={flat['p50_ms']}ms  p95={flat['p95_ms']}ms")
+
+    if n < 256:
+        print("  (too few rows to train IVF-PQ — skipping index)")
+        return results
+
+    settings.memory_index_min_rows = 0
+    start = time.perf_counter()
+    await vs.memory_store.maintain_index()
+    build_s = time.perf_counter() - start
+    print(f"  index build: {build_s:.1f}s")
+
+    for nprobes, refine in SEARCH_CONFIGS:
+        settings.memory_search_nprobes = nprobes
+        settings.memory_search_refine_factor = refine
+        ids, lat = await timed_search(lambda q: vs._vector_search(table, q.tolist()), queries)
+        row = {"size": n, "mode": "ivf_pq", "nprobes": nprobes, "refine_factor": refine,
+               "recall@10": round(recall(ids, truth), 4), "build_s": round(build_s, 2), **summarize(lat)}
+        results.append(row)
+        print(f"  nprobes={nprobes:<3} refine={refine:<3} recall={row['recall@10']:.3f}  "
+              f"p50={row['p50_ms']}ms  p95={row['p95_ms']}ms")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=Path, help="write raw results to this file")
+    args = parser.parse_args()
+
+    all_results = []
+    for n in args.sizes:
+        all_results.extend(asyncio.run(bench_size(n, args.queries, args.seed)))
+
+    if args.json:
+        args.json.write_text(json.dumps(all_results, indent=2))
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
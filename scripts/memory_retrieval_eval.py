@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Memory retrieval eval — quality vs latency of vector and hybrid search.
+
+Loads the labelled memories and queries from ``memory_eval_set.json`` into a
+scratch LanceDB table using the real embedder, then runs every query through
+``memory_store.search`` in each mode and reports recall@k, MRR and latency.
+The set mixes paraphrased questions (where embeddings shine) with exact-term
+lookups — tickers, ticket ids, names — where BM25 helps.
+
+Usage:
+    cd backend && python ../scripts/memory_retrieval_eval.py
+    cd backend && python ../scripts/memory_retrieval_eval.py --top-k 3 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault("WORKSPACE_DIR", tempfile.mkdtemp(prefix="seraph-eval-"))
+os.environ.setdefault("OPENROUTER_API_KEY", "eval")
+
+EVAL_SET = Path(__file__).resolve().parent / "memory_eval_set.json"
+MODES = ["vector", "hybrid"]
+
+
+async def load_memories(vs, memories: list[dict]) -> None:
+    from src.memory.embedder import embed_batch
+
+    vs._LANCE_DIR = tempfile.mkdtemp(prefix="lance-eval-")
+    vs.memory_store.reset()
+    table = await vs.memory_store._get_table()
+    vectors = embed_batch([m["text"] for m in memories])
+    await table.add([
+        vs._memory_row(m["id"], v, text=m["text"], category=m["category"])
+        for m, v in zip(memories, vectors)
+    ])
+    await vs.memory_store.maintain_index()
+
+
+async def evaluate(vs, queries: list[dict], mode: str, top_k: int, repeat: int) -> dict:
+    hits, reciprocal_ranks, latencies = [], [], []
+    misses = []
+    for q in queries:
+        relevant = set(q["relevant"])
+        for _ in range(repeat):
+            start = time.perf_counter()
+            results = await vs.memory_store.search(q["query"], top_k=top_k, mode=mode)
+            latencies.append((time.perf_counter() - start) * 1000)
+        ids = [r["id"] for r in results]
+        hits.append(len(relevant & set(ids)) / len(relevant))
+        rank = next((i for i, mid in enumerate(ids, start=1) if mid in relevant), None)
+        reciprocal_ranks.append(1.0 / rank if rank else 0.0)
+        if rank is None:
+            misses.append(q["query"])
+
+    lat = np.array(latencies)
+    return {
+        "mode": mode,
+        f"recall@{top_k}": round(float(np.mean(hits)), 3),
+        "mrr": round(float(np.mean(reciprocal_ranks)), 3),
+        "p50_ms": round(float(np.percentile(lat, 50)), 2),
+        "p95_ms": round(float(np.percentile(lat, 95)), 2),
+        "misses": misses,
+    }
+
+
+async def run(args) -> list[dict]:
+    import src.memory.vector_store as vs
+
+    data = json.loads(EVAL_SET.read_text())
+    start = time.perf_counter()
+    await load_memories(vs, data["memories"])
+    print(f"Loaded {len(data['memories'])} memories in {time.perf_counter() - start:.1f}s")
+
+    # Warm both paths so the first query doesn't pay for model/index loading
+    for mode in MODES:
+        await vs.memory_store.search("warmup", top_k=1, mode=mode)
+
+    results = []
+    for mode in MODES:
+        row = await evaluate(vs, data["queries"], mode, args.top_k, args.repeat)
+        results.append(row)
+        print(f"  {mode:<7} recall@{args.top_k}={row[f'recall@{args.top_k}']:.3f}  mrr={row['mrr']:.3f}  "
+              f"p50={row['p50_ms']}ms  p95={row['p95_ms']}ms")
+        for miss in row["misses"]:
+            print(f"           miss: {miss!r}")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per query")
+    parser.add_argument("--json", type=Path, help="write raw results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
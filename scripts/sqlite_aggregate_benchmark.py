@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""Aggregate pushdown benchmark — row-loading counts vs COUNT/MAX/GROUP BY.
+
+Seeds a fresh database with many messages in one session and many goals, then
+times each repository method against the row-loading query it replaced:
+
+  count_messages   load every user/assistant row, len()   vs  COUNT(*)
+  insight count    load every fresh row, len()             vs  COUNT(*)
+  goal sort_order  load every sibling, len()               vs  MAX(sort_order)
+  get_dashboard    load every goal, tally in Python        vs  GROUP BY domain, status
+
+Usage:
+    cd backend && python ../scripts/sqlite_aggregate_benchmark.py
+    cd backend && python ../scripts/sqlite_aggregate_benchmark.py --messages 100000 --goals 10000 --runs 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault("WORKSPACE_DIR", tempfile.mkdtemp(prefix="seraph-bench-"))
+os.environ.setdefault("OPENROUTER_API_KEY", "bench")
+
+SESSION_ID = "bench-session"
+DOMAINS = ["productivity", "performance", "health", "influence", "growth"]
+STATUSES = ["active", "completed", "paused", "abandoned"]
+
+
+async def seed(n_messages: int, n_goals: int, n_insights: int) -> str:
+    from sqlalchemy import text
+
+    from src.db.engine import engine, init_db
+
+    await init_db()
+    now = datetime.now(timezone.utc)
+    base = now - timedelta(days=30)
+    roles = ["user", "assistant", "step", "step"]
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("INSERT INTO sessions (id, title, created_at, updated_at) VALUES (:id, 'bench', :t, :t)"),
+            {"id": SESSION_ID, "t": base},
+        )
+        await conn.execute(
+            text(
+                "INSERT INTO messages (id, session_id, role, content, created_at) "
+                "VALUES (:id, :sid, :role, :content, :t)"
+            ),
+            [
+                {
+                    "id": uuid.uuid4().hex,
+                    "sid": SESSION_ID,
+                    "role": roles[i % len(roles)],
+                    "content": f"message {i} " * 10,
+                    "t": base + timedelta(seconds=i),
+                }
+                for i in range(n_messages)
+            ],
+        )
+
+        # One vision goal with every other goal as its direct child — the
+        # worst case for the sibling sort_order lookup
+        root = uuid.uuid4().hex[:8]
+        goals = [{"id": root, "parent_id": None, "path": "/", "level": "vision",
+                  "domain": "growth", "status": "active", "sort_order": 0}]
+        goals += [
+            {
+                "id": uuid.uuid4().hex[:8],
+                "parent_id": root,
+                "path": f"/{root}/",
+                "level": "daily",
+                "domain": DOMAINS[i % len(DOMAINS)],
+                "status": STATUSES[i % len(STATUSES)],
+                "sort_order": i,
+            }
+            for i in range(n_goals - 1)
+        ]
+        await conn.execute(
+            text(
+                "INSERT INTO goals (id, parent_id, path, level, title, status, domain, sort_order, "
+                "created_at, updated_at) VALUES (:id, :parent_id, :path, :level, 'goal', :status, "
+                ":domain, :sort_order, :t, :t)"
+            ),
+            [{**g, "t": base} for g in goals],
+        )
+
+        await conn.execute(
+            text(
+                "INSERT INTO queued_insights (id, content, intervention_type, urgency, reasoning, created_at) "
+                "VALUES (:id, 'insight', 'advisory', 3, '', :t)"
+            ),
+            [{"id": uuid.uuid4().hex, "t": now - timedelta(minutes=i % 600)} for i in range(n_insights)],
+        )
+    return root
+
+
+# ── Before: the row-loading implementations ──────────────
+
+async def count_messages_rows() -> int:
+    from sqlmodel import select
+
+    from src.db.engine import get_read_session
+    from src.db.models import Message
+
+    async with get_read_session() as db:
+        result = await db.execute(
+            select(Message)
+            .where(Message.session_id == SESSION_ID)
+            .where(Message.role.in_(["user", "assistant"]))
+        )
+        return len(result.scalars().all())
+
+
+async def insight_count_rows() -> int:
+    from sqlmodel import select
+
+    from src.db.engine import get_read_session
+    from src.db.models import QueuedInsight
+
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=24)
+    async with get_read_session() as db:
+        result = await db.execute(select(QueuedInsight).where(QueuedInsight.created_at > cutoff))
+        return len(result.scalars().all())
+
+
+async def sibling_count_rows(parent_id: str) -> int:
+    from sqlmodel import select
+
+    from src.db.engine import get_read_session
+    from src.db.models import Goal
+
+    async with get_read_session() as db:
+        result = await db.execute(select(Goal).where(Goal.parent_id == parent_id))
+        return len(result.scalars().all())
+
+
+async def dashboard_rows() -> dict:
+    from sqlmodel import select
+
+    from src.db.engine import get_read_session
+    from src.db.models import Goal
+
+    async with get_read_session() as db:
+        all_goals = (await db.execute(select(Goal))).scalars().all()
+    domains: dict = {}
+    for g in all_goals:
+        d = domains.setdefault(g.domain, {"active": 0, "completed": 0, "total": 0})
+        d["total"] += 1
+        if g.status in ("active", "completed"):
+            d[g.status] += 1
+    return domains
+
+
+# ── After: aggregate queries ─────────────────────────────
+
+async def sibling_max(parent_id: str) -> int:
+    from sqlmodel import func, select
+
+    from src.db.engine import get_read_session
+    from src.db.models import Goal
+
+    # The query GoalRepository.create runs, without inserting a goal
+    async with get_read_session() as db:
+        result = await db.execute(select(func.max(Goal.sort_order)).where(Goal.parent_id == parent_id))
+        last = result.scalar_one()
+        return last + 1 if last is not None else 0
+
+
+async def timed(fn, runs: int) -> tuple[list[float], object]:
+    value = await fn()  # warm-up
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        value = await fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies, value
+
+
+def summarize(latencies: list[float]) -> dict:
+    arr = np.array(latencies)
+    return {"p50_ms": round(float(np.percentile(arr, 50)), 2), "p95_ms": round(float(np.percentile(arr, 95)), 2)}
+
+
+async def run(args) -> list[dict]:
+    from src.agent.session import session_manager
+    from src.db.engine import close_db
+    from src.goals.repository import goal_repository
+    from src.observer.insight_queue import insight_queue
+
+    start = time.perf_counter()
+    root = await seed(args.messages, args.goals, args.insights)
+    print(f"  seeded {args.messages:,} messages, {args.goals:,} goals, {args.insights:,} insights "
+          f"in {time.perf_counter() - start:.1f}s\n")
+
+    cases = [
+        ("count_messages", count_messages_rows, lambda: session_manager.count_messages(SESSION_ID)),
+        ("insight_count", insight_count_rows, insight_queue.count),
+        ("goal_sort_order", lambda: sibling_count_rows(root), lambda: sibling_max(root)),
+        ("get_dashboard", dashboard_rows, goal_repository.get_dashboard),
+    ]
+    results = []
+    for name, before_fn, after_fn in cases:
+        before, _ = await timed(before_fn, args.runs)
+        after, _ = await timed(after_fn, args.runs)
+        row = {
+            "method": name,
+            "before": summarize(before),
+            "after": summarize(after),
+            "speedup_p50": round(np.percentile(before, 50) / max(np.percentile(after, 50), 1e-6), 1),
+        }
+        results.append(row)
+        print(f"  {name:<16} before p50={row['before']['p50_ms']:>8}ms  "
+              f"after p50={row['after']['p50_ms']:>6}ms  ({row['speedup_p50']}x)")
+
+    await close_db()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--goals", type=int, default=10_000)
+    parser.add_argument("--insights", type=int, default=1_000)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--json", type=Path, help="write raw results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
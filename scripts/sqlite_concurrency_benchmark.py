@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""SQLite concurrency benchmark — write latency under mixed chat/observer load.
+
+Runs the same workload against two storage profiles on a fresh database file:
+
+  baseline  one engine, default pool, no pragmas (rollback journal)
+  tuned     the `create_sqlite_engine` profile from src/db/engine.py —
+            WAL + pragmas, a single writer connection and a reader pool
+
+The workload mirrors the app's hot paths running at once: chat turns
+(insert a message, bump the session), observer context posts (insert a
+screen observation, close out the previous one) and readers running the
+session-list and daily-summary queries. Reports write latency percentiles,
+read throughput and "database is locked" errors.
+
+Usage:
+    cd backend && python ../scripts/sqlite_concurrency_benchmark.py
+    cd backend && python ../scripts/sqlite_concurrency_benchmark.py --writers 16 --readers 8 --seconds 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault("WORKSPACE_DIR", tempfile.mkdtemp(prefix="seraph-bench-"))
+os.environ.setdefault("OPENROUTER_API_KEY", "bench")
+
+SEED_SESSIONS = 200
+SEED_MESSAGES = 20_000
+
+LIST_SESSIONS_SQL = """
+    SELECT s.id, s.title, lm.content, lm.role
+    FROM sessions s
+    LEFT JOIN (
+        SELECT session_id, content, role,
+               ROW_NUMBER() OVER (PARTITION BY session_id ORDER BY created_at DESC) AS rn
+        FROM messages
+    ) lm ON lm.session_id = s.id AND lm.rn = 1
+    ORDER BY s.updated_at DESC
+"""
+DAILY_SUMMARY_SQL = """
+    SELECT activity_type, SUM(COALESCE(duration_s, 0))
+    FROM screen_observations
+    WHERE timestamp >= :start AND blocked = 0
+    GROUP BY activity_type
+"""
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+async def seed(engine) -> list[str]:
+    from sqlalchemy import text
+    from sqlmodel import SQLModel
+
+    import src.db.models  # noqa: F401 — register tables
+
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    session_ids = [uuid.uuid4().hex for _ in range(SEED_SESSIONS)]
+    base = _now() - timedelta(days=7)
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("INSERT INTO sessions (id, title, created_at, updated_at) VALUES (:id, 'bench', :t, :t)"),
+            [{"id": sid, "t": base} for sid in session_ids],
+        )
+        await conn.execute(
+            text(
+                "INSERT INTO messages (id, session_id, role, content, created_at) "
+                "VALUES (:id, :sid, :role, :content, :t)"
+            ),
+            [
+                {
+                    "id": uuid.uuid4().hex,
+                    "sid": session_ids[i % SEED_SESSIONS],
+                    "role": "user" if i % 2 else "assistant",
+                    "content": f"seed message {i} " * 8,
+                    "t": base + timedelta(seconds=i),
+                }
+                for i in range(SEED_MESSAGES)
+            ],
+        )
+    return session_ids
+
+
+async def chat_writer(engine, session_ids, stop_at, latencies, errors, rng):
+    from sqlalchemy import text
+
+    while time.perf_counter() < stop_at:
+        sid = session_ids[int(rng.integers(len(session_ids)))]
+        start = time.perf_counter()
+        try:
+            async with engine.begin() as conn:
+                now = _now()
+                await conn.execute(
+                    text(
+                        "INSERT INTO messages (id, session_id, role, content, created_at) "
+                        "VALUES (:id, :sid, 'user', :content, :t)"
+                    ),
+                    {"id": uuid.uuid4().hex, "sid": sid, "content": "benchmark turn " * 20, "t": now},
+                )
+                await conn.execute(text("UPDATE sessions SET updated_at = :t WHERE id = :sid"), {"t": now, "sid": sid})
+        except Exception as exc:  # "database is locked" under the baseline profile
+            errors.append(type(exc).__name__)
+            continue
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.005)
+
+
+async def observer_writer(engine, stop_at, latencies, errors):
+    from sqlalchemy import text
+
+    prev_id = None
+    while time.perf_counter() < stop_at:
+        start = time.perf_counter()
+        try:
+            async with engine.begin() as conn:
+                obs_id = uuid.uuid4().hex
+                await conn.execute(
+                    text(
+                        "INSERT INTO screen_observations "
+                        "(id, timestamp, app_name, window_title, activity_type, blocked, created_at) "
+                        "VALUES (:id, :t, 'Code', 'engine.py', 'coding', 0, :t)"
+                    ),
+                    {"id": obs_id, "t": _now()},
+                )
+                if prev_id:
+                    await conn.execute(
+                        text("UPDATE screen_observations SET duration_s = 5 WHERE id = :id"), {"id": prev_id},
+                    )
+                prev_id = obs_id
+        except Exception as exc:
+            errors.append(type(exc).__name__)
+            continue
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.005)
+
+
+async def reader(engine, stop_at, counter, errors):
+    from sqlalchemy import text
+
+    start_of_day = _now().replace(hour=0, minute=0, second=0, microsecond=0)
+    i = 0
+    while time.perf_counter() < stop_at:
+        try:
+            async with engine.connect() as conn:
+                if i % 2:
+                    await conn.execute(text(LIST_SESSIONS_SQL))
+                else:
+                    await conn.execute(text(DAILY_SUMMARY_SQL), {"start": start_of_day})
+            counter[0] += 1
+        except Exception as exc:
+            errors.append(type(exc).__name__)
+        i += 1
+
+
+def _engines(profile: str, url: str):
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from src.db.engine import create_sqlite_engine
+
+    if profile == "baseline":
+        engine = create_async_engine(url, connect_args={"check_same_thread": False})
+        return engine, engine
+    return create_sqlite_engine(url), create_sqlite_engine(url, read_only=True)
+
+
+async def run_profile(profile: str, args) -> dict:
+    path = Path(tempfile.mkdtemp(prefix=f"sqlite-{profile}-")) / "seraph.db"
+    url = f"sqlite+aiosqlite:///{path}"
+    writer, read = _engines(profile, url)
+    session_ids = await seed(writer)
+
+    rng = np.random.default_rng(args.seed)
+    latencies: list[float] = []
+    errors: list[str] = []
+    reads = [0]
+    stop_at = time.perf_counter() + args.seconds
+    tasks = [chat_writer(writer, session_ids, stop_at, latencies, errors, rng) for _ in range(args.writers)]
+    tasks += [observer_writer(writer, stop_at, latencies, errors) for _ in range(args.observers)]
+    tasks += [reader(read, stop_at, reads, errors) for _ in range(args.readers)]
+    await asyncio.gather(*tasks)
+
+    if read is not writer:
+        await read.dispose()
+    await writer.dispose()
+
+    arr = np.array(latencies) if latencies else np.array([0.0])
+    return {
+        "profile": profile,
+        "writes": len(latencies),
+        "reads": reads[0],
+        "errors": len(errors),
+        "write_p50_ms": round(float(np.percentile(arr, 50)), 2),
+        "write_p95_ms": round(float(np.percentile(arr, 95)), 2),
+        "write_p99_ms": round(float(np.percentile(arr, 99)), 2),
+        "write_max_ms": round(float(arr.max()), 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=8, help="concurrent chat writers")
+    parser.add_argument("--observers", type=int, default=2, help="concurrent observer-context writers")
+    parser.add_argument("--readers", type=int, default=4, help="concurrent readers")
+    parser.add_argument("--seconds", type=float, default=10.0, help="duration per profile")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=Path, help="write raw results to this file")
+    args = parser.parse_args()
+
+    results = []
+    for profile in ("baseline", "tuned"):
+        row = asyncio.run(run_profile(profile, args))
+        results.append(row)
+        print(f"  {profile:<9} writes={row['writes']:<6} reads={row['reads']:<6} errors={row['errors']:<4} "
+              f"p50={row['write_p50_ms']}ms  p95={row['write_p95_ms']}ms  "
+              f"p99={row['write_p99_ms']}ms  max={row['write_max_ms']}ms")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()